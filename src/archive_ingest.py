@@ -0,0 +1,173 @@
+import gzip
+import os
+import re
+import shutil
+import tarfile
+import time
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+# A plain .gz holds a single compressed file (e.g. resume.pdf.gz), unless it turns out to be a tar archive
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".gz")
+
+
+def is_archive(file: Path) -> bool:
+    """Check whether a file is a supported archive based on its name."""
+    return file.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _archive_stem(archive: Path) -> str:
+    name = archive.name
+    for suffix in sorted(ARCHIVE_SUFFIXES, key=len, reverse=True):
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return archive.stem
+
+
+def member_filename(archive: Path, member_name: str) -> str:
+    """
+    Build a flat raw file name for an archive member, keeping its folder path in the name.
+
+    Args:
+        archive (Path): Archive the member belongs to.
+        member_name (str): Path of the member inside the archive.
+
+    Returns:
+        str: File name like '<archive>__<folder>__<file>.pdf'.
+    """
+    parts = [re.sub(r"[^\w.\- ]", "_", part) for part in PurePosixPath(member_name).parts if part not in ("", ".", "..", "/")]
+    if parts == [_archive_stem(archive)]:
+        # The single file of a plain .gz keeps its own name
+        return parts[0]
+    return "__".join([_archive_stem(archive)] + parts)
+
+
+def is_archive_member(archive: Path, file_name: str) -> bool:
+    """Check whether a raw file name is one that member_filename gives to members of the archive."""
+    stem = _archive_stem(archive)
+    return file_name == stem or file_name.startswith(f"{stem}__")
+
+
+def iter_archive_members(archive: Path) -> Iterator[Tuple[str, IO[bytes], float]]:
+    """
+    Stream the regular files of a zip, tar or gzip archive one at a time.
+
+    Tar archives are read in streaming mode, so only the current member is held open. A .gz file
+    that is not a tar archive yields its single decompressed file, named after the archive, with
+    the archive's modification time.
+
+    Args:
+        archive (Path): Archive to read.
+
+    Yields:
+        Tuple[str, IO[bytes], float]: Member path inside the archive, a readable file object for it
+            and its modification time.
+    """
+    if archive.name.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                with zf.open(info) as member:
+                    yield info.filename, member, time.mktime(info.date_time + (0, 0, -1))
+    elif archive.name.lower().endswith(".gz") and not tarfile.is_tarfile(archive):
+        with gzip.open(archive, "rb") as member:
+            yield _archive_stem(archive), member, archive.stat().st_mtime
+    else:
+        with tarfile.open(archive, mode="r|*") as tf:
+            for info in tf:
+                if not info.isfile():
+                    continue
+                member = tf.extractfile(info)
+                if member is not None:
+                    yield info.name, member, info.mtime
+
+
+def _extracted_marker(archive: Path, dest_dir: Path) -> Path:
+    return dest_dir / f".{archive.name}.extracted"
+
+
+def is_fully_extracted(archive: Path, dest_dir: Path) -> bool:
+    """Check whether every member of an archive was written to dest_dir since the archive last changed."""
+    marker = _extracted_marker(archive, dest_dir)
+    return marker.exists() and marker.stat().st_mtime >= archive.stat().st_mtime
+
+
+def extract_archive(archive: Path, dest_dir: Path, supported_exts: List[str]) -> Iterator[Path]:
+    """
+    Write the supported members of an archive to dest_dir one by one, yielding each as soon as it is written.
+
+    Nested folders are flattened into the file name. A member that fails to extract is reported and
+    skipped without aborting the rest of the archive. Members already extracted are not yielded again.
+    The archive is only marked as extracted when every member was written, so failed members are
+    retried on the next scan. Members are registered with the artifact cache like single uploads.
+
+    Args:
+        archive (Path): Archive to expand.
+        dest_dir (Path): Directory receiving the members (the raw directory).
+        supported_exts (List[str]): Member extensions to extract.
+
+    Yields:
+        Path: Path of each newly written member.
+    """
+    if is_fully_extracted(archive, dest_dir):
+        return
+    from src.artifact_cache import register_archive_member
+
+    extracted, failed = 0, 0
+    try:
+        for member_name, member, mtime in iter_archive_members(archive):
+            if PurePosixPath(member_name).name.startswith(".") or "__MACOSX" in member_name:
+                continue
+            if PurePosixPath(member_name).suffix.lower() not in supported_exts:
+                continue
+            target = dest_dir / member_filename(archive, member_name)
+            if target.exists():
+                continue
+            part_file = target.with_name(f".{target.name}.part")
+            try:
+                with open(part_file, "wb") as out:
+                    shutil.copyfileobj(member, out)
+                # Members keep their time from the archive, which orders versions of a CV (see near_duplicates)
+                os.utime(part_file, (mtime, mtime))
+                part_file.replace(target)
+                # Known content gets its cached markdown and JSON back before it is converted
+                register_archive_member(target)
+                extracted += 1
+                yield target
+            except Exception as e:
+                print(f"  Error extracting {member_name} from {archive.name}: {str(e)}")
+                part_file.unlink(missing_ok=True)
+                failed += 1
+                continue
+    except Exception as e:
+        print(f"Error reading archive {archive.name}: {str(e)}")
+        return
+
+    if not failed:
+        _extracted_marker(archive, dest_dir).touch()
+    print(f"Extracted {extracted} files from {archive.name} ({failed} failed).")
+
+
+def scan_input_files(input_path: Path, supported_exts: List[str], files: Optional[Iterable[Path]] = None) -> Iterator[Path]:
+    """
+    Yield the supported files of a raw directory, then stream in the members of any archives in it.
+
+    Args:
+        input_path (Path): Raw directory to scan.
+        supported_exts (List[str]): File extensions the caller can convert.
+        files (Optional[Iterable[Path]]): Only consider these files instead of listing the directory.
+
+    Yields:
+        Path: Files to convert.
+    """
+    if files is None:
+        files = input_path.iterdir()
+    entries = [Path(file) for file in files if Path(file).is_file() and not Path(file).name.startswith(".")]
+    archives = [file for file in entries if is_archive(file)]
+    for file in entries:
+        if file not in archives and file.suffix.lower() in supported_exts:
+            yield file
+    for archive in archives:
+        yield from extract_archive(archive, input_path, supported_exts)
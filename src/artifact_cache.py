@@ -0,0 +1,206 @@
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.archive_ingest import is_archive, is_archive_member
+from src.config_loader import config
+from src.dead_letter import is_default_record
+from src.heuristic_extractor import is_heuristic_output
+
+cache_root = Path(config["data"]["directories"]["cache"])
+
+
+def file_digest(file_path: str) -> str:
+    """
+    Compute the SHA-256 digest of a file's bytes.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        str: Hex digest of the file content.
+    """
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _cache_dir(file_type: str) -> Path:
+    cache_dir = cache_root / file_type
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def _load_index(file_type: str) -> Dict[str, str]:
+    """Load the digest -> raw file name index for a file type."""
+    index_file = _cache_dir(file_type) / "index.json"
+    if not index_file.exists():
+        return {}
+    try:
+        with open(index_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading artifact cache index, starting a new one. Reason: {str(e)}")
+        return {}
+
+
+def _save_index(file_type: str, index: Dict[str, str]) -> None:
+    with open(_cache_dir(file_type) / "index.json", "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+
+
+def find_cached_upload(digest: str, file_type: str) -> Optional[Path]:
+    """
+    Find a raw file already saved with the same content.
+
+    Args:
+        digest (str): SHA-256 digest of the uploaded file.
+        file_type (str): Either 'resumes' or 'job_descriptions'.
+
+    Returns:
+        Optional[Path]: Path of the existing raw file, or None if the content is new.
+    """
+    raw_name = _load_index(file_type).get(digest)
+    if not raw_name:
+        return None
+    raw_file = Path(config["data"]["directories"][file_type]["raw"]) / raw_name
+    return raw_file if raw_file.exists() else None
+
+
+def register_upload(digest: str, file_type: str, raw_file: Path) -> None:
+    """Record which raw file holds the content with the given digest."""
+    index = _load_index(file_type)
+    index[digest] = raw_file.name
+    _save_index(file_type, index)
+
+
+def restore_artifacts(digest: str, file_type: str, stem: str) -> bool:
+    """
+    Copy cached markdown and extracted JSON for a digest into the working directories under a new stem,
+    so conversion and extraction skip the file.
+
+    Args:
+        digest (str): SHA-256 digest of the raw file.
+        file_type (str): Either 'resumes' or 'job_descriptions'.
+        stem (str): Stem of the newly saved raw file.
+
+    Returns:
+        bool: True if cached markdown was restored.
+    """
+    dirs = config["data"]["directories"][file_type]
+    cache_dir = _cache_dir(file_type)
+    cached_md = cache_dir / f"{digest}.md"
+    cached_json = cache_dir / f"{digest}.json"
+    if not cached_md.exists():
+        return False
+
+    md_dir = Path(dirs["markdown"])
+    md_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(cached_md, md_dir / f"{stem}.md")
+
+    if cached_json.exists():
+        try:
+            with open(cached_json, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            data["filename"] = f"{stem}.md"
+            json_dir = Path(dirs["json"])
+            json_dir.mkdir(parents=True, exist_ok=True)
+            with open(json_dir / f"{stem}.json", "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            print(f"Error restoring cached extraction for {stem}: {str(e)}")
+
+    print(f"Restored cached artifacts for: {stem}")
+    return True
+
+
+def _raw_file_type(raw_file: Path) -> Optional[str]:
+    """File type ('resumes' or 'job_descriptions') whose raw directory holds a file, or None."""
+    for file_type in ("resumes", "job_descriptions"):
+        if raw_file.parent.resolve() == Path(config["data"]["directories"][file_type]["raw"]).resolve():
+            return file_type
+    return None
+
+
+def register_archive_member(member: Path) -> None:
+    """
+    Register a file extracted from an uploaded archive with the content-addressed cache, like a single upload.
+
+    Cached markdown and JSON of known content are restored under the member's name, so conversion
+    and extraction skip it; new content is cached by cache_artifacts after the run.
+
+    Args:
+        member (Path): Member just written to a raw directory.
+
+    Returns:
+        None
+    """
+    file_type = _raw_file_type(member)
+    if file_type is None:
+        return
+    try:
+        digest = file_digest(str(member))
+        restore_artifacts(digest, file_type, member.stem)
+        # A single upload of the same content that is still on disk stays the registered copy
+        if find_cached_upload(digest, file_type) is None:
+            register_upload(digest, file_type, member)
+    except Exception as e:
+        print(f"Error registering archive member {member.name} with the artifact cache: {str(e)}")
+
+
+def cache_artifacts(raw_files: List[str], file_type: str) -> None:
+    """
+    Store the markdown and extracted JSON of saved raw files in the content-addressed cache.
+    Archives are covered through the members they extracted into the raw directory.
+
+    Args:
+        raw_files (List[str]): Paths of raw files saved for this run.
+        file_type (str): Either 'resumes' or 'job_descriptions'.
+
+    Returns:
+        None
+    """
+    dirs = config["data"]["directories"][file_type]
+    cache_dir = _cache_dir(file_type)
+    digests = {name: digest for digest, name in _load_index(file_type).items()}
+    cached = 0
+
+    raw_paths = [Path(raw_file) for raw_file in raw_files]
+    archives = [raw_path for raw_path in raw_paths if is_archive(raw_path)]
+    if archives:
+        raw_dir = Path(dirs["raw"])
+        raw_paths = [raw_path for raw_path in raw_paths if raw_path not in archives] + [
+            member for member in sorted(raw_dir.iterdir())
+            if member.is_file() and any(is_archive_member(archive, member.name) for archive in archives)
+        ]
+
+    for raw_path in raw_paths:
+        raw_file = str(raw_path)
+        try:
+            digest = digests.get(raw_path.name) or file_digest(raw_file)
+            md_file = Path(dirs["markdown"]) / f"{raw_path.stem}.md"
+            json_file = Path(dirs["json"]) / f"{raw_path.stem}.json"
+
+            cached_md = cache_dir / f"{digest}.md"
+            if md_file.exists() and not cached_md.exists():
+                shutil.copy2(md_file, cached_md)
+                cached += 1
+
+            cached_json = cache_dir / f"{digest}.json"
+            # LLM extractions replace cached heuristic ones
+            stale = cached_json.exists() and is_heuristic_output(cached_json) and not is_heuristic_output(json_file)
+            if json_file.exists() and (not cached_json.exists() or stale):
+                with open(json_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if not is_default_record(data, file_type):
+                    shutil.copy2(json_file, cached_json)
+                    cached += 1
+        except Exception as e:
+            print(f"Error caching artifacts for {raw_path.name}: {str(e)}")
+            continue
+
+    if cached:
+        print(f"Cached {cached} new {file_type} artifacts.")
@@ -0,0 +1,85 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.prompts import PromptTemplate
+from src.llm_backends import BACKENDS, build_llm
+from src.config_loader import config
+from src.llm_client import rate_limiter
+from src.prompt_cache import cached_input_tokens
+from src.resume_extractor import EXTRACTION_SCHEMAS, current_date, resume_token_budget
+from src.text_normalizer import prepare_for_extraction
+
+
+def _timed_extraction(llm: BaseLanguageModel, mode: str, resume_text: str) -> Dict[str, float]:
+    """Extract one resume in the given schema mode, bypassing the response cache, and return latency and token usage."""
+    schema, template, _, _ = EXTRACTION_SCHEMAS[mode]
+    chain = PromptTemplate.from_template(template) | llm.with_structured_output(schema, include_raw=True)
+
+    rate_limiter.acquire()
+    start = time.perf_counter()
+    response = chain.invoke({"current_date": current_date, "resume_text": resume_text})
+    elapsed = time.perf_counter() - start
+
+    usage = getattr(response.get("raw"), "usage_metadata", None) or {}
+    return {
+        "seconds": elapsed,
+        "input_tokens": usage.get("input_tokens", 0),
+        "output_tokens": usage.get("output_tokens", 0),
+        "cached_tokens": cached_input_tokens(usage),
+        "valid": float(response.get("parsed") is not None),
+    }
+
+
+def run_benchmark(input_dir: str, llm: BaseLanguageModel, limit: int = 10) -> Dict[str, Dict[str, float]]:
+    """
+    Compare latency and token usage (including input tokens served from the provider's prompt cache)
+    of the full and ranking-only extraction schemas.
+
+    Args:
+        input_dir (str): Directory of converted resume markdown files.
+        llm (BaseLanguageModel): Language model instance.
+        limit (int): Maximum number of resumes to extract per mode.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Mean seconds, input, output and cached tokens, and the valid rate per mode.
+    """
+    files = sorted(Path(input_dir).glob("*.md"))[:limit]
+    if not files:
+        print("No markdown files found to benchmark.")
+        return {}
+    texts = [prepare_for_extraction(f.read_text(encoding="utf-8"), f.name, resume_token_budget) for f in files]
+
+    results = {}
+    for mode in ("full", "ranking"):
+        runs: List[Dict[str, float]] = []
+        for file, text in zip(files, texts):
+            try:
+                runs.append(_timed_extraction(llm, mode, text))
+            except Exception as e:
+                print(f"Error extracting {file.name} in {mode} mode: {str(e)}")
+        if not runs:
+            continue
+        results[mode] = {key: sum(run[key] for run in runs) / len(runs) for key in runs[0]}
+        print(f"{mode:>8}: {results[mode]['seconds']:.2f}s, {results[mode]['input_tokens']:.0f} input / "
+              f"{results[mode]['output_tokens']:.0f} output tokens per resume ({results[mode]['cached_tokens']:.0f} input tokens "
+              f"cached), {results[mode]['valid']:.0%} valid "
+              f"over {len(runs)} resumes")
+
+    if "full" in results and "ranking" in results and results["full"]["output_tokens"]:
+        saved = 1 - results["ranking"]["output_tokens"] / results["full"]["output_tokens"]
+        speedup = results["full"]["seconds"] / results["ranking"]["seconds"] if results["ranking"]["seconds"] else 0.0
+        print(f"Ranking schema: {saved:.0%} fewer output tokens, {speedup:.2f}x faster")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the full and ranking-only resume extraction schemas.")
+    parser.add_argument("input_dir", nargs="?", default=config["data"]["directories"]["resumes"]["markdown"],
+                        help="Directory of resume markdown files")
+    parser.add_argument("--limit", type=int, default=10, help="Resumes to extract per mode")
+    parser.add_argument("--backend", choices=BACKENDS, help="Language model backend (default: models.language_model.backend)")
+    args = parser.parse_args()
+    llm = build_llm(args.backend)
+    run_benchmark(args.input_dir, llm, args.limit)
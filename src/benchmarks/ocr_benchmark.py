@@ -0,0 +1,84 @@
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import Levenshtein
+import pymupdf
+from PIL import Image
+from src.ocr_engine import image_to_text, pixmap_to_image
+from src.ocr_preprocess import preprocess_image, select_page_dpi
+
+supported_exts = [".pdf", ".png", ".jpg", ".jpeg"]
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def character_error_rate(hypothesis: str, reference: str) -> float:
+    """Edit distance between OCR output and reference text, relative to the reference length."""
+    reference = _normalize(reference)
+    return Levenshtein.distance(_normalize(hypothesis), reference) / max(1, len(reference))
+
+
+def _ocr_document(file: Path, adaptive: bool) -> Tuple[str, int]:
+    """OCR every page of a file with the current path or the adaptive preprocessing path."""
+    if file.suffix.lower() != ".pdf":
+        image = Image.open(str(file))
+        return image_to_text(preprocess_image(image) if adaptive else image), 1
+
+    texts = []
+    with pymupdf.open(str(file)) as doc:
+        for page in doc:
+            if adaptive:
+                pix = page.get_pixmap(dpi=select_page_dpi(page), colorspace=pymupdf.csGRAY)
+                texts.append(image_to_text(preprocess_image(pixmap_to_image(pix))))
+            else:
+                texts.append(image_to_text(pixmap_to_image(page.get_pixmap())))
+        return "".join(texts), len(doc)
+
+
+def run_benchmark(input_dir: str, ground_truth_dir: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Compare OCR throughput and accuracy of the current render path and the adaptive preprocessing path.
+
+    Args:
+        input_dir (str): Directory of PDFs and images to OCR (every page is OCR'd, text layers are ignored).
+        ground_truth_dir (Optional[str]): Directory with a '<stem>.txt' reference transcript per file.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Pages/sec and mean character error rate per path.
+    """
+    files = [f for f in sorted(Path(input_dir).iterdir()) if f.suffix.lower() in supported_exts]
+    if not files:
+        print("No supported files found to benchmark.")
+        return {}
+
+    results = {}
+    for name, adaptive in (("current", False), ("adaptive", True)):
+        pages = 0
+        error_rates: List[float] = []
+        start = time.perf_counter()
+        for file in files:
+            text, page_count = _ocr_document(file, adaptive)
+            pages += page_count
+            reference = Path(ground_truth_dir) / f"{file.stem}.txt" if ground_truth_dir else None
+            if reference is not None and reference.exists():
+                error_rates.append(character_error_rate(text, reference.read_text(encoding="utf-8")))
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "pages_per_sec": pages / elapsed if elapsed > 0 else 0.0,
+            "cer": sum(error_rates) / len(error_rates) if error_rates else float("nan"),
+        }
+        print(f"{name:>9}: {pages} pages in {elapsed:.1f}s ({results[name]['pages_per_sec']:.2f} pages/s), "
+              f"CER {results[name]['cer']:.3f} over {len(error_rates)} files")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark OCR preprocessing against the current render path.")
+    parser.add_argument("input_dir", help="Directory of PDFs and images")
+    parser.add_argument("--ground-truth", help="Directory of '<stem>.txt' reference transcripts")
+    args = parser.parse_args()
+    run_benchmark(args.input_dir, args.ground_truth)
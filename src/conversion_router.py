@@ -0,0 +1,200 @@
+import os
+import time
+from collections import defaultdict, deque
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO, Tuple
+import pymupdf
+from PIL import Image
+from src.archive_ingest import scan_input_files
+from src.conversion_utils import ConversionResult, run_conversion
+from src.text_readers import NATIVE_EXTS, convert_native_file
+from src.ocr_engine import report_ocr_stats
+from src.data_parser_ocr import get_ocr_pool, ocr_image, ocr_page_image, render_page_image, write_ready_pages, ocr_page_workers
+from src.text_normalizer import PAGE_BREAK
+from src.config_loader import config
+
+router_config = config["conversion"]["router"]
+
+POINTS_PER_INCH = 72
+
+
+def classify_page(page: pymupdf.Page, allow_docling: bool) -> Tuple[str, str]:
+    """
+    Pick the cheapest engine able to convert a PDF page.
+
+    Pages with a dense text layer are read directly, even over a full-page background image
+    (common in template resumes). Below the density threshold, pages that are mostly images or
+    have no text layer at all are OCR'd; sparse text pages without images are read directly.
+    Pages with tables go to Docling when it is allowed.
+
+    Args:
+        page (pymupdf.Page): Page to inspect.
+        allow_docling (bool): Whether Docling may be used for table pages.
+
+    Returns:
+        Tuple[str, str]: Engine name ('text', 'ocr' or 'docling') and the reason for the decision.
+    """
+    page_area = page.rect.width * page.rect.height
+    square_inches = page_area / (POINTS_PER_INCH ** 2) or 1.0
+    text_chars = len(page.get_text().strip())
+    density = text_chars / square_inches
+
+    image_area = 0.0
+    for info in page.get_image_info():
+        bbox = pymupdf.Rect(info["bbox"]) & page.rect
+        image_area += bbox.width * bbox.height
+    image_coverage = min(1.0, image_area / page_area) if page_area else 0.0
+
+    stats = f"{text_chars} chars, {density:.1f} chars/in², {image_coverage:.0%} images"
+    # Image coverage only matters for pages without a dense text layer
+    if density < router_config["min_text_density"] and (not text_chars or image_coverage >= router_config["max_image_coverage"]):
+        return "ocr", stats
+    if allow_docling and router_config.get("detect_tables", True) and page.find_tables().tables:
+        return "docling", stats + ", tables"
+    return "text", stats
+
+
+def _convert_pages_with_docling(file: Path, first_page: int, last_page: int) -> str:
+    """Convert a 1-based inclusive page range with the shared Docling converter."""
+    from src.data_parser import get_converter
+
+    converter = get_converter(router_config.get("docling_profile", "accurate"))
+    result = converter.convert(str(file), page_range=(first_page, last_page)).document
+    return result.export_to_markdown(image_placeholder='', page_break_placeholder=PAGE_BREAK) + "\n"
+
+
+def _timed_ocr(image: Image.Image, timings: Dict[str, List[float]]) -> str:
+    start = time.perf_counter()
+    text = ocr_page_image(image)
+    timings["ocr"].append(time.perf_counter() - start)
+    return text
+
+
+def _route_pdf(file: Path, out: TextIO, allow_docling: bool, timings: Dict[str, List[float]]) -> None:
+    """Stream a PDF to an open file, converting each page with the engine chosen for it."""
+    pool = get_ocr_pool()
+    max_pending = ocr_page_workers * 2
+    pending: deque = deque()
+    docling_run: List[int] = []
+
+    def flush_docling_run():
+        if not docling_run:
+            return
+        start = time.perf_counter()
+        if docling_run[0]:
+            pending.append(PAGE_BREAK)
+        pending.append(_convert_pages_with_docling(file, docling_run[0] + 1, docling_run[-1] + 1))
+        elapsed = time.perf_counter() - start
+        timings["docling"].extend([elapsed / len(docling_run)] * len(docling_run))
+        docling_run.clear()
+
+    with pymupdf.open(str(file)) as doc:
+        for page_num, page in enumerate(doc):
+            start = time.perf_counter()
+            engine, reason = classify_page(page, allow_docling)
+            print(f"  Page {page_num + 1}: {engine} ({reason})")
+
+            # Consecutive table pages go to Docling as a single page range
+            if engine == "docling":
+                docling_run.append(page_num)
+                continue
+            flush_docling_run()
+
+            if page_num:
+                pending.append(PAGE_BREAK)
+            if engine == "text":
+                pending.append(page.get_text())
+                timings["text"].append(time.perf_counter() - start)
+            else:
+                # Only the rendered image goes to the pool; MuPDF is used from this thread alone
+                pending.append(pool.submit(_timed_ocr, render_page_image(page), timings))
+            write_ready_pages(pending, out, max_pending)
+
+        flush_docling_run()
+        write_ready_pages(pending, out, max_pending=0)
+
+
+def _route_file(file: Path, md_file: Path, allow_docling: bool, timings: Dict[str, List[float]]) -> None:
+    """Convert a single file, routing PDF pages individually; images are OCR'd and text documents read directly."""
+    file_extension = file.suffix.lower()
+    if file_extension in NATIVE_EXTS:
+        print("  Text document: native reader")
+        start = time.perf_counter()
+        convert_native_file(file, md_file)
+        timings["native"].append(time.perf_counter() - start)
+        return
+    part_file = md_file.with_suffix(md_file.suffix + ".part")
+    try:
+        with open(part_file, "w", encoding="utf-8") as out:
+            if file_extension == ".pdf":
+                _route_pdf(file, out, allow_docling, timings)
+            elif file_extension in [".jpg", ".jpeg", ".png"]:
+                print("  Image file: ocr")
+                start = time.perf_counter()
+                out.write(ocr_image(Image.open(str(file))))
+                timings["ocr"].append(time.perf_counter() - start)
+            else:
+                raise ValueError(f"No conversion engine available for {file_extension} files")
+        part_file.replace(md_file)
+    finally:
+        part_file.unlink(missing_ok=True)
+
+
+def _route_batch(pairs: List[Tuple[str, str]], allow_docling: bool) -> List[ConversionResult]:
+    """Convert a batch of (input, output) path pairs with per-page routing; runs inside pool workers."""
+    results = []
+    timings: Dict[str, List[float]] = defaultdict(list)
+    for file_path, md_path in pairs:
+        file = Path(file_path)
+        start = time.perf_counter()
+        error = None
+        try:
+            print(f"Processing: {file.name}")
+            _route_file(file, Path(md_path), allow_docling, timings)
+        except Exception as e:
+            error = str(e)
+        results.append((file.name, error, time.perf_counter() - start, os.getpid()))
+
+    summary = ", ".join(
+        f"{engine} {len(durations)} pages in {sum(durations):.2f}s"
+        for engine, durations in sorted(timings.items())
+    )
+    if summary:
+        print(f"  Engine timings for {len(pairs)} files: {summary}")
+    report_ocr_stats()
+    return results
+
+
+def convert_files_with_router(input_dir: str, output_dir: str, subdir_name: str, allow_docling: bool = False, num_workers: Optional[int] = None, files: Optional[List[Path]] = None):
+    """
+    Convert files to markdown, choosing text layer extraction, OCR or Docling for each page.
+
+    Args:
+        input_dir (str): Directory containing files to convert.
+        output_dir (str): Base directory where converted markdown files will be saved.
+        subdir_name (str): Name of the subdirectory to store markdown files.
+        allow_docling (bool): Whether table pages may be sent to Docling.
+        num_workers (Optional[int]): Number of conversion processes (default: processing.num_workers).
+        files (Optional[List[Path]]): Convert only these raw files instead of scanning input_dir.
+
+    Returns:
+        None
+    """
+    input_path = Path(input_dir)
+    if not input_path.exists():
+        print(f"Input directory not found: {input_dir}")
+        return
+    if not input_path.is_dir():
+        raise NotADirectoryError(f"Input path is not a directory: {input_dir}")
+
+    output_path = Path(output_dir) / subdir_name
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    supported_exts = [".pdf", ".png", ".jpg", ".jpeg"] + NATIVE_EXTS
+    # Archives in the raw directory are expanded member by member while conversion runs
+    files_to_process = scan_input_files(input_path, supported_exts, files)
+
+    if num_workers is None:
+        num_workers = config["processing"].get("num_workers", 1)
+    run_conversion(files_to_process, output_path, partial(_route_batch, allow_docling=allow_docling), num_workers)
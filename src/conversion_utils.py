@@ -0,0 +1,156 @@
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.config_loader import config
+
+# (file name, error message or None, seconds spent, worker pid)
+ConversionResult = Tuple[str, Optional[str], float, int]
+
+# Worker processes outlive a single conversion call so the models they load stay warm
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+
+
+def _get_executor(num_workers: int) -> ProcessPoolExecutor:
+    """Return the shared conversion pool, (re)creating it when the worker count changes."""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != num_workers:
+        _reset_executor()
+        # spawn keeps model-loading libraries from inheriting a forked parent state
+        _executor = ProcessPoolExecutor(max_workers=num_workers, mp_context=multiprocessing.get_context("spawn"))
+        _executor_workers = num_workers
+    return _executor
+
+
+def _reset_executor() -> None:
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _executor_workers = 0
+
+
+def convert_sequentially(convert_file: Callable[[Path, Path], None], pairs: List[Tuple[str, str]]) -> List[ConversionResult]:
+    """
+    Convert a list of (input file, markdown file) pairs one after another in the current process.
+
+    Args:
+        convert_file (Callable): Function converting a single file, raising on failure.
+        pairs (List[Tuple[str, str]]): Input and output paths to convert.
+
+    Returns:
+        List[ConversionResult]: One result per pair.
+    """
+    results = []
+    for file_path, md_path in pairs:
+        file = Path(file_path)
+        start = time.perf_counter()
+        error = None
+        try:
+            print(f"Processing: {file.name}")
+            convert_file(file, Path(md_path))
+        except Exception as e:
+            error = str(e)
+        results.append((file.name, error, time.perf_counter() - start, os.getpid()))
+    return results
+
+
+def _chunk_failed(chunk: List[Tuple[str, str]], error: Exception) -> List[ConversionResult]:
+    # A crashed worker loses its whole chunk
+    if isinstance(error, BrokenProcessPool):
+        _reset_executor()
+    return [(Path(file_path).name, str(error), 0.0, -1) for file_path, _ in chunk]
+
+
+def run_conversion(files_to_process: Iterable[Path], output_path: Path, convert_batch: Callable[[List[Tuple[str, str]]], List[ConversionResult]], num_workers: int = 1, chunk_size: Optional[int] = None) -> None:
+    """
+    Convert files to markdown, skipping those already converted, optionally across a process pool.
+
+    With several workers, files are submitted in chunks as soon as the iterable produces them,
+    so conversion starts while archives are still being read.
+
+    Args:
+        files_to_process (Iterable[Path]): Files to convert; may be a generator.
+        output_path (Path): Directory where markdown files are written.
+        convert_batch (Callable): Module-level function converting a list of (input, output) path pairs.
+        num_workers (int): Number of worker processes; 1 converts in the current process.
+        chunk_size (Optional[int]): Files per pool task (default: processing.conversion_chunk_size).
+
+    Returns:
+        None
+    """
+    total_files = 0
+    skipped_files = 0
+
+    def pending_pairs() -> Iterator[Tuple[str, str]]:
+        nonlocal total_files, skipped_files
+        for file in files_to_process:
+            total_files += 1
+            md_file = output_path / f"{file.stem}.md"
+            if md_file.exists():
+                print(f"Skipping (already converted): {md_file.name}")
+                skipped_files += 1
+                continue
+            yield str(file), str(md_file)
+
+    results: List[ConversionResult] = []
+    start = time.perf_counter()
+    if num_workers <= 1:
+        pairs = list(pending_pairs())
+        if pairs:
+            results = convert_batch(pairs)
+    else:
+        if chunk_size is None:
+            chunk_size = config["processing"].get("conversion_chunk_size", 4)
+        executor = _get_executor(num_workers)
+        futures = {}
+        chunk: List[Tuple[str, str]] = []
+        for pair in pending_pairs():
+            chunk.append(pair)
+            if len(chunk) >= chunk_size:
+                futures[executor.submit(convert_batch, chunk)] = chunk
+                chunk = []
+        if chunk:
+            futures[executor.submit(convert_batch, chunk)] = chunk
+        if futures:
+            print(f"Converting with {num_workers} workers ({len(futures)} chunks)")
+        for future in as_completed(futures):
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                results.extend(_chunk_failed(futures[future], e))
+    elapsed = time.perf_counter() - start
+
+    if total_files == 0:
+        print("No supported files found to process.")
+        return
+
+    failed_conversions = 0
+    for file_name, error, _, _ in results:
+        if error is not None:
+            print(f"Error processing {file_name}: {error}")
+            failed_conversions += 1
+
+    print(f"\nParsing completed! {failed_conversions} files failed, {skipped_files} skipped, {total_files - failed_conversions - skipped_files} processed successfully.")
+    if results:
+        report_throughput(results, elapsed)
+
+
+def report_throughput(results: List[ConversionResult], elapsed: float) -> None:
+    """Print files converted and files/second per worker process, plus the overall wall-clock rate."""
+    per_worker: Dict[int, List[float]] = defaultdict(list)
+    for _, error, seconds, pid in results:
+        if error is None:
+            per_worker[pid].append(seconds)
+
+    for pid, durations in sorted(per_worker.items()):
+        busy = sum(durations)
+        rate = len(durations) / busy if busy > 0 else 0.0
+        print(f"  Worker {pid}: {len(durations)} files in {busy:.1f}s ({rate:.2f} files/s)")
+    if elapsed > 0:
+        print(f"  Total: {len(results)} files in {elapsed:.1f}s ({len(results) / elapsed:.2f} files/s)")
@@ -1,9 +1,98 @@
+import os
+import time
+from functools import partial
 from pathlib import Path
-from docling.document_converter import DocumentConverter
+from typing import Dict, List, Optional, Tuple
+from docling.datamodel.base_models import ConversionStatus, InputFormat
+from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
+from docling.document_converter import DocumentConverter, PdfFormatOption
+from src.archive_ingest import scan_input_files
+from src.conversion_utils import ConversionResult, convert_sequentially, run_conversion
+from src.text_readers import NATIVE_EXTS, convert_native_file
+from src.text_normalizer import PAGE_BREAK
+from src.config_loader import config
 
+docling_config = config["conversion"]["docling"]
 
+# One converter per profile, kept for the lifetime of the process so models load once
+_converters: Dict[str, DocumentConverter] = {}
 
-def convert_files_to_markdown(input_dir: str, output_dir: str, subdir_name: str):
+
+def get_converter(profile: str) -> DocumentConverter:
+    """
+    Return the process-wide Docling converter for a conversion profile, creating it on first use.
+
+    Args:
+        profile (str): Name of a profile under conversion.docling.profiles in config.yaml.
+
+    Returns:
+        DocumentConverter: Converter configured for the profile.
+    """
+    if profile not in _converters:
+        settings = docling_config["profiles"].get(profile)
+        if settings is None:
+            raise ValueError(f"Unknown Docling profile: {profile}")
+
+        pipeline_options = PdfPipelineOptions()
+        pipeline_options.do_ocr = settings.get("do_ocr", True)
+        pipeline_options.do_table_structure = settings.get("do_table_structure", True)
+        if settings.get("table_mode", "accurate") == "fast":
+            pipeline_options.table_structure_options.mode = TableFormerMode.FAST
+        else:
+            pipeline_options.table_structure_options.mode = TableFormerMode.ACCURATE
+
+        print(f"Loading Docling converter (profile: {profile})")
+        _converters[profile] = DocumentConverter(
+            format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)}
+        )
+    return _converters[profile]
+
+
+def _convert_batch(pairs: List[Tuple[str, str]], profile: str) -> List[ConversionResult]:
+    """
+    Convert a batch of (input, output) path pairs with Docling's batch API; runs inside pool workers.
+    Text and .docx files are read directly.
+    Documents that come back empty under a profile without OCR (scanned PDFs) are retried
+    with the profile's fallback.
+    """
+    # Text and .docx files skip the Docling document model entirely
+    results = convert_sequentially(convert_native_file, [pair for pair in pairs if Path(pair[0]).suffix.lower() in NATIVE_EXTS])
+    pairs = [pair for pair in pairs if Path(pair[0]).suffix.lower() not in NATIVE_EXTS]
+    if not pairs:
+        return results
+
+    md_paths = {Path(file_path).name: Path(md_path) for file_path, md_path in pairs}
+    retry = []
+
+    start = time.perf_counter()
+    for conv_result in get_converter(profile).convert_all([file_path for file_path, _ in pairs], raises_on_error=False):
+        file_name = Path(conv_result.input.file).name
+        print(f"Processing: {file_name}")
+        error = None
+        try:
+            if conv_result.status not in (ConversionStatus.SUCCESS, ConversionStatus.PARTIAL_SUCCESS):
+                raise RuntimeError("; ".join(e.error_message for e in conv_result.errors) or str(conv_result.status))
+            md_content = conv_result.document.export_to_markdown(image_placeholder='', page_break_placeholder=PAGE_BREAK)
+            fallback = docling_config["profiles"][profile].get("fallback")
+            if not md_content.strip() and fallback:
+                retry.append(file_name)
+                continue
+            with open(md_paths[file_name], "w", encoding="utf-8") as f:
+                f.write(md_content)
+        except Exception as e:
+            error = str(e)
+        now = time.perf_counter()
+        results.append((file_name, error, now - start, os.getpid()))
+        start = now
+
+    if retry:
+        fallback = docling_config["profiles"][profile]["fallback"]
+        print(f"No text found in {len(retry)} files with profile '{profile}', retrying with '{fallback}'")
+        results.extend(_convert_batch([(file_path, md_path) for file_path, md_path in pairs if Path(file_path).name in retry], fallback))
+    return results
+
+
+def convert_files_to_markdown(input_dir: str, output_dir: str, subdir_name: str, num_workers: Optional[int] = None, profile: Optional[str] = None, files: Optional[List[Path]] = None):
     """
     Convert files from various formats to markdown using docling.
 
@@ -11,6 +100,9 @@ def convert_files_to_markdown(input_dir: str, output_dir: str, subdir_name: str)
         input_dir (str): Directory containing files to convert.
         output_dir (str): Base directory where converted markdown files will be saved.
         subdir_name (str): Name of the subdirectory to store markdown files.
+        num_workers (Optional[int]): Number of conversion processes (default: processing.num_workers).
+        profile (Optional[str]): Docling profile to use (default: conversion.docling.profile).
+        files (Optional[List[Path]]): Convert only these raw files instead of scanning input_dir.
 
     Returns:
         None
@@ -24,37 +116,12 @@ def convert_files_to_markdown(input_dir: str, output_dir: str, subdir_name: str)
     output_path = Path(output_dir) / subdir_name
     output_path.mkdir(parents=True, exist_ok=True)
 
-    converter = DocumentConverter()
-    supported_exts = [".pdf", ".png", ".jpg", ".jpeg", ".docx", ".txt"]
-    files_to_process = [
-        file for file in input_path.iterdir()
-        if file.is_file() and file.suffix.lower() in supported_exts
-    ]
-
-    if not files_to_process:
-        print("No supported files found to process.")
-        return
-
-    print(f"Found {len(files_to_process)} files to process")
-    failed_conversions = 0
-    skipped_files = 0
-    for file in files_to_process:
-        md_file = output_path / f"{file.stem}.md"
-        if md_file.exists():
-            print(f"Skipping (already converted): {md_file.name}")
-            skipped_files += 1
-            continue
-        try:
-            print(f"Processing: {file.name}")
-            result = converter.convert(str(file)).document
-            md_content = result.export_to_markdown(image_placeholder='')
-            with open(md_file, "w", encoding="utf-8") as f:
-                f.write(md_content)
-        except Exception as e:
-            print(f"Error processing {file.name}: {str(e)}")
-            failed_conversions += 1
-            continue
-
-    print(f"\nParsing completed! {failed_conversions} files failed, {skipped_files} skipped, {len(files_to_process) - failed_conversions - skipped_files} processed successfully.")
-
+    supported_exts = [".pdf", ".png", ".jpg", ".jpeg"] + NATIVE_EXTS
+    # Archives in the raw directory are expanded member by member while conversion runs
+    files_to_process = scan_input_files(input_path, supported_exts, files)
 
+    if num_workers is None:
+        num_workers = config["processing"].get("num_workers", 1)
+    if profile is None:
+        profile = docling_config.get("profile", "accurate")
+    run_conversion(files_to_process, output_path, partial(_convert_batch, profile=profile), num_workers)
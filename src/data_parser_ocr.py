@@ -1,13 +1,107 @@
-
 import pymupdf
-import pytesseract
 from PIL import Image
-import io
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import List, Optional, TextIO, Tuple, Union
+from src.archive_ingest import scan_input_files
+from src.conversion_utils import ConversionResult, convert_sequentially, run_conversion
+from src.text_readers import NATIVE_EXTS, convert_native_file
+from src.ocr_engine import image_to_text, pixmap_to_image, report_ocr_stats
+from src.ocr_preprocess import preprocess_config, preprocess_image, render_page_for_ocr
+from src.text_normalizer import PAGE_BREAK
+from src.config_loader import config
+
+ocr_page_workers = config["processing"].get("ocr_page_workers", 4)
+
+# Pages of a document are OCR'd concurrently; tesseract releases the GIL
+_ocr_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_ocr_pool() -> ThreadPoolExecutor:
+    """Return this process's page OCR thread pool, creating it on first use."""
+    global _ocr_pool
+    if _ocr_pool is None:
+        _ocr_pool = ThreadPoolExecutor(max_workers=ocr_page_workers, thread_name_prefix="ocr-page")
+    return _ocr_pool
+
+
+def ocr_image(image: Image.Image) -> str:
+    """Preprocess an image and run OCR on it."""
+    return image_to_text(preprocess_image(image))
+
+
+def render_page_image(page: pymupdf.Page) -> Image.Image:
+    """Render a PDF page for OCR as a PIL image; call on the thread that owns the document."""
+    return pixmap_to_image(render_page_for_ocr(page))
+
+
+def ocr_page_image(image: Image.Image) -> str:
+    """Run OCR on a rendered page, preprocessing it first when enabled."""
+    if preprocess_config.get("enabled", True):
+        return ocr_image(image)
+    return image_to_text(image)
+
+
+def write_ready_pages(pending: deque, out: TextIO, max_pending: int) -> None:
+    """Write finished pages in page order, blocking on the oldest page once too many are in flight."""
+    while pending:
+        head: Union[str, Future] = pending[0]
+        if isinstance(head, Future) and not head.done() and len(pending) <= max_pending:
+            return
+        pending.popleft()
+        out.write(head.result() if isinstance(head, Future) else head)
+
 
+def _convert_pdf(file: Path, out: TextIO) -> None:
+    """Stream the text of a PDF to an open file, OCRing pages without a text layer in parallel."""
+    pool = get_ocr_pool()
+    max_pending = ocr_page_workers * 2
+    pending: deque = deque()
+    with pymupdf.open(str(file)) as doc:
+        for page_num, page in enumerate(doc):
+            if page_num:
+                pending.append(PAGE_BREAK)
+            text = page.get_text()
+            if text.strip():
+                pending.append(text)
+            else:
+                print(f"  No selectable text found on page {page_num + 1}. Running OCR...")
+                # Only the rendered image goes to the pool; MuPDF is used from this thread alone
+                pending.append(pool.submit(ocr_page_image, render_page_image(page)))
+            write_ready_pages(pending, out, max_pending)
+        write_ready_pages(pending, out, max_pending=0)
 
 
-def convert_files_to_markdown_with_ocr(input_dir: str, output_dir: str, subdir_name: str):
+def _convert_file(file: Path, md_file: Path) -> None:
+    """Extract the text of a single PDF or image file with PyMuPDF and OCR; text and .docx files are read directly."""
+    file_extension = file.suffix.lower()
+    if file_extension in NATIVE_EXTS:
+        convert_native_file(file, md_file)
+        return
+    # Pages are written as they finish; the partial file only replaces md_file once complete
+    part_file = md_file.with_suffix(md_file.suffix + ".part")
+    try:
+        with open(part_file, "w", encoding="utf-8") as out:
+            if file_extension == '.pdf':
+                _convert_pdf(file, out)
+
+            # Handle image files
+            elif file_extension in ['.jpg', '.jpeg', '.png']:
+                out.write(ocr_image(Image.open(str(file))))
+        part_file.replace(md_file)
+    finally:
+        part_file.unlink(missing_ok=True)
+
+
+def _convert_batch(pairs: List[Tuple[str, str]]) -> List[ConversionResult]:
+    """Convert a batch of (input, output) path pairs; runs inside pool workers."""
+    results = convert_sequentially(_convert_file, pairs)
+    report_ocr_stats()
+    return results
+
+
+def convert_files_to_markdown_with_ocr(input_dir: str, output_dir: str, subdir_name: str, num_workers: Optional[int] = None, files: Optional[List[Path]] = None):
     """
     Convert files from various formats to markdown using PyMuPDF and OCR.
 
@@ -15,6 +109,8 @@ def convert_files_to_markdown_with_ocr(input_dir: str, output_dir: str, subdir_n
         input_dir (str): Directory containing files to convert.
         output_dir (str): Base directory where converted markdown files will be saved.
         subdir_name (str): Name of the subdirectory to store markdown files.
+        num_workers (Optional[int]): Number of conversion processes (default: processing.num_workers).
+        files (Optional[List[Path]]): Convert only these raw files instead of scanning input_dir.
 
     Returns:
         None
@@ -29,56 +125,10 @@ def convert_files_to_markdown_with_ocr(input_dir: str, output_dir: str, subdir_n
     output_path = Path(output_dir) / subdir_name
     output_path.mkdir(parents=True, exist_ok=True)
 
-    supported_exts = [".pdf", ".png", ".jpg", ".jpeg"]
-    files_to_process = [
-        file for file in input_path.iterdir()
-        if file.is_file() and file.suffix.lower() in supported_exts
-    ]
-
-    if not files_to_process:
-        print("No supported files found to process.")
-        return
+    supported_exts = [".pdf", ".png", ".jpg", ".jpeg"] + NATIVE_EXTS
+    # Archives in the raw directory are expanded member by member while conversion runs
+    files_to_process = scan_input_files(input_path, supported_exts, files)
 
-    print(f"Found {len(files_to_process)} files to process")
-    failed_conversions = 0
-    skipped_files = 0
-    
-    for file in files_to_process:
-        md_file = output_path / f"{file.stem}.md"
-        if md_file.exists():
-            print(f"Skipping (already converted): {md_file.name}")
-            skipped_files += 1
-            continue
-        
-        full_text = ""
-        file_extension = file.suffix.lower()
-        
-        try:
-            print(f"Processing: {file.name}")
-            if file_extension == '.pdf':
-                # Handle PDF files
-                with pymupdf.open(str(file)) as doc:
-                    for page_num, page in enumerate(doc):
-                        text = page.get_text()
-                        if text.strip():
-                            full_text += text
-                        else:
-                            print(f"  No selectable text found on page {page_num + 1}. Running OCR...")
-                            pix = page.get_pixmap()
-                            img = Image.open(io.BytesIO(pix.tobytes("png")))
-                            full_text += pytesseract.image_to_string(img)
-            
-            # Handle image files
-            elif file_extension in ['.jpg', '.jpeg', '.png']:
-                full_text = pytesseract.image_to_string(Image.open(str(file)))
-
-            # Save the extracted text to a markdown file
-            with open(md_file, "w", encoding="utf-8") as f:
-                f.write(full_text)
-                
-        except Exception as e:
-            print(f"  Error processing {file.name}: {str(e)}")
-            failed_conversions += 1
-            continue
-
-    print(f"\nParsing completed! {failed_conversions} files failed, {skipped_files} skipped, {len(files_to_process) - failed_conversions - skipped_files} processed successfully.")
\ No newline at end of file
+    if num_workers is None:
+        num_workers = config["processing"].get("num_workers", 1)
+    run_conversion(files_to_process, output_path, _convert_batch, num_workers)
@@ -0,0 +1,114 @@
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.config_loader import config
+from src.utils import default_resume, default_job_requirements
+
+max_attempts = config["processing"].get("dead_letter_max_attempts", 5)
+default_records = {
+    "resumes": default_resume.dict(),
+    "job_descriptions": default_job_requirements.dict(),
+}
+
+
+def _dead_letter_dir(file_type: str) -> Path:
+    dirs = config["data"]["directories"][file_type]
+    return Path(dirs.get("dead_letter", Path(dirs["sub"]) / "dead_letter"))
+
+
+def is_default_record(data: Dict, file_type: str) -> bool:
+    """Check whether extracted data is the placeholder that older versions wrote after a failed extraction."""
+    return {k: v for k, v in data.items() if k != "filename"} == default_records[file_type]
+
+
+def is_failed_output(output_file: Path, file_type: str) -> bool:
+    """Check whether an extraction JSON file holds a placeholder record instead of extracted data."""
+    try:
+        with open(output_file, "r", encoding="utf-8") as f:
+            return is_default_record(json.load(f), file_type)
+    except Exception:
+        return True
+
+
+def get_failure(file_type: str, source_file: Path) -> Optional[Dict]:
+    """
+    Load the dead-letter entry of a document.
+
+    Args:
+        file_type (str): Either 'resumes' or 'job_descriptions'.
+        source_file (Path): Markdown file that failed extraction.
+
+    Returns:
+        Optional[Dict]: Entry with the filename, last error, attempt count and time of the last failure, or None.
+    """
+    entry_file = _dead_letter_dir(file_type) / f"{source_file.stem}.json"
+    if not entry_file.exists():
+        return None
+    try:
+        with open(entry_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading dead-letter entry {entry_file.name}: {str(e)}")
+        return None
+
+
+def should_retry(file_type: str, source_file: Path) -> bool:
+    """Check whether a document may be extracted again (it failed fewer than dead_letter_max_attempts times)."""
+    entry = get_failure(file_type, source_file)
+    return entry is None or entry.get("attempts", 0) < max_attempts
+
+
+def record_failure(file_type: str, source_file: Path, error: Exception) -> None:
+    """
+    Add or update the dead-letter entry of a document whose extraction failed.
+
+    No extraction JSON is written for the document, so the next run picks it up again.
+
+    Args:
+        file_type (str): Either 'resumes' or 'job_descriptions'.
+        source_file (Path): Markdown file that failed extraction.
+        error (Exception): Error of the last attempt.
+
+    Returns:
+        None
+    """
+    entry = get_failure(file_type, source_file) or {"filename": source_file.name, "attempts": 0}
+    entry.update({
+        "attempts": entry.get("attempts", 0) + 1,
+        "error_type": type(error).__name__,
+        "error": str(error),
+        "last_failed": time.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+    dead_letter_dir = _dead_letter_dir(file_type)
+    dead_letter_dir.mkdir(parents=True, exist_ok=True)
+    with open(dead_letter_dir / f"{source_file.stem}.json", "w", encoding="utf-8") as f:
+        json.dump(entry, f, indent=2, ensure_ascii=False)
+
+
+def clear_failure(file_type: str, source_file: Path) -> None:
+    """Remove the dead-letter entry of a document after a successful extraction."""
+    (_dead_letter_dir(file_type) / f"{source_file.stem}.json").unlink(missing_ok=True)
+
+
+def list_failures(file_type: str) -> List[Dict]:
+    """
+    List the documents currently in the dead-letter area.
+
+    Args:
+        file_type (str): Either 'resumes' or 'job_descriptions'.
+
+    Returns:
+        List[Dict]: Dead-letter entries.
+    """
+    dead_letter_dir = _dead_letter_dir(file_type)
+    if not dead_letter_dir.exists():
+        return []
+    entries = []
+    for entry_file in sorted(dead_letter_dir.glob("*.json")):
+        try:
+            with open(entry_file, "r", encoding="utf-8") as f:
+                entries.append(json.load(f))
+        except Exception as e:
+            print(f"Error loading dead-letter entry {entry_file.name}: {str(e)}")
+    return entries
@@ -1,13 +1,17 @@
 import json
 from pathlib import Path
 from typing import Dict, List, Optional
-from langchain_core.prompts import PromptTemplate
 from langchain_core.language_models import BaseLanguageModel
-from src.utils import JobRequirementsData,default_job_requirements
-from src.prompts import JOB_DESCRIPTION_EXTRACTION_PROMPT
+from src.utils import JobRequirementsData,PackedJobDescriptions
+from src.prompts import JOB_DESCRIPTION_EXTRACTION_PROMPT,PACKED_JOB_DESCRIPTION_EXTRACTION_PROMPT
+from src.llm_client import ainvoke_structured, format_packed_documents, gather_bounded, pack_files, run_async
+from src.llm_cache import report_cache_stats
+from src.prompt_cache import report_prefix_cache_stats
+from src.dead_letter import clear_failure, is_failed_output, record_failure, should_retry
+from src.heuristic_extractor import is_heuristic_output
 
 
-def process_job_description_file(jd_file: Path, llm: BaseLanguageModel) -> Dict:
+async def aprocess_job_description_file(jd_file: Path, llm: BaseLanguageModel) -> Dict:
     """
     Process a single job description file and extract structured data.
 
@@ -17,6 +21,9 @@ def process_job_description_file(jd_file: Path, llm: BaseLanguageModel) -> Dict:
 
     Returns:
         Dict: Extracted job description data as a dictionary.
+
+    Raises:
+        Exception: If the file cannot be read or the LLM call fails after retries.
     """
     try:
         with open(jd_file, 'r', encoding='utf-8') as f:
@@ -24,16 +31,8 @@ def process_job_description_file(jd_file: Path, llm: BaseLanguageModel) -> Dict:
 
         print(f"Processing job description from: {jd_file.name}")
 
-        prompt = PromptTemplate(
-            template=JOB_DESCRIPTION_EXTRACTION_PROMPT,
-            input_variables=["job_description_text"]
-        )
-        
-        # Configure the LLM for structured output based on the Pydantic model
-        structured_llm = llm.with_structured_output(JobRequirementsData)
-        chain = prompt | structured_llm
-        
-        jd_data = chain.invoke({"job_description_text": jd_text})
+        jd_data = await ainvoke_structured(llm, JOB_DESCRIPTION_EXTRACTION_PROMPT, JobRequirementsData,
+                                           {"job_description_text": jd_text})
         
         result = jd_data.dict()
         result['filename'] = jd_file.name
@@ -42,14 +41,90 @@ def process_job_description_file(jd_file: Path, llm: BaseLanguageModel) -> Dict:
     
     except Exception as e:
         print(f"Error processing job description from {jd_file.name}: {str(e)}")
-        # Return a default
-        result = default_job_requirements.dict()
-        result['filename'] = jd_file.name
-        return result
+        raise
+
+
+def process_job_description_file(jd_file: Path, llm: BaseLanguageModel) -> Dict:
+    """
+    Synchronous wrapper around aprocess_job_description_file.
+
+    Args:
+        jd_file (Path): Path to the job description file.
+        llm (BaseLanguageModel): The language model instance for processing.
+
+    Returns:
+        Dict: Extracted job description data as a dictionary.
+    """
+    return run_async(aprocess_job_description_file(jd_file, llm))
+
+
+async def aprocess_job_description_pack(jd_files: List[Path], llm: BaseLanguageModel) -> Dict[str, Dict]:
+    """
+    Extract several job descriptions with a single LLM request.
+
+    Args:
+        jd_files (List[Path]): Job description files to send together.
+        llm (BaseLanguageModel): The language model instance for processing.
+
+    Returns:
+        Dict[str, Dict]: Extracted job description data keyed by file name; documents missing from the response are left out.
+    """
+    documents = []
+    for jd_file in jd_files:
+        with open(jd_file, 'r', encoding='utf-8') as f:
+            documents.append((jd_file.name, f.read()))
+
+    print(f"Processing {len(documents)} packed job descriptions: {', '.join(name for name, _ in documents)}")
+
+    response = await ainvoke_structured(llm, PACKED_JOB_DESCRIPTION_EXTRACTION_PROMPT, PackedJobDescriptions,
+                                        {"job_description_documents": format_packed_documents(documents)})
+
+    expected = {jd_file.name for jd_file in jd_files}
+    results = {}
+    for jd in response.job_descriptions:
+        if jd.filename in expected and jd.filename not in results:
+            results[jd.filename] = jd.dict()
+    return results
+
+
+async def _extract_jds_to_files(jd_files: List[Path], output_path: Path, llm: BaseLanguageModel) -> int:
+    """Extract a pack of job descriptions and save each as JSON; failed files go to the dead-letter area. Returns the number of failures."""
+    results = {}
+    if len(jd_files) > 1:
+        try:
+            results = await aprocess_job_description_pack(jd_files, llm)
+        except Exception as e:
+            print(f"Error processing packed job descriptions, falling back to one request per file: {str(e)}")
+        missing = len(jd_files) - len(results)
+        if results and missing:
+            print(f"{missing} of {len(jd_files)} packed job descriptions were not returned, retrying them one by one")
+
+    failed = 0
+    for jd_file in jd_files:
+        jd_data = results.get(jd_file.name)
+        if jd_data is None:
+            try:
+                jd_data = await aprocess_job_description_file(jd_file, llm)
+            except Exception as e:
+                # No JSON is written, so the next run retries this job description
+                record_failure("job_descriptions", jd_file, e)
+                failed += 1
+                continue
+
+        output_file = output_path / f"{jd_file.stem}.json"
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(jd_data, f, indent=2, ensure_ascii=False)
+        clear_failure("job_descriptions", jd_file)
+        print(f"Successfully processed and saved: {output_file.name}")
+    return failed
+
 
 def process_job_descriptions_directory(jds_dir: str, output_dir: str, llm: BaseLanguageModel) -> None:
     """
     Process all job description files in a directory and save each as a separate JSON file.
+    Files are extracted concurrently, with at most processing.llm_max_concurrency requests in flight,
+    and packed processing.extraction_pack_size at a time into a single request. Files that fail
+    are recorded in the dead-letter area instead of being saved, and are retried on the next run.
 
     Args:
         jds_dir (str): Directory containing job description files.
@@ -79,25 +154,36 @@ def process_job_descriptions_directory(jds_dir: str, output_dir: str, llm: BaseL
     
     print(f"Found {total_files} job description files to process.")
     print(f"Output will be saved to: {output_dir}")
-    processed=0
     skipped=0
+    pending=[]
     for jd_file in jd_files:
         output_file = output_path / f"{jd_file.stem}.json"
         if output_file.exists():
-            print(f"Skipping already extracted file: {jd_file.name}")
+            if not is_failed_output(output_file, "job_descriptions") and not is_heuristic_output(output_file):
+                print(f"Skipping already extracted file: {jd_file.name}")
+                skipped+=1
+                continue
+            # Placeholder record left by a failed extraction in an older version, or a heuristic extraction
+            output_file.unlink()
+        if not should_retry("job_descriptions", jd_file):
+            print(f"Skipping {jd_file.name}: extraction failed too many times, see the dead-letter area")
             skipped+=1
             continue
-        try:
-            jd_data = process_job_description_file(jd_file, llm)
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(jd_data, f, indent=2, ensure_ascii=False)
-            processed+=1
-            print(f"Successfully processed and saved: {output_file.name}")
-            
-        except Exception as e:
-            print(f"Critical error processing {jd_file.name}: {str(e)}")
+        pending.append(jd_file)
+
+    packs = pack_files(pending)
+    results = run_async(gather_bounded(_extract_jds_to_files(pack, output_path, llm) for pack in packs))
+
+    processed=0
+    failed=0
+    for pack, outcome in zip(packs, results):
+        if isinstance(outcome, Exception):
+            print(f"Critical error processing {', '.join(jd_file.name for jd_file in pack)}: {str(outcome)}")
             continue
+        processed+=len(pack)-outcome
+        failed+=outcome
 
-    print(f"Job description processing completed! {processed} files extracted successfully, {skipped} skipped.")
+    print(f"Job description processing completed! {processed} files extracted successfully, {failed} failed, {skipped} skipped.")
+    report_cache_stats()
+    report_prefix_cache_stats()
     return
\ No newline at end of file
@@ -4,6 +4,8 @@ from ..utils import Candidates, JobMatchingResult, CandidateMatch, IndividualSco
 from .embed_utils import parse_years, calculate_normalized_score, weights
 from .similarity_calculator import encode_data, calculate_similarity, compute_fuzzy_match, compute_fuzzy_education_match
 from ..config_loader import config
+from ..near_duplicates import is_older_version, load_duplicate_map
+from ..shortlist import ranking_order
 
 
 def rank_resumes(resumes_dir: str, jd_file: str, output_dir: str) -> None:
@@ -28,8 +30,9 @@ def rank_resumes(resumes_dir: str, jd_file: str, output_dir: str) -> None:
         print(f"Error loading job description {jd_path.name}: {str(e)}")
         return
 
-    # Get all resume JSON files
-    resume_files = list(resumes_path.glob("*.json"))
+    # Get all resume JSON files, leaving out older versions of near-duplicate resumes
+    duplicate_of = load_duplicate_map()
+    resume_files = [rf for rf in resumes_path.glob("*.json") if rf.stem not in duplicate_of]
     if not resume_files:
         print("No resume files found in the directory.")
         return
@@ -42,9 +45,17 @@ def rank_resumes(resumes_dir: str, jd_file: str, output_dir: str) -> None:
         try:
             with open(output_file, "r", encoding="utf-8") as f:
                 existing_result = json.load(f)
-            existing_candidates = [CandidateMatch.parse_obj(c) for c in existing_result.get("candidates", {}).get("candidates", [])]
-            existing_file_names = {c.file_name for c in existing_candidates}
-            print(f"Found {len(existing_candidates)} already ranked candidates, skipping them.")
+            for c in existing_result.get("candidates", {}).get("candidates", []):
+                if is_older_version(c.get("file_name"), duplicate_of):
+                    continue
+                try:
+                    existing_candidates.append(CandidateMatch.parse_obj(c))
+                except Exception as e:
+                    # Entries with missing or malformed fields are ranked again
+                    print(f"Dropping invalid ranking entry {c.get('file_name', 'unknown')}: {str(e).splitlines()[0]}")
+            # Candidates without a ranking_method predate it and are ranked again
+            existing_file_names = {Path(c.file_name).stem for c in existing_candidates if c.ranking_method}
+            print(f"Found {len(existing_file_names)} already ranked candidates, skipping them.")
         except Exception as e:
             print(f"Error loading existing results, will overwrite. Reason: {str(e)}")
 
@@ -56,13 +67,13 @@ def rank_resumes(resumes_dir: str, jd_file: str, output_dir: str) -> None:
     print(f"Processing {len(resume_files_to_process)} new resumes...")
     
     # Pre-calculate JD embeddings once
-    jd_job_title_emb = encode_data(jd_data.get("job_title", ""))
-    jd_skills_emb = encode_data(" ".join(jd_data.get("required_skills", []) + jd_data.get("preferred_skills", [])))
-    jd_education_emb = encode_data(" ".join([jd_data.get("required_education", "") or "", jd_data.get("preferred_education", "") or ""]))
-    jd_responsibilities_emb = encode_data(" ".join(jd_data.get("responsibilities", [])))
-    jd_soft_skills_emb = encode_data(" ".join(jd_data.get("soft_skills", [])))
-    jd_domain_knowledge_emb = encode_data(" ".join(jd_data.get("required_domain_knowledge", []) + jd_data.get("preferred_domain_knowledge", [])))
-    jd_preferred_qualifications_emb = encode_data(" ".join(jd_data.get("preferred_skills", []) + jd_data.get("preferred_domain_knowledge", [])))
+    jd_job_title_emb = encode_data(jd_data.get("job_title") or "")
+    jd_skills_emb = encode_data(" ".join((jd_data.get("required_skills") or []) + (jd_data.get("preferred_skills") or [])))
+    jd_education_emb = encode_data(" ".join([jd_data.get("required_education") or "", jd_data.get("preferred_education") or ""]))
+    jd_responsibilities_emb = encode_data(" ".join(jd_data.get("responsibilities") or []))
+    jd_soft_skills_emb = encode_data(" ".join(jd_data.get("soft_skills") or []))
+    jd_domain_knowledge_emb = encode_data(" ".join((jd_data.get("required_domain_knowledge") or []) + (jd_data.get("preferred_domain_knowledge") or [])))
+    jd_preferred_qualifications_emb = encode_data(" ".join((jd_data.get("preferred_skills") or []) + (jd_data.get("preferred_domain_knowledge") or [])))
 
 
     new_candidates = []
@@ -72,18 +83,18 @@ def rank_resumes(resumes_dir: str, jd_file: str, output_dir: str) -> None:
                 resume_data = json.load(f)
 
             # Encode resume sections
-            resume_job_title_emb = encode_data(resume_data.get("job_title", ""))
-            resume_skills_emb = encode_data(" ".join(resume_data.get("skills", [])))
+            resume_job_title_emb = encode_data(resume_data.get("job_title") or "")
+            resume_skills_emb = encode_data(" ".join(resume_data.get("skills") or []))
 
-            resume_education_text = " ".join([e.get("degree", "") + " " + e.get("field_of_study", "") for e in resume_data.get("education", [])])
+            resume_education_text = " ".join([(e.get("degree") or "") + " " + (e.get("field_of_study") or "") for e in (resume_data.get("education") or [])])
             resume_education_emb = encode_data(resume_education_text)
 
-            resume_experience_text = " ".join([e.get("description", "") + " " + " ".join(e.get("technologies_used", [])) for e in resume_data.get("experience", [])])
+            resume_experience_text = " ".join([(e.get("description") or "") + " " + " ".join(e.get("technologies_used") or []) for e in (resume_data.get("experience") or [])])
             resume_experience_emb = encode_data(resume_experience_text)
 
-            resume_soft_skills_emb = encode_data(" ".join(resume_data.get("soft_skills", [])))
-            resume_domain_knowledge_emb = encode_data(" ".join(resume_data.get("domain_knowledge", {}).get("industries", [])))
-            resume_qualifications_emb = encode_data(" ".join(resume_data.get("skills", []) + resume_data.get("domain_knowledge", {}).get("industries", [])))
+            resume_soft_skills_emb = encode_data(" ".join(resume_data.get("soft_skills") or []))
+            resume_domain_knowledge_emb = encode_data(" ".join((resume_data.get("domain_knowledge") or {}).get("industries") or []))
+            resume_qualifications_emb = encode_data(" ".join((resume_data.get("skills") or []) + ((resume_data.get("domain_knowledge") or {}).get("industries") or [])))
 
             # Calculate embedding similarity scores
             job_title_relevance = calculate_similarity(jd_job_title_emb, resume_job_title_emb)
@@ -95,29 +106,29 @@ def rank_resumes(resumes_dir: str, jd_file: str, output_dir: str) -> None:
             preferred_qualifications_relevance = calculate_similarity(jd_preferred_qualifications_emb, resume_qualifications_emb)
 
             # Fuzzy matching for specified categories
-            jd_required_skills = set(jd_data.get("required_skills", []))
-            resume_skills_set = set(resume_data.get("skills", []))
+            jd_required_skills = set(jd_data.get("required_skills") or [])
+            resume_skills_set = set(resume_data.get("skills") or [])
             skills_fuzzy_score = compute_fuzzy_match(jd_required_skills, resume_skills_set)
             skills_match = config["scoring"]["embedding_score"] * skills_embedding_score + config["scoring"]["fuzzy_score"] * skills_fuzzy_score
 
-            jd_required_education = jd_data.get("required_education", "")
-            resume_education_list = [e.get("degree", "") + " " + e.get("field_of_study", "") for e in resume_data.get("education", [])]
+            jd_required_education = jd_data.get("required_education") or ""
+            resume_education_list = [(e.get("degree") or "") + " " + (e.get("field_of_study") or "") for e in (resume_data.get("education") or [])]
             education_fuzzy_score = compute_fuzzy_education_match(jd_required_education, resume_education_list)
             education_match = config["scoring"]["embedding_score"] * education_embedding_score + config["scoring"]["fuzzy_score"] * education_fuzzy_score
 
-            jd_experience_years = parse_years(jd_data.get("required_experience_duration", ""))
-            resume_experience_years = parse_years(resume_data.get("experience_duration", ""))
+            jd_experience_years = parse_years(jd_data.get("required_experience_duration") or "")
+            resume_experience_years = parse_years(resume_data.get("experience_duration") or "")
             experience_years_score = min(100, (resume_experience_years / jd_experience_years * 100) if jd_experience_years else 50)
 
-            jd_certifications = set(jd_data.get("required_certifications", []))
-            resume_certifications = set(c.get("name", "") for c in resume_data.get("certifications", []))
+            jd_certifications = set(jd_data.get("required_certifications") or [])
+            resume_certifications = set(c.get("name") or "" for c in (resume_data.get("certifications") or []))
             certifications_match = compute_fuzzy_match(jd_certifications, resume_certifications)
 
-            jd_languages = set(jd_data.get("languages", []))
-            resume_languages = set(resume_data.get("languages", []))
+            jd_languages = set(jd_data.get("languages") or [])
+            resume_languages = set(resume_data.get("languages") or [])
             languages_match = compute_fuzzy_match(jd_languages, resume_languages)
 
-            jd_preferred_education = jd_data.get("preferred_education", "")
+            jd_preferred_education = jd_data.get("preferred_education") or ""
             preferred_education_score = compute_fuzzy_education_match(jd_preferred_education, resume_education_list)
 
             scores = IndividualScore(
@@ -138,10 +149,11 @@ def rank_resumes(resumes_dir: str, jd_file: str, output_dir: str) -> None:
             candidate = CandidateMatch(
                 name=resume_data.get("name", "Unknown"),
                 file_name=resume_data.get("filename", resume_file.name),
-                job_title=resume_data.get("job_title", ""),
-                contact=resume_data.get("contact", {}),
+                job_title=resume_data.get("job_title") or "",
+                contact=resume_data.get("contact") or {},
                 scores=scores,
-                overall_score=round(overall_score, 2)
+                overall_score=round(overall_score, 2),
+                ranking_method="embedding"
             )
             new_candidates.append(candidate)
             print(f"Processed candidate: {candidate.name} from {resume_file.name}")
@@ -155,7 +167,9 @@ def rank_resumes(resumes_dir: str, jd_file: str, output_dir: str) -> None:
         candidate_dict[candidate.file_name] = candidate
 
     merged_candidates = list(candidate_dict.values())
-    merged_candidates = sorted(merged_candidates, key=lambda x: x.overall_score, reverse=True)
+    for candidate in merged_candidates:
+        candidate.overall_score = round(calculate_normalized_score(candidate.scores, weights), 2)
+    merged_candidates = sorted(merged_candidates, key=lambda x: ranking_order(x.dict()), reverse=True)
     result = JobMatchingResult(
         job_title=jd_data.get("job_title", "Unknown"),
         job_file_name=jd_path.name,
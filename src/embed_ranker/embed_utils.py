@@ -1,5 +1,6 @@
-from ..utils import IndividualScore
+from ..utils import IndividualScore, NOT_APPLICABLE_SCORE
 from ..config_loader import config
+import math
 import re
 # Weights for overall score calculation (total = 1.0)
 weights = config["scoring"]["weights"]
@@ -27,19 +28,21 @@ def normalize_text(text: str) -> str:
 
 def calculate_normalized_score(scores: IndividualScore, weights: dict) -> float:
     """
-    Calculates a normalized overall score based on non-negative category scores.
-    Scores should be between 0 and 100, with -1 indicating missing data.
+    Calculates a normalized overall score based on the applicable category scores.
+    Scores should be between 0 and 100, with -1 (NOT_APPLICABLE_SCORE) marking a category the job
+    description has no requirements for; those are left out, other values are clamped to 0-100.
     """
     overall_score = 0.0
     total_weight = 0.0
 
     for k, v in weights.items():
         score = getattr(scores, k)
-        
-        # This conditional statement is what excludes negative scores
-        if score >= 0:
-            overall_score += score * v
-            total_weight += v
+
+        # Categories that don't apply are left out instead of counting as a zero score
+        if score is None or math.isclose(score, NOT_APPLICABLE_SCORE):
+            continue
+        overall_score += min(max(score, 0), 100) * v
+        total_weight += v
     
     # Normalize the score by the total weight of included categories
     if total_weight > 0:
@@ -3,13 +3,11 @@ from typing import Dict
 
 import gradio as gr
 import pandas as pd
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.llm_backends import build_llm
 from src.ui_utils import process_files_pipeline, save_dataframe_to_csv
 from src.config_loader import config
 
-llm = ChatGoogleGenerativeAI(model=config["models"]["language_model"]["model_name"],
-                             temperature=config["models"]["language_model"]["temperature"],
-                             api_key=config["models"]["language_model"]["api_key"])
+llm = build_llm()
 
 
 def create_gradio_interface():
@@ -53,14 +51,14 @@ def create_gradio_interface():
                 resume_upload = gr.File(
                     label="Upload Resume Files",
                     file_count="multiple",
-                    file_types=[".pdf", ".docx", ".txt", ".md", ".png", ".jpg", ".jpeg"],
+                    file_types=[".pdf", ".docx", ".txt", ".md", ".png", ".jpg", ".jpeg", ".zip", ".tar", ".gz", ".tgz"],
                     elem_classes=["upload-box"]
                 )
             with gr.Column(scale=1):
                 jd_upload = gr.File(
                     label="Upload Job Description Files",
                     file_count="multiple",
-                    file_types=[".pdf", ".docx", ".txt", ".md", ".png", ".jpg", ".jpeg"],
+                    file_types=[".pdf", ".docx", ".txt", ".md", ".png", ".jpg", ".jpeg", ".zip", ".tar", ".gz", ".tgz"],
                     elem_classes=["upload-box"]
                 )
             with gr.Column(scale=1):
@@ -139,7 +137,7 @@ def create_gradio_interface():
                     
                     # DataFrame display
                     gr.DataFrame(
-                        value=df[["Rank","Candidate Name", "Current Job Title", "Phone", "Email", "LinkedIn", "Overall Score", "Resume File"]],
+                        value=df[["Rank","Candidate Name", "Current Job Title", "Phone", "Email", "LinkedIn", "Overall Score", "Scored By", "Resume File"]],
                         interactive=True,
                         wrap=True,
                         label=" "
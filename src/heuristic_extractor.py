@@ -0,0 +1,628 @@
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.utils import (ResumeData, Contact, Education, Certification, Experience, Project, DomainKnowledge,
+                       Award, Publication, JobRequirementsData)
+from src.text_normalizer import normalize_text
+from src.dead_letter import is_failed_output
+from src.near_duplicates import update_duplicate_index
+from src.config_loader import config
+
+heuristic_config = config.get("heuristic_extraction", {})
+
+EXTRACTION_METHOD = "heuristic"
+
+# Canonical spelling of technical skills; matching is case-insensitive on word boundaries
+SKILLS = [
+    # Languages
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Golang", "Rust", "Kotlin", "Swift", "Scala", "Ruby",
+    "PHP", "Perl", "MATLAB", "Dart", "Objective-C", "Bash", "PowerShell", "SQL", "NoSQL", "PL/SQL", "T-SQL", "HTML",
+    "CSS", "Sass", "GraphQL", "Solidity", "VBA", "Haskell", "Elixir", "Lua",
+    # Frameworks and libraries
+    "Django", "Flask", "FastAPI", "Spring", "Spring Boot", "Hibernate", ".NET", "ASP.NET", "Node.js", "Express",
+    "NestJS", "React", "React Native", "Next.js", "Angular", "Vue.js", "Svelte", "jQuery", "Redux", "Bootstrap",
+    "Tailwind", "Flutter", "Laravel", "Ruby on Rails", "Pandas", "NumPy", "SciPy", "scikit-learn", "TensorFlow",
+    "PyTorch", "Keras", "XGBoost", "LightGBM", "OpenCV", "spaCy", "NLTK", "Hugging Face", "LangChain", "Matplotlib",
+    "Seaborn", "Plotly", "Celery", "Selenium", "Cypress", "Jest", "JUnit", "pytest",
+    # Data and storage
+    "PostgreSQL", "MySQL", "SQLite", "Oracle", "SQL Server", "MongoDB", "Redis", "Cassandra", "DynamoDB",
+    "Elasticsearch", "Neo4j", "Snowflake", "BigQuery", "Redshift", "Databricks", "Hadoop", "Spark", "PySpark",
+    "Kafka", "RabbitMQ", "Airflow", "dbt", "Hive", "Flink", "ETL", "Data Warehousing", "Power BI", "Tableau",
+    "Looker", "Excel",
+    # Cloud and DevOps
+    "AWS", "Azure", "GCP", "Google Cloud", "Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins", "GitHub Actions",
+    "GitLab CI", "CI/CD", "Git", "Linux", "Nginx", "Apache", "Prometheus", "Grafana", "Helm", "OpenShift",
+    "Serverless", "Lambda", "Microservices", "REST", "gRPC", "SOAP",
+    # Disciplines
+    "Machine Learning", "Deep Learning", "Computer Vision", "Natural Language Processing", "NLP", "LLM",
+    "Data Analysis", "Data Science", "Data Engineering", "Statistics", "MLOps", "DevOps", "Agile", "Scrum", "Kanban",
+    "JIRA", "Confluence", "Figma", "UI/UX", "Unit Testing", "TDD", "OOP", "System Design", "Networking",
+    "Cybersecurity", "Penetration Testing", "SAP", "Salesforce", "Blockchain", "Embedded Systems", "IoT",
+]
+
+SOFT_SKILLS = [
+    "Communication", "Teamwork", "Leadership", "Problem Solving", "Critical Thinking", "Time Management",
+    "Adaptability", "Collaboration", "Creativity", "Attention to Detail", "Mentoring", "Negotiation",
+    "Presentation", "Decision Making", "Conflict Resolution", "Project Management", "Stakeholder Management",
+    "Organization", "Self-motivated", "Interpersonal Skills", "Public Speaking", "Analytical Skills", "Team Leadership",
+]
+
+LANGUAGES = [
+    "English", "Arabic", "French", "German", "Spanish", "Italian", "Portuguese", "Russian", "Chinese", "Mandarin",
+    "Cantonese", "Japanese", "Korean", "Hindi", "Urdu", "Turkish", "Dutch", "Swedish", "Norwegian", "Danish",
+    "Finnish", "Polish", "Greek", "Hebrew", "Persian", "Indonesian", "Malay", "Vietnamese", "Thai", "Bengali",
+]
+
+INDUSTRIES = [
+    "Fintech", "Banking", "Finance", "Insurance", "Healthcare", "Pharmaceutical", "Biotech", "E-commerce", "Retail",
+    "Telecommunications", "Telecom", "Education", "EdTech", "Logistics", "Supply Chain", "Manufacturing",
+    "Automotive", "Energy", "Oil and Gas", "Real Estate", "Media", "Advertising", "Gaming", "Travel", "Hospitality",
+    "Government", "Cybersecurity", "SaaS", "Consulting", "Aerospace", "Agriculture", "Construction",
+]
+
+CERTIFICATION_ISSUERS = {
+    "aws": "Amazon Web Services", "amazon": "Amazon Web Services", "azure": "Microsoft", "microsoft": "Microsoft",
+    "google": "Google", "gcp": "Google", "cisco": "Cisco", "ccna": "Cisco", "ccnp": "Cisco", "oracle": "Oracle",
+    "pmp": "PMI", "pmi": "PMI", "comptia": "CompTIA", "cissp": "ISC2", "scrum": "Scrum Alliance",
+    "coursera": "Coursera", "udemy": "Udemy", "edx": "edX", "ibm": "IBM", "red hat": "Red Hat", "kubernetes": "CNCF",
+    "salesforce": "Salesforce", "databricks": "Databricks",
+}
+
+DEGREES = [
+    (r"\b(ph\.?\s?d|doctor(ate)? of philosophy|doctorate)\b", "Doctor of Philosophy"),
+    (r"\b(mba|master of business administration)\b", "Master of Business Administration"),
+    (r"\b(m\.?\s?sc|m\.?s\.|master of science|master'?s? in)\b", "Master of Science"),
+    (r"\b(m\.?\s?eng|master of engineering)\b", "Master of Engineering"),
+    (r"\b(m\.?a\.|master of arts)\b", "Master of Arts"),
+    (r"\b(b\.?\s?sc|b\.?s\.|bachelor of science|bachelor'?s? in|bachelor'?s? degree)\b", "Bachelor of Science"),
+    (r"\b(b\.?\s?eng|b\.?e\.|bachelor of engineering)\b", "Bachelor of Engineering"),
+    (r"\b(b\.?\s?tech|bachelor of technology)\b", "Bachelor of Technology"),
+    (r"\b(b\.?a\.|bachelor of arts)\b", "Bachelor of Arts"),
+    (r"\b(bachelor)\b", "Bachelor's Degree"),
+    (r"\b(master)\b", "Master's Degree"),
+    (r"\b(associate degree|associate of)\b", "Associate Degree"),
+    (r"\b(diploma)\b", "Diploma"),
+]
+
+RESUME_SECTIONS = {
+    "summary": ["summary", "profile", "objective", "about me", "about"],
+    "experience": ["experience", "employment", "work history", "career history", "professional background"],
+    "education": ["education", "academic", "qualifications"],
+    "skills": ["skills", "technologies", "technical", "competencies", "tools", "tech stack"],
+    "certifications": ["certification", "certificates", "licenses", "courses", "training"],
+    "projects": ["projects", "project"],
+    "languages": ["languages", "language"],
+    "awards": ["awards", "honors", "honours", "achievements"],
+    "publications": ["publications", "papers", "research"],
+    "soft_skills": ["soft skills", "interpersonal"],
+    "volunteering": ["volunteer", "activities", "extracurricular"],
+}
+
+JD_SECTIONS = {
+    "responsibilities": ["responsibilities", "what you'll do", "what you will do", "duties", "the role", "your role", "key tasks"],
+    "preferred": ["preferred", "nice to have", "bonus", "plus", "desirable", "good to have"],
+    "requirements": ["requirements", "qualifications", "what we're looking for", "what we are looking for", "must have", "who you are", "skills"],
+    "about": ["about us", "about the company", "benefits", "what we offer", "perks"],
+}
+
+MONTHS = {m: i for i, m in enumerate(["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+_DATE = r"(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+\d{4}|\d{1,2}[/.]\d{4}|\d{4})"
+_DATE_RANGE = re.compile(rf"({_DATE})\s*(?:-|–|—|to|until)\s*({_DATE}|present|current|now|today|ongoing)", re.IGNORECASE)
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE = re.compile(r"(?<!\w)(\+?\d[\d\s().-]{7,}\d)(?!\w)")
+_LINKEDIN = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/[\w/\-%.]+", re.IGNORECASE)
+_GITHUB = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[\w\-.]+", re.IGNORECASE)
+_URL = re.compile(r"(?:https?://|www\.)[\w\-.]+\.[a-z]{2,}[\w/\-.%?=&#]*", re.IGNORECASE)
+_GPA = re.compile(r"\b(?:gpa|cgpa)\s*[:\-]?\s*(\d(?:\.\d{1,2})?)", re.IGNORECASE)
+_GPA_TEXT = re.compile(r"\b(?:gpa|cgpa)\s*[:\-]?\s*\d(?:\.\d{1,2})?(?:\s*/\s*\d(?:\.\d{1,2})?)?", re.IGNORECASE)
+_YEAR = re.compile(r"\b(19[5-9]\d|20\d\d)\b")
+_EXPERIENCE_YEARS = re.compile(r"(\d+(?:\.\d+)?)\s*(\+)?\s*(?:(?:-|–|to)\s*(\d+(?:\.\d+)?)\s*)?\+?\s*(?:years?|yrs?)", re.IGNORECASE)
+_BULLET = re.compile(r"^\s*(?:[-*•▪●]|\d+[.)])\s+")
+_MD_MARKUP = re.compile(r"[*_`#>]+")
+
+
+def _compile_terms(terms: Iterable[str]) -> List[Tuple[str, re.Pattern]]:
+    return [(term, re.compile(rf"(?<![\w+#.]){re.escape(term)}(?![\w+#])", re.IGNORECASE)) for term in terms]
+
+
+def _load_skill_terms() -> List[str]:
+    terms = list(SKILLS)
+    skills_file = heuristic_config.get("skills_file")
+    if skills_file and Path(skills_file).exists():
+        with open(skills_file, "r", encoding="utf-8") as f:
+            terms += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return terms
+
+
+_skill_patterns = _compile_terms(_load_skill_terms())
+_soft_skill_patterns = _compile_terms(SOFT_SKILLS)
+_language_patterns = _compile_terms(LANGUAGES)
+_industry_patterns = _compile_terms(INDUSTRIES)
+
+
+def find_terms(text: str, patterns: List[Tuple[str, re.Pattern]]) -> List[str]:
+    """Return the dictionary terms found in a text, in dictionary order and without duplicates."""
+    return [term for term, pattern in patterns if pattern.search(text)]
+
+
+def _clean(line: str) -> str:
+    return _MD_MARKUP.sub("", _BULLET.sub("", line)).strip(" \t:|-–—,")
+
+
+def _heading_text(line: str) -> Optional[str]:
+    """Return the text of a heading line (markdown heading, bold line, all-caps line or 'Title:'), else None."""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 60:
+        return None
+    if stripped.startswith("#"):
+        return stripped.lstrip("#").strip(" *:")
+    if re.fullmatch(r"\*\*[^*]+\*\*:?", stripped) or re.fullmatch(r"__[^_]+__:?", stripped):
+        return stripped.strip("*_: ")
+    letters = [ch for ch in stripped if ch.isalpha()]
+    if len(letters) >= 3 and all(ch.isupper() for ch in letters) and len(stripped.split()) <= 5:
+        return stripped.strip(": ")
+    if stripped.endswith(":") and len(stripped.split()) <= 4:
+        return stripped[:-1]
+    return None
+
+
+def _body_text(text: str) -> str:
+    """Text without heading lines, so section names such as 'Education' are not matched as terms."""
+    return "\n".join(line for line in text.splitlines() if _heading_text(line) is None)
+
+
+def split_into_sections(text: str, section_names: Dict[str, List[str]]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Split a document into the lines before the first known heading and the lines of each known section.
+
+    Args:
+        text (str): Normalized markdown.
+        section_names (Dict[str, List[str]]): Canonical section name -> heading keywords.
+
+    Returns:
+        Tuple[List[str], Dict[str, List[str]]]: Header lines and lines per canonical section.
+    """
+    header: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = header
+    for line in text.splitlines():
+        heading = _heading_text(line)
+        if heading is not None:
+            lowered = heading.lower()
+            name = next((name for name, keywords in section_names.items() if any(k in lowered for k in keywords)), None)
+            if name is not None:
+                current = sections.setdefault(name, [])
+                continue
+            if current is header and header:
+                # Unknown heading before the first section (e.g. the candidate name)
+                header.append(line)
+                continue
+        if current is not None:
+            current.append(line)
+    return header, sections
+
+
+def _parse_date(value: str, end: bool = False) -> Optional[datetime]:
+    value = value.strip().lower()
+    if value in ("present", "current", "now", "today", "ongoing"):
+        return datetime.now()
+    match = re.match(r"([a-z]+)\.?\s+(\d{4})", value)
+    if match and match.group(1)[:3] in MONTHS:
+        return datetime(int(match.group(2)), MONTHS[match.group(1)[:3]], 1)
+    match = re.match(r"(\d{1,2})[/.](\d{4})", value)
+    if match and 1 <= int(match.group(1)) <= 12:
+        return datetime(int(match.group(2)), int(match.group(1)), 1)
+    match = re.match(r"(\d{4})", value)
+    if match:
+        return datetime(int(match.group(1)), 12 if end else 1, 1)
+    return None
+
+
+def _years_between(start: datetime, end: datetime) -> float:
+    return max(0.0, (end.year - start.year) + (end.month - start.month + 1) / 12)
+
+
+def format_years(years: float) -> str:
+    """Format a duration like the LLM extractor does ('X.Y years')."""
+    return f"{years:.1f} years"
+
+
+def total_experience_years(periods: List[Tuple[datetime, datetime]]) -> float:
+    """Sum employment periods without double counting overlaps."""
+    total = 0.0
+    current_start, current_end = None, None
+    for start, end in sorted(periods):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += _years_between(current_start, current_end)
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += _years_between(current_start, current_end)
+    return total
+
+
+def _split_title_company(text: str) -> Tuple[str, str]:
+    text = _clean(text)
+    for separator in (" at ", " @ ", " | ", " – ", " — ", " - ", ", "):
+        if separator in text:
+            title, company = text.split(separator, 1)
+            return _clean(title), _clean(company)
+    return text, ""
+
+
+def extract_experience(lines: List[str]) -> Tuple[List[Experience], List[Tuple[datetime, datetime]]]:
+    """
+    Parse an experience section into entries, one per date range.
+
+    The title and company come from the text around the date range (same line or the line
+    before it), the description from the lines up to the next date range.
+
+    Args:
+        lines (List[str]): Lines of the experience section.
+
+    Returns:
+        Tuple[List[Experience], List[Tuple[datetime, datetime]]]: Entries and their employment periods.
+    """
+    content = [line for line in lines if line.strip()]
+    starts = [i for i, line in enumerate(content) if _DATE_RANGE.search(line)]
+    entries, periods = [], []
+    for n, i in enumerate(starts):
+        match = _DATE_RANGE.search(content[i])
+        start, end = _parse_date(match.group(1)), _parse_date(match.group(2), end=True)
+        remainder = _clean(_DATE_RANGE.sub("", content[i]).replace("()", ""))
+        previous_end = starts[n - 1] + 1 if n else 0
+        title_line = remainder
+        if len(remainder) < 3 and i > previous_end:
+            title_line = content[i - 1]
+        title, company = _split_title_company(title_line)
+        if not company and i + 1 < len(content) and not _BULLET.match(content[i + 1]) and len(content[i + 1]) < 80 \
+                and (n + 1 == len(starts) or i + 1 < starts[n + 1]):
+            company = _clean(content[i + 1])
+
+        body_end = starts[n + 1] - (1 if n + 1 < len(starts) and len(_clean(_DATE_RANGE.sub("", content[starts[n + 1]]))) < 3 else 0) \
+            if n + 1 < len(starts) else len(content)
+        body = [_clean(line) for line in content[i + 1:body_end] if _clean(line) and _clean(line) != company]
+        description = " ".join(body)
+
+        duration = None
+        if start and end and end >= start:
+            periods.append((start, end))
+            duration = format_years(_years_between(start, end))
+        entries.append(Experience(
+            job_title=title,
+            company=company,
+            start_date=match.group(1).strip(),
+            end_date=None if match.group(2).lower() in ("present", "current", "now", "today", "ongoing") else match.group(2).strip(),
+            duration=duration,
+            description=description,
+            technologies_used=find_terms(" ".join([title_line] + body), _skill_patterns),
+        ))
+    return entries, periods
+
+
+def _degree_name(line: str) -> Optional[str]:
+    return next((name for pattern, name in DEGREES if re.search(pattern, line, re.IGNORECASE)), None)
+
+
+def _institution_name(part: str) -> str:
+    """Strip dates, date ranges and GPA text from the part of an education line naming the institution."""
+    part = _GPA_TEXT.sub("", _DATE_RANGE.sub("", part))
+    part = _YEAR.sub("", re.sub(rf"\b{_DATE}\b", "", part, flags=re.IGNORECASE))
+    part = re.sub(r"\(\s*\)|\b(?:class of|graduated|expected)\b", "", part, flags=re.IGNORECASE)
+    if part.count("(") != part.count(")"):
+        part = part.replace("(", "").replace(")", "")
+    return _clean(re.sub(r"\s{2,}", " ", part))
+
+
+def extract_education(lines: List[str]) -> List[Education]:
+    """
+    Parse degree lines of an education section.
+
+    The institution, year and GPA come from the degree's own line first, then from the lines that
+    belong to it: up to two following lines before the next degree, and the line above when it is
+    not part of the previous entry. Lines nearer the degree line take precedence.
+    """
+    content = [_clean(line) for line in lines if _clean(line)]
+    degree_lines = [i for i, line in enumerate(content) if _degree_name(line)]
+    entries = []
+    for position, i in enumerate(degree_lines):
+        line = content[i]
+        next_degree = degree_lines[position + 1] if position + 1 < len(degree_lines) else len(content)
+        previous_degree = degree_lines[position - 1] if position else None
+        window = [line] + content[i + 1:min(i + 3, next_degree)]
+        if i > 0 and i - 1 not in degree_lines and (previous_degree is None or i - 1 > previous_degree + 2):
+            window.insert(2 if len(window) > 1 else 1, content[i - 1])
+        # "in" names the field more reliably than "of" ("Bachelor of Science in Physics")
+        field = next((match for word in ("in", "of") for match in
+                      [re.search(rf"\b{word}\s+([A-Z][\w&,/ ]+?)(?:\s*(?:[,|(–—-]|\bfrom\b|\bat\b|$))", line)] if match), None)
+        institution = next((_institution_name(part) for candidate in window
+                            for part in re.split(r"[,|–—]| - ", _DATE_RANGE.sub("", candidate))
+                            if re.search(r"universit|college|institute|school|academy|polytechnic", part, re.IGNORECASE)), None)
+        # The last year on the nearest line with a year (the end of a date range)
+        year = next((_YEAR.findall(candidate)[-1] for candidate in window if _YEAR.search(candidate)), None)
+        gpa = next((match for match in (_GPA.search(candidate) for candidate in window) if match), None)
+        entries.append(Education(
+            degree=_degree_name(line),
+            field_of_study=field.group(1).strip() if field and field.group(1).strip().lower() not in ("science", "arts", "engineering") else None,
+            institution=institution,
+            graduation_year=year,
+            gpa=float(gpa.group(1)) if gpa else None,
+        ))
+    return entries
+
+
+def _list_items(lines: List[str]) -> List[str]:
+    """Split a list-like section into items on bullets, commas, pipes and semicolons."""
+    items = []
+    for line in lines:
+        line = _clean(line)
+        if not line:
+            continue
+        if ":" in line and len(line.split(":", 1)[0].split()) <= 3:
+            line = line.split(":", 1)[1]
+        items += [_clean(item) for item in re.split(r"[,|;•·]", line) if _clean(item)]
+    return items
+
+
+def extract_certifications(lines: List[str]) -> List[Certification]:
+    """Turn each line of a certifications section into a certification, guessing the issuer from known names."""
+    certifications = []
+    for line in lines:
+        name = _clean(_DATE_RANGE.sub("", line))
+        if len(name) < 3:
+            continue
+        years = _YEAR.findall(line)
+        name = _clean(_YEAR.sub("", name).replace("()", ""))
+        issuer = next((issuer for key, issuer in CERTIFICATION_ISSUERS.items() if re.search(rf"\b{key}\b", name, re.IGNORECASE)), "")
+        certifications.append(Certification(name=name, issuing_organization=issuer, issue_date=years[0] if years else None))
+    return certifications
+
+
+def _extract_name(header: List[str]) -> str:
+    for line in header[:8]:
+        text = _clean(line)
+        if not text or _EMAIL.search(text) or _PHONE.search(text) or _URL.search(text):
+            continue
+        words = text.split()
+        if 2 <= len(words) <= 4 and all(re.fullmatch(r"[A-Za-z][A-Za-z.'\-]*", word) for word in words):
+            return text.title() if text.isupper() else text
+    return "Unknown"
+
+
+def _extract_job_title(header: List[str], name: str, experience: List[Experience]) -> Optional[str]:
+    for line in header[:8]:
+        text = _clean(line)
+        if not text or text.lower() == name.lower() or _EMAIL.search(text) or _PHONE.search(text) or _URL.search(text):
+            continue
+        if len(text.split()) <= 6 and not re.search(r"\d", text):
+            return text
+    return experience[0].job_title if experience and experience[0].job_title else None
+
+
+def _extract_contact(text: str, header: List[str]) -> Contact:
+    email = _EMAIL.search(text)
+    phone = _PHONE.search("\n".join(header)) or _PHONE.search(text)
+    linkedin = _LINKEDIN.search(text)
+    github = _GITHUB.search(text)
+    website = next((url for url in _URL.findall(text) if "linkedin" not in url.lower() and "github" not in url.lower()), None)
+    location = re.search(r"(?:location|address)\s*[:\-]\s*([^\n|]+)", text, re.IGNORECASE)
+
+    def full_url(url: Optional[str]) -> Optional[str]:
+        return url if not url or url.startswith("http") else f"https://{url}"
+
+    return Contact(
+        email=email.group(0) if email else None,
+        phone=re.sub(r"\s+", " ", phone.group(1)).strip() if phone else None,
+        linkedin=full_url(linkedin.group(0)) if linkedin else None,
+        github=full_url(github.group(0)) if github else None,
+        website=full_url(website),
+        location=_clean(location.group(1)) if location else None,
+    )
+
+
+def extract_resume(text: str) -> ResumeData:
+    """
+    Extract resume data from converted markdown without an LLM.
+
+    Sections are found from their headings; contact details, dates and durations come from regular
+    expressions, and skills, soft skills, languages and industries from built-in dictionaries
+    (extendable with heuristic_extraction.skills_file).
+
+    Args:
+        text (str): Resume markdown.
+
+    Returns:
+        ResumeData: Extracted resume data; fields that could not be found are left empty.
+    """
+    text = normalize_text(text)
+    header, sections = split_into_sections(text, RESUME_SECTIONS)
+
+    experience, periods = extract_experience(sections.get("experience", []))
+    name = _extract_name(header)
+
+    skills_section = sections.get("skills", [])
+    body = _body_text(text)
+    skills = find_terms(body, _skill_patterns)
+    known = {skill.lower() for skill in skills}
+    for item in _list_items(skills_section):
+        if item.lower() not in known and len(item.split()) <= 4 and not find_terms(item, _soft_skill_patterns):
+            skills.append(item)
+            known.add(item.lower())
+
+    languages_text = "\n".join(sections.get("languages", [])) or "\n".join(
+        line for line in text.splitlines() if "language" in line.lower() and not find_terms(line, _skill_patterns))
+    summary = " ".join(_clean(line) for line in sections.get("summary", []) if _clean(line))
+
+    return ResumeData(
+        name=name,
+        job_title=_extract_job_title(header, name, experience),
+        summary=summary,
+        contact=_extract_contact(text, header),
+        languages=find_terms(languages_text, _language_patterns),
+        skills=skills,
+        education=extract_education(sections.get("education", [])),
+        certifications=extract_certifications(sections.get("certifications", [])),
+        experience=experience,
+        experience_duration=format_years(total_experience_years(periods)) if periods else "",
+        projects=[Project(name=item.split(":", 1)[0][:80], description=item.split(":", 1)[-1].strip())
+                  for item in (_clean(line) for line in sections.get("projects", []) if _BULLET.match(line) or _heading_text(line))
+                  if item],
+        soft_skills=find_terms(body, _soft_skill_patterns),
+        domain_knowledge=DomainKnowledge(industries=find_terms(body, _industry_patterns)),
+        awards=[Award(name=_clean(line), issuing_organization="") for line in sections.get("awards", []) if _clean(line)],
+        publications=[Publication(title=_clean(line), publication_venue="") for line in sections.get("publications", []) if _clean(line)],
+        books=[],
+    )
+
+
+def _first_matching_line(lines: List[str], patterns: List[str]) -> Optional[str]:
+    for line in lines:
+        if any(re.search(pattern, line, re.IGNORECASE) for pattern in patterns):
+            return _clean(line)
+    return None
+
+
+def extract_job_description(text: str) -> JobRequirementsData:
+    """
+    Extract job requirements from converted markdown without an LLM.
+
+    Requirements and preferred qualifications are told apart by section headings and by
+    'preferred', 'nice to have' or 'a plus' wording inside requirement lines.
+
+    Args:
+        text (str): Job description markdown.
+
+    Returns:
+        JobRequirementsData: Extracted requirements; fields that could not be found are left empty.
+    """
+    text = normalize_text(text)
+    header, sections = split_into_sections(text, JD_SECTIONS)
+
+    title_line = re.search(r"(?:job title|position|role)\s*[:\-]\s*([^\n]+)", text, re.IGNORECASE)
+    job_title = _clean(title_line.group(1)) if title_line else next((_clean(line) for line in header if _clean(line)), "Unknown")
+
+    requirement_lines = sections.get("requirements", [])
+    if not requirement_lines:
+        requirement_lines = [line for line in text.splitlines() if line not in sections.get("about", [])]
+    preferred_markers = r"prefer|nice to have|a plus|bonus|desirable|advantage"
+    required = [line for line in requirement_lines if not re.search(preferred_markers, line, re.IGNORECASE)]
+    preferred = sections.get("preferred", []) + [line for line in requirement_lines if re.search(preferred_markers, line, re.IGNORECASE)]
+    required_text, preferred_text = "\n".join(required), "\n".join(preferred)
+
+    required_skills = find_terms(required_text, _skill_patterns)
+    preferred_skills = [skill for skill in find_terms(preferred_text, _skill_patterns) if skill not in required_skills]
+
+    experience = None
+    for line in required:
+        match = _EXPERIENCE_YEARS.search(line)
+        if match:
+            low, plus, high = match.groups()
+            experience = f"{low}-{high} years" if high else f"{low}{'+' if plus else ''} years"
+            break
+
+    degree_patterns = [pattern for pattern, _ in DEGREES]
+    required_industries = find_terms(required_text, _industry_patterns)
+
+    return JobRequirementsData(
+        job_title=job_title,
+        responsibilities=[_clean(line) for line in sections.get("responsibilities", []) if _clean(line)],
+        required_skills=required_skills,
+        required_education=_first_matching_line(required, degree_patterns),
+        required_experience_duration=experience,
+        required_domain_knowledge=required_industries,
+        required_certifications=[_clean(line) for line in required if re.search(r"certifi|licen[cs]e", line, re.IGNORECASE)],
+        soft_skills=find_terms(_body_text(text), _soft_skill_patterns),
+        preferred_skills=preferred_skills,
+        preferred_education=_first_matching_line(preferred, degree_patterns),
+        preferred_domain_knowledge=[i for i in find_terms(preferred_text, _industry_patterns) if i not in required_industries],
+    )
+
+
+def is_heuristic_output(output_file: Path) -> bool:
+    """Check whether an extraction JSON file was written by the heuristic extractor."""
+    try:
+        with open(output_file, "r", encoding="utf-8") as f:
+            return json.load(f).get("extraction_method") == EXTRACTION_METHOD
+    except Exception:
+        return False
+
+
+def _extract_directory(input_dir: str, output_dir: str, file_type: str) -> None:
+    input_path = Path(input_dir)
+    if not input_path.exists():
+        raise FileNotFoundError(f"Directory {input_dir} does not exist")
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    md_files = list(input_path.glob("*.md"))
+    if not md_files:
+        print("No markdown files found in the directory")
+        return
+    label = "resume" if file_type == "resumes" else "job description"
+    print(f"Found {len(md_files)} {label} files to process with the local extractor")
+
+    extract = extract_resume if file_type == "resumes" else extract_job_description
+    duplicate_of = update_duplicate_index(md_files, output_dir) if file_type == "resumes" else {}
+    processed, skipped, failed = 0, 0, 0
+    for md_file in md_files:
+        if md_file.stem in duplicate_of:
+            skipped += 1
+            continue
+        output_file = output_path / f"{md_file.stem}.json"
+        if output_file.exists() and not is_failed_output(output_file, file_type):
+            skipped += 1
+            continue
+        try:
+            with open(md_file, "r", encoding="utf-8") as f:
+                result = extract(f.read()).dict()
+            result["filename"] = md_file.name
+            result["extraction_method"] = EXTRACTION_METHOD
+            with open(output_file, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+            processed += 1
+        except Exception as e:
+            print(f"Error extracting {md_file.name} locally: {str(e)}")
+            failed += 1
+
+    print(f"Local extraction completed! {processed} files extracted successfully, {failed} failed, {skipped} skipped.")
+
+
+def extract_resumes_directory_locally(resumes_dir: str, output_dir: str) -> None:
+    """
+    Extract every resume markdown file in a directory with the heuristic extractor and save each as JSON.
+
+    Files that already have a JSON file and older near-duplicate versions are skipped. Records are tagged with
+    "extraction_method": "heuristic", so AI mode re-extracts them with the LLM.
+
+    Args:
+        resumes_dir (str): Directory containing resume markdown files.
+        output_dir (str): Directory to save resume JSON files.
+
+    Returns:
+        None
+
+    Raises:
+        FileNotFoundError: If the resumes directory doesn't exist.
+    """
+    _extract_directory(resumes_dir, output_dir, "resumes")
+
+
+def extract_job_descriptions_directory_locally(jds_dir: str, output_dir: str) -> None:
+    """
+    Extract every job description markdown file in a directory with the heuristic extractor and save each as JSON.
+
+    Args:
+        jds_dir (str): Directory containing job description markdown files.
+        output_dir (str): Directory to save job description JSON files.
+
+    Returns:
+        None
+
+    Raises:
+        FileNotFoundError: If the input directory does not exist.
+    """
+    _extract_directory(jds_dir, output_dir, "job_descriptions")
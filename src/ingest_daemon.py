@@ -0,0 +1,230 @@
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+from langchain_core.language_models import BaseLanguageModel
+from src.llm_backends import build_llm
+from src.ui_utils import convert_raw_files, extract_for_embedding_ranking
+from src.resume_extractor import process_resumes_directory
+from src.description_extractor import process_job_descriptions_directory
+from src.resumes_ranker import rank_job_descriptions
+from src.embed_ranker.embed_ranker import rank_job_descriptions_with_embeddings
+from src.archive_ingest import is_archive, is_archive_member, is_fully_extracted
+from src.dead_letter import list_failures, max_attempts
+from src.config_loader import config
+
+ingestion_config = config["ingestion"]
+directories = config["data"]["directories"]
+resumes_config = directories["resumes"]
+job_config = directories["job_descriptions"]
+
+# file name -> (mtime, size)
+Snapshot = Dict[str, Tuple[float, int]]
+markdown_dirs = {resumes_config["raw"]: resumes_config["markdown"], job_config["raw"]: job_config["markdown"]}
+
+
+def snapshot_directory(raw_dir: str) -> Snapshot:
+    """
+    Record the modification time and size of every file in a raw directory.
+
+    Args:
+        raw_dir (str): Directory to list.
+
+    Returns:
+        Snapshot: Mapping of file name to (mtime, size); hidden and partial files are ignored.
+    """
+    raw_path = Path(raw_dir)
+    if not raw_path.exists():
+        return {}
+    snapshot = {}
+    for entry in raw_path.iterdir():
+        if entry.name.startswith(".") or not entry.is_file():
+            continue
+        stat = entry.stat()
+        snapshot[entry.name] = (stat.st_mtime, stat.st_size)
+    return snapshot
+
+
+def find_ready_files(raw_dir: str, previous: Snapshot, current: Snapshot, settle_seconds: float) -> List[Path]:
+    """
+    Find files that are new or changed since the previous snapshot and are no longer being written.
+
+    Args:
+        raw_dir (str): Directory the snapshots belong to.
+        previous (Snapshot): Snapshot of files already handled.
+        current (Snapshot): Latest snapshot.
+        settle_seconds (float): Minimum age of the last modification before a file is picked up.
+
+    Returns:
+        List[Path]: Files to process.
+    """
+    now = time.time()
+    return [
+        Path(raw_dir) / name
+        for name, (mtime, size) in current.items()
+        if previous.get(name) != (mtime, size) and now - mtime >= settle_seconds
+    ]
+
+
+def is_ingested(file: Path, raw_dir: str) -> bool:
+    """
+    Check whether a raw file made it through conversion.
+
+    Archives count once every member was extracted (the members are then picked up as files of their own),
+    other files once their markdown exists. Extraction failures are retried through the dead-letter area.
+
+    Args:
+        file (Path): Raw file that was processed.
+        raw_dir (str): Raw directory the file belongs to.
+
+    Returns:
+        bool: True if the file does not need another pass.
+    """
+    if is_archive(file):
+        return is_fully_extracted(file, file.parent)
+    return (Path(markdown_dirs[raw_dir]) / f"{file.stem}.md").exists()
+
+
+def mark_archive_members_handled(raw_dir: str, files: List[Path], handled: Snapshot) -> None:
+    """
+    Mark the members that archives of a pass extracted into the raw directory as handled, once converted,
+    so the next poll does not start another pass for them. Members whose conversion failed are left
+    to be picked up again.
+
+    Args:
+        raw_dir (str): Raw directory of the pass.
+        files (List[Path]): Files of the pass.
+        handled (Snapshot): Handled files of the raw directory, updated in place.
+
+    Returns:
+        None
+    """
+    archives = [file for file in files if is_archive(file)]
+    if not archives:
+        return
+    for name, stat in snapshot_directory(raw_dir).items():
+        if name in handled or not any(is_archive_member(archive, name) for archive in archives):
+            continue
+        if is_ingested(Path(raw_dir) / name, raw_dir):
+            handled[name] = stat
+
+
+def has_retryable_failures() -> bool:
+    """Check whether the dead-letter area holds documents that may still be extracted again."""
+    return any(
+        entry.get("attempts", 0) < max_attempts
+        for file_type in ("resumes", "job_descriptions")
+        for entry in list_failures(file_type)
+    )
+
+
+def process_new_files(resume_files: List[Path], jd_files: List[Path], llm: BaseLanguageModel) -> None:
+    """
+    Push new raw files through conversion, extraction and ranking.
+
+    Only the given files are converted; extraction and ranking skip everything already done,
+    so a new job description ranks all resumes and new resumes are ranked against every job description.
+
+    Args:
+        resume_files (List[Path]): New raw resume files.
+        jd_files (List[Path]): New raw job description files.
+        llm (BaseLanguageModel): Language model instance for extraction (and AI ranking).
+
+    Returns:
+        None
+    """
+    print(f"\nIngesting {len(resume_files)} new resumes and {len(jd_files)} new job descriptions...")
+    convert_raw_files(ingestion_config.get("enhance_conversion", False), resume_files, jd_files)
+
+    if ingestion_config.get("ranking", "embeddings") != "ai":
+        extract_for_embedding_ranking(llm)
+    else:
+        if Path(resumes_config["markdown"]).exists():
+            print("\nExtracting resume data...")
+            process_resumes_directory(resumes_config["markdown"], resumes_config["json"], llm)
+        if Path(job_config["markdown"]).exists():
+            print("\nExtracting job description data...")
+            process_job_descriptions_directory(job_config["markdown"], job_config["json"], llm)
+
+    if not any(Path(job_config["json"]).glob("*.json")) or not any(Path(resumes_config["json"]).glob("*.json")):
+        print("Waiting for both resumes and job descriptions before ranking.")
+        return
+
+    if ingestion_config.get("ranking", "embeddings") == "ai":
+        print("\nRanking candidates with AI...")
+        rank_job_descriptions(resumes_config["json"], job_config["json"], llm, directories["rankings"], batch_size=config["processing"]["batch_size"])
+    else:
+        print("\nRanking candidates with embeddings...")
+        rank_job_descriptions_with_embeddings(resumes_config["json"], job_config["json"], directories["rankings"])
+
+
+def watch(llm: BaseLanguageModel) -> None:
+    """
+    Poll the raw resume and job description directories and process files as they arrive.
+
+    The first poll picks up everything already present (work done earlier is skipped by the
+    pipeline stages), later polls only handle new or modified files. Files whose conversion failed
+    are picked up again on the next poll, up to dead_letter_max_attempts passes, and documents in the
+    dead-letter area are re-extracted every ingestion.retry_interval seconds while they have attempts left.
+
+    Args:
+        llm (BaseLanguageModel): Language model instance for extraction (and AI ranking).
+
+    Returns:
+        None
+    """
+    poll_interval = ingestion_config.get("poll_interval", 10)
+    settle_seconds = ingestion_config.get("settle_seconds", 2)
+    retry_interval = ingestion_config.get("retry_interval", 300)
+    handled: Dict[str, Snapshot] = {resumes_config["raw"]: {}, job_config["raw"]: {}}
+    # (raw dir, file name) -> passes the file went through without being converted
+    attempts: Dict[Tuple[str, str], int] = {}
+    last_retry = time.time()
+
+    print(f"Watching {resumes_config['raw']} and {job_config['raw']} every {poll_interval}s (Ctrl+C to stop)")
+    while True:
+        try:
+            new_files = {}
+            for raw_dir in handled:
+                current = snapshot_directory(raw_dir)
+                new_files[raw_dir] = find_ready_files(raw_dir, handled[raw_dir], current, settle_seconds)
+
+            if any(new_files.values()):
+                process_new_files(new_files[resumes_config["raw"]], new_files[job_config["raw"]], llm)
+                last_retry = time.time()
+                # A file is only handled once its output exists; otherwise it is converted again on the next poll
+                for raw_dir, files in new_files.items():
+                    for file in files:
+                        if not file.exists():
+                            continue
+                        key = (raw_dir, file.name)
+                        if not is_ingested(file, raw_dir):
+                            attempts[key] = attempts.get(key, 0) + 1
+                            if attempts[key] < max_attempts:
+                                continue
+                            print(f"Giving up on {file.name} after {attempts[key]} failed conversions; modify or re-upload it to retry")
+                        attempts.pop(key, None)
+                        stat = file.stat()
+                        handled[raw_dir][file.name] = (stat.st_mtime, stat.st_size)
+                    mark_archive_members_handled(raw_dir, files, handled[raw_dir])
+            elif time.time() - last_retry >= retry_interval and has_retryable_failures():
+                print("\nRetrying failed extractions from the dead-letter area...")
+                process_new_files([], [], llm)
+                last_retry = time.time()
+        except KeyboardInterrupt:
+            raise
+        except Exception as e:
+            print(f"Error during ingestion pass: {str(e)}")
+
+        time.sleep(poll_interval)
+
+
+def main():
+    llm = build_llm()
+    try:
+        watch(llm)
+    except KeyboardInterrupt:
+        print("\nIngestion stopped.")
+
+
+if __name__ == "__main__":
+    main()
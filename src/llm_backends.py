@@ -0,0 +1,276 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import typing
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
+from src.text_normalizer import estimate_tokens
+from src.prompt_cache import PrefixCacheSimulator
+from src.config_loader import config
+
+model_config = config["models"]["language_model"]
+replay_config = config.get("llm_replay", {})
+
+BACKENDS = ("live", "record", "replay", "fake")
+_DOCUMENT_HEADER = re.compile(r"^=== DOCUMENT: (.+?) ===$", re.MULTILINE)
+_FILENAME_FIELD = re.compile(r'"(?:filename|id)":\s*"([^"]+)"')
+# Prompt lines that change between runs without changing the request (the current date)
+_VOLATILE_LINE = re.compile(r"^Today's date is: .*$", re.MULTILINE)
+
+
+def prompt_key(schema: Type[BaseModel], prompt: str) -> str:
+    """Key of a recorded response: SHA-256 of the output schema name and the rendered prompt, without its volatile lines."""
+    prompt = _VOLATILE_LINE.sub("", prompt)
+    return hashlib.sha256(f"{schema.__name__}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+def _prompt_text(prompt: Any) -> str:
+    return prompt.to_string() if hasattr(prompt, "to_string") else str(prompt)
+
+
+class _StructuredOutput(Runnable):
+    """Runnable returned by with_structured_output of the offline backends."""
+
+    def __init__(self, backend: "OfflineLLM", schema: Type[BaseModel], include_raw: bool):
+        self.backend = backend
+        self.schema = schema
+        self.include_raw = include_raw
+
+    def _wrap(self, response: BaseModel, usage: Dict[str, Any]) -> Any:
+        if not self.include_raw:
+            return response
+        raw = AIMessage(content=response.json(), usage_metadata=usage)
+        return {"raw": raw, "parsed": response, "parsing_error": None}
+
+    def invoke(self, input: Any, config: Optional[Dict] = None, **kwargs: Any) -> Any:
+        response, latency, usage = self.backend.respond(self.schema, _prompt_text(input))
+        time.sleep(latency)
+        return self._wrap(response, usage)
+
+    async def ainvoke(self, input: Any, config: Optional[Dict] = None, **kwargs: Any) -> Any:
+        response, latency, usage = await self.backend.arespond(self.schema, _prompt_text(input))
+        await asyncio.sleep(latency)
+        return self._wrap(response, usage)
+
+
+class OfflineLLM(ABC):
+    """
+    Base of the language model stand-ins used for offline runs.
+
+    Only the part of the LangChain interface the pipeline uses is implemented:
+    with_structured_output(schema, include_raw=False) returning a runnable with invoke and ainvoke.
+    Token usage is estimated, with cached input tokens from a simulated provider prefix cache.
+    """
+
+    def __init__(self, model: str, latency: Optional[float] = None, jitter: float = 0.0, seed: int = 0):
+        self.model = model
+        self.temperature = model_config.get("temperature", 0)
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.prefix_cache = PrefixCacheSimulator()
+
+    def with_structured_output(self, schema: Type[BaseModel], include_raw: bool = False) -> Runnable:
+        return _StructuredOutput(self, schema, include_raw)
+
+    def synthetic_latency(self, recorded: float = 0.0) -> float:
+        """Latency to simulate for a call: the configured latency (or the recorded one) with +/- jitter."""
+        base = recorded if self.latency is None else self.latency
+        with self._lock:
+            return max(0.0, base * self._random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def simulated_usage(self, prompt: str, response: BaseModel) -> Dict[str, Any]:
+        """Estimated token usage of a call, with the input tokens a provider prefix cache would serve."""
+        input_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(response.json())
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "input_token_details": {"cache_read": self.prefix_cache.cached_tokens(prompt)},
+        }
+
+    @abstractmethod
+    def respond(self, schema: Type[BaseModel], prompt: str) -> Tuple[BaseModel, float, Dict[str, Any]]:
+        """Return the response to a prompt, the latency to simulate before returning it and the token usage."""
+
+    async def arespond(self, schema: Type[BaseModel], prompt: str) -> Tuple[BaseModel, float, Dict[str, Any]]:
+        return self.respond(schema, prompt)
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        return args[0] if args else str
+    return annotation
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _fake_value(name: str, annotation: Any, rng: random.Random, filename: Optional[str], filenames: List[str]) -> Any:
+    annotation = _unwrap_optional(annotation)
+    if _is_model(annotation):
+        return _fake_model(annotation, rng, filename, filenames)
+    if typing.get_origin(annotation) in (list, List):
+        (item,) = typing.get_args(annotation) or (str,)
+        item = _unwrap_optional(item)
+        if _is_model(item) and filenames and ({"filename", "file_name", "id"} & set(item.model_fields)):
+            return [_fake_model(item, rng, file, []) for file in filenames]
+        return [_fake_value(name, item, rng, filename, filenames) for _ in range(2 if item is str else 1)]
+    if annotation is bool:
+        return rng.random() < 0.5
+    if annotation is int:
+        return rng.randint(0, 100)
+    if annotation is float:
+        return round(rng.uniform(0, 4), 2) if name == "gpa" else round(rng.uniform(0, 100), 1)
+    if name in ("filename", "file_name", "id"):
+        return filename or "document.md"
+    if "duration" in name:
+        return f"{rng.uniform(0, 15):.1f} years"
+    if "date" in name or "year" in name:
+        return str(rng.randint(2000, 2025))
+    if name == "email":
+        return f"candidate{rng.randint(1, 9999)}@example.com"
+    return f"{name.replace('_', ' ')} {rng.randint(1, 999)}"
+
+
+def _fake_model(schema: Type[BaseModel], rng: random.Random, filename: Optional[str], filenames: List[str]) -> BaseModel:
+    values = {name: _fake_value(name, field.annotation, rng, filename, filenames) for name, field in schema.model_fields.items()}
+    return schema(**values)
+
+
+def fake_response(schema: Type[BaseModel], prompt: str) -> BaseModel:
+    """
+    Generate a schema-valid response, deterministic for a given schema and prompt.
+
+    Lists of per-document items (models with a filename or file_name field) get one item per
+    document named in the prompt, taken from packed-document headers or "filename"/"id" values in
+    JSON inputs, so packed extraction and batch ranking match their outputs like live responses.
+
+    Args:
+        schema (Type[BaseModel]): Pydantic model of the response.
+        prompt (str): Rendered prompt.
+
+    Returns:
+        BaseModel: Generated response.
+    """
+    filenames = _DOCUMENT_HEADER.findall(prompt) or list(dict.fromkeys(_FILENAME_FIELD.findall(prompt)))
+    rng = random.Random(prompt_key(schema, prompt))
+    return _fake_model(schema, rng, filenames[0] if len(filenames) == 1 else None, filenames)
+
+
+class FakeLLM(OfflineLLM):
+    """Returns generated schema-valid responses after a synthetic latency; no recordings or network needed."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        super().__init__("fake", latency, jitter, seed)
+
+    def respond(self, schema: Type[BaseModel], prompt: str) -> Tuple[BaseModel, float, Dict[str, Any]]:
+        response = fake_response(schema, prompt)
+        return response, self.synthetic_latency(), self.simulated_usage(prompt, response)
+
+
+class RecordingLLM(OfflineLLM):
+    """Passes calls to a live language model and saves each structured response with its latency."""
+
+    def __init__(self, llm: BaseLanguageModel, recordings_dir: str):
+        super().__init__(getattr(llm, "model", None) or getattr(llm, "model_name", None) or type(llm).__name__)
+        self.temperature = getattr(llm, "temperature", self.temperature)
+        self.llm = llm
+        self.recordings_dir = Path(recordings_dir)
+        self.recordings_dir.mkdir(parents=True, exist_ok=True)
+
+    def _save(self, schema: Type[BaseModel], prompt: str, output: Dict[str, Any], latency: float) -> Tuple[BaseModel, float, Dict[str, Any]]:
+        response = output.get("parsed")
+        if not isinstance(response, schema):
+            raise ValueError(f"LLM did not return a valid {schema.__name__} object: {output.get('parsing_error')}")
+        recording = {"schema": schema.__name__, "latency": latency, "response": response.dict()}
+        with open(self.recordings_dir / f"{prompt_key(schema, prompt)}.json", "w", encoding="utf-8") as f:
+            json.dump(recording, f, indent=2, ensure_ascii=False)
+        usage = getattr(output.get("raw"), "usage_metadata", None) or self.simulated_usage(prompt, response)
+        return response, 0.0, usage
+
+    def respond(self, schema: Type[BaseModel], prompt: str) -> Tuple[BaseModel, float, Dict[str, Any]]:
+        start = time.perf_counter()
+        output = self.llm.with_structured_output(schema, include_raw=True).invoke(prompt)
+        return self._save(schema, prompt, output, time.perf_counter() - start)
+
+    async def arespond(self, schema: Type[BaseModel], prompt: str) -> Tuple[BaseModel, float, Dict[str, Any]]:
+        start = time.perf_counter()
+        output = await self.llm.with_structured_output(schema, include_raw=True).ainvoke(prompt)
+        return self._save(schema, prompt, output, time.perf_counter() - start)
+
+
+class ReplayLLM(OfflineLLM):
+    """
+    Answers calls from responses saved by RecordingLLM, after the recorded (or a configured) latency.
+
+    Prompts without a recording raise a LookupError, or get a generated response when missing is "fake".
+    """
+
+    def __init__(self, recordings_dir: str, latency: Optional[float] = None, jitter: float = 0.0,
+                 missing: str = "error", seed: int = 0):
+        super().__init__(f"replay/{model_config['model_name']}", latency, jitter, seed)
+        self.recordings_dir = Path(recordings_dir)
+        self.missing = missing
+
+    def respond(self, schema: Type[BaseModel], prompt: str) -> Tuple[BaseModel, float, Dict[str, Any]]:
+        recording_file = self.recordings_dir / f"{prompt_key(schema, prompt)}.json"
+        if not recording_file.exists():
+            if self.missing != "fake":
+                raise LookupError(f"No recorded {schema.__name__} response in {self.recordings_dir}")
+            response = fake_response(schema, prompt)
+            return response, self.synthetic_latency(), self.simulated_usage(prompt, response)
+        with open(recording_file, "r", encoding="utf-8") as f:
+            recording = json.load(f)
+        response = schema(**recording["response"])
+        return response, self.synthetic_latency(recording.get("latency", 0.0)), self.simulated_usage(prompt, response)
+
+
+def build_llm(backend: Optional[str] = None) -> BaseLanguageModel:
+    """
+    Build the language model used by extraction and ranking.
+
+    Backends (models.language_model.backend):
+        live: Gemini through ChatGoogleGenerativeAI.
+        record: live, saving every structured response to llm_replay.path.
+        replay: saved responses only, with the recorded or configured latency; no network access.
+        fake: generated schema-valid responses with the configured latency.
+
+    Args:
+        backend (Optional[str]): Backend name; defaults to the configured backend.
+
+    Returns:
+        BaseLanguageModel: Language model instance (or an offline stand-in).
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    backend = backend or model_config.get("backend", "live")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown language model backend '{backend}', expected one of {', '.join(BACKENDS)}")
+
+    recordings_dir = replay_config.get("path", "data/cache/llm_recordings")
+    latency = replay_config.get("latency_seconds")
+    jitter = replay_config.get("latency_jitter", 0.0)
+    if backend == "fake":
+        return FakeLLM(latency or 0.0, jitter)
+    if backend == "replay":
+        return ReplayLLM(recordings_dir, latency, jitter, replay_config.get("missing", "error"))
+
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    llm = ChatGoogleGenerativeAI(model=model_config["model_name"],
+                                 temperature=model_config["temperature"],
+                                 api_key=model_config["api_key"])
+    return RecordingLLM(llm, recordings_dir) if backend == "record" else llm
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Type
+from langchain_core.language_models import BaseLanguageModel
+from pydantic import BaseModel
+from src.config_loader import config
+
+cache_config = config.get("llm_cache", {})
+cache_path = Path(cache_config.get("path", Path(config["data"]["directories"]["cache"]) / "llm_responses.sqlite"))
+max_size_bytes = int(cache_config.get("max_size_mb", 200) * 1024 * 1024)
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+# Running estimate of the stored size; None until the first store reads it from the database
+_size = {"total": None}
+
+
+def cache_enabled() -> bool:
+    return cache_config.get("enabled", True)
+
+
+def _count(outcome: str) -> None:
+    with _lock:
+        _stats[outcome] += 1
+
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    """Open the cache database, committing and closing it when the block ends."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(cache_path, timeout=30)
+    try:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, schema TEXT, value TEXT, size INTEGER, created REAL, last_used REAL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        yield connection
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def cache_key(llm: BaseLanguageModel, template: str, schema: Type[BaseModel], inputs: Dict[str, Any]) -> str:
+    """
+    Build the cache key for a structured LLM call.
+
+    The key covers the model name, temperature, prompt template, output schema and input values,
+    so changing any of them misses the cache.
+
+    Args:
+        llm (BaseLanguageModel): Language model instance.
+        template (str): Prompt template.
+        schema (Type[BaseModel]): Pydantic model the response is parsed into.
+        inputs (Dict[str, Any]): Template variables.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    payload = {
+        "model": getattr(llm, "model", None) or getattr(llm, "model_name", None) or type(llm).__name__,
+        "temperature": getattr(llm, "temperature", None),
+        "template": template,
+        "schema": json.dumps(schema.schema(), sort_keys=True),
+        "inputs": inputs,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def get_cached_response(key: str, schema: Type[BaseModel]) -> Optional[BaseModel]:
+    """
+    Look up a cached structured response and mark it as recently used.
+
+    Args:
+        key (str): Cache key from cache_key.
+        schema (Type[BaseModel]): Pydantic model to rebuild the response with.
+
+    Returns:
+        Optional[BaseModel]: Cached response, or None on a miss.
+    """
+    try:
+        with _lock, _connect() as connection:
+            row = connection.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                connection.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        if row is not None:
+            response = schema(**json.loads(row[0]))
+            _count("hits")
+            return response
+    except Exception as e:
+        print(f"Error reading LLM response cache: {str(e)}")
+    _count("misses")
+    return None
+
+
+def store_response(key: str, response: BaseModel) -> None:
+    """
+    Store a structured response, evicting least recently used entries above llm_cache.max_size_mb.
+
+    The size of the cache is tracked as a running total, so the table is only summed on the first
+    store and when the total passes the limit (other processes may have written to it meanwhile).
+    Eviction frees 10% headroom so the next stores don't pass the limit again right away.
+
+    Args:
+        key (str): Cache key from cache_key.
+        response (BaseModel): Parsed response to store.
+
+    Returns:
+        None
+    """
+    value = json.dumps(response.dict(), ensure_ascii=False)
+    value_size = len(value.encode("utf-8"))
+    now = time.time()
+    try:
+        with _lock, _connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, schema, value, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, type(response).__name__, value, value_size, now, now),
+            )
+            if _size["total"] is None:
+                _size["total"] = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            else:
+                _size["total"] += value_size
+            if _size["total"] > max_size_bytes:
+                total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                evicted = 0
+                for old_key, size in connection.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+                    if total <= max_size_bytes * 0.9:
+                        break
+                    connection.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                    total -= size
+                    evicted += 1
+                _size["total"] = total
+                if evicted:
+                    print(f"LLM response cache over {max_size_bytes // (1024 * 1024)} MB, evicted {evicted} entries.")
+    except Exception as e:
+        print(f"Error writing LLM response cache: {str(e)}")
+
+
+def report_cache_stats(reset: bool = True) -> None:
+    """
+    Print the hit rate of the LLM response cache since the last report.
+
+    Args:
+        reset (bool): Clear the counters after printing.
+
+    Returns:
+        None
+    """
+    total = _stats["hits"] + _stats["misses"]
+    if total:
+        print(f"LLM response cache: {_stats['hits']}/{total} hits ({_stats['hits'] / total:.0%})")
+    if reset:
+        _stats["hits"] = 0
+        _stats["misses"] = 0
@@ -0,0 +1,264 @@
+import asyncio
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Coroutine, Dict, Iterable, List, Optional, Tuple, Type
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.prompts import PromptTemplate
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from pydantic import BaseModel
+from src.config_loader import config
+from src.llm_backends import OfflineLLM
+from src.llm_cache import cache_enabled, cache_key, get_cached_response, store_response
+from src.prompt_cache import record_usage
+
+max_concurrency = config["processing"].get("llm_max_concurrency", 8)
+pack_size = config["processing"].get("extraction_pack_size", 1)
+pack_max_chars = config["processing"].get("extraction_pack_max_chars", 60000)
+max_retries = config["processing"].get("llm_max_retries", 3)
+retry_base_delay = config["processing"].get("llm_retry_base_delay", 2.0)
+retry_max_delay = config["processing"].get("llm_retry_max_delay", 60.0)
+
+# Errors worth retrying: rate limits, overloaded or unavailable servers and network timeouts
+TRANSIENT_ERROR_NAMES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError", "DeadlineExceeded",
+    "GatewayTimeout", "Aborted", "RateLimitError", "APIConnectionError", "APITimeoutError",
+    "ConnectionError", "ConnectTimeout", "ReadTimeout", "TimeoutError", "RemoteDisconnected",
+}
+TRANSIENT_ERROR_MESSAGE = re.compile(r"\b(429|500|502|503|504)\b|rate limit|quota|overloaded|temporarily unavailable|timed out", re.IGNORECASE)
+
+# Token bucket shared by every LLM call in the process (extraction and ranking)
+rate_limiter = InMemoryRateLimiter(
+    requests_per_second=config["processing"].get("llm_requests_per_minute", 60) / 60,
+    check_every_n_seconds=0.05,
+    max_bucket_size=max(1, max_concurrency),
+)
+
+
+def _structured_chain(llm: BaseLanguageModel, template: str, schema: Type[BaseModel]):
+    # include_raw keeps the token usage, including input tokens read from the provider's prefix cache
+    prompt = PromptTemplate.from_template(template)
+    return prompt | llm.with_structured_output(schema, include_raw=True)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Check whether an LLM call failed for a reason that may go away on retry.
+
+    The error and the errors it was raised from are matched by class name and message,
+    so provider SDKs do not need to be imported.
+
+    Args:
+        error (BaseException): Error raised by the call.
+
+    Returns:
+        bool: True for rate limits, server errors and timeouts.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if type(error).__name__ in TRANSIENT_ERROR_NAMES:
+            return True
+        if TRANSIENT_ERROR_MESSAGE.search(str(error)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def is_output_error(error: BaseException) -> bool:
+    """
+    Check whether an LLM call returned a response that was truncated or could not be parsed.
+
+    Parsing failures (including LangChain output parser and pydantic validation errors) are ValueErrors;
+    transient, authentication, quota and request errors are not, and retrying them with smaller
+    inputs would fail the same way.
+
+    Args:
+        error (BaseException): Error raised by the call.
+
+    Returns:
+        bool: True for unusable responses.
+    """
+    return isinstance(error, ValueError) and not is_transient_error(error)
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter: a random delay between half and all of base * 2^attempt, capped."""
+    delay = min(retry_max_delay, retry_base_delay * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _check_response(response: Any, schema: Type[BaseModel]) -> BaseModel:
+    if isinstance(response, dict) and "parsed" in response:
+        record_usage(getattr(response.get("raw"), "usage_metadata", None))
+        if response.get("parsing_error") is not None:
+            raise ValueError(f"LLM response could not be parsed into {schema.__name__}: {response['parsing_error']}")
+        response = response["parsed"]
+    if not isinstance(response, schema):
+        raise ValueError(f"LLM did not return a valid {schema.__name__} object")
+    return response
+
+
+def _response_cache_key(llm: BaseLanguageModel, template: str, schema: Type[BaseModel], inputs: Dict[str, Any]) -> Optional[str]:
+    """Response cache key of a call, or None when the cache is disabled or the model is an offline backend."""
+    if not cache_enabled() or isinstance(llm, OfflineLLM):
+        return None
+    return cache_key(llm, template, schema, inputs)
+
+
+def invoke_structured(llm: BaseLanguageModel, template: str, schema: Type[BaseModel], inputs: Dict[str, Any]) -> BaseModel:
+    """
+    Fill a prompt template and call the model for structured output, waiting on the shared rate limiter.
+    Responses are served from and saved to the persistent LLM response cache, except for the offline
+    backends, whose calls must reach the backend to be recorded or to simulate latency. Transient errors are
+    retried up to processing.llm_max_retries times with exponential backoff and jitter.
+
+    Args:
+        llm (BaseLanguageModel): Language model instance.
+        template (str): Prompt template.
+        schema (Type[BaseModel]): Pydantic model the response is parsed into.
+        inputs (Dict[str, Any]): Template variables.
+
+    Returns:
+        BaseModel: Parsed response.
+
+    Raises:
+        Exception: The last error when the call fails permanently or runs out of retries.
+    """
+    key = _response_cache_key(llm, template, schema, inputs)
+    if key:
+        cached = get_cached_response(key, schema)
+        if cached is not None:
+            return cached
+
+    chain = _structured_chain(llm, template, schema)
+    for attempt in range(max_retries + 1):
+        rate_limiter.acquire()
+        try:
+            response = _check_response(chain.invoke(inputs), schema)
+            break
+        except Exception as e:
+            if attempt >= max_retries or not is_transient_error(e):
+                raise
+            delay = retry_delay(attempt)
+            print(f"Transient LLM error ({type(e).__name__}), retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+
+    if key:
+        store_response(key, response)
+    return response
+
+
+async def ainvoke_structured(llm: BaseLanguageModel, template: str, schema: Type[BaseModel], inputs: Dict[str, Any]) -> BaseModel:
+    """Async version of invoke_structured; cache reads and writes run in a worker thread so they don't block the event loop."""
+    key = _response_cache_key(llm, template, schema, inputs)
+    if key:
+        cached = await asyncio.to_thread(get_cached_response, key, schema)
+        if cached is not None:
+            return cached
+
+    chain = _structured_chain(llm, template, schema)
+    for attempt in range(max_retries + 1):
+        await rate_limiter.aacquire()
+        try:
+            response = _check_response(await chain.ainvoke(inputs), schema)
+            break
+        except Exception as e:
+            if attempt >= max_retries or not is_transient_error(e):
+                raise
+            delay = retry_delay(attempt)
+            print(f"Transient LLM error ({type(e).__name__}), retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            await asyncio.sleep(delay)
+
+    if key:
+        await asyncio.to_thread(store_response, key, response)
+    return response
+
+
+async def gather_bounded(coroutines: Iterable[Coroutine], limit: Optional[int] = None,
+                         semaphore: Optional[asyncio.Semaphore] = None) -> List[Any]:
+    """
+    Run coroutines concurrently with at most `limit` in flight.
+
+    Args:
+        coroutines (Iterable[Coroutine]): Coroutines to run.
+        limit (Optional[int]): Maximum concurrent coroutines (default: processing.llm_max_concurrency).
+        semaphore (Optional[asyncio.Semaphore]): Semaphore shared with other gathers, for one limit
+            across several groups of coroutines (overrides `limit`).
+
+    Returns:
+        List[Any]: Results in input order; exceptions are returned in place of results.
+    """
+    semaphore = semaphore or asyncio.Semaphore(limit or max_concurrency)
+
+    async def bounded(coroutine: Coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(bounded(c) for c in coroutines), return_exceptions=True)
+
+
+def run_async(coroutine: Coroutine) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Uses a separate thread when the calling thread already runs an event loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    result: Dict[str, Any] = {}
+
+    def runner():
+        try:
+            result["value"] = asyncio.run(coroutine)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def pack_files(files: List[Path], size: Optional[int] = None, max_chars: Optional[int] = None) -> List[List[Path]]:
+    """
+    Group files into packs for multi-document requests.
+
+    A pack holds at most `size` files and, unless it is a single file, at most `max_chars`
+    characters of input (file size is used as the estimate).
+
+    Args:
+        files (List[Path]): Files to group.
+        size (Optional[int]): Maximum files per pack (default: processing.extraction_pack_size).
+        max_chars (Optional[int]): Maximum input characters per pack (default: processing.extraction_pack_max_chars).
+
+    Returns:
+        List[List[Path]]: Packs in input order.
+    """
+    size = max(1, size or pack_size)
+    max_chars = max_chars or pack_max_chars
+    packs: List[List[Path]] = []
+    current: List[Path] = []
+    current_chars = 0
+    for file in files:
+        chars = file.stat().st_size
+        if current and (len(current) >= size or current_chars + chars > max_chars):
+            packs.append(current)
+            current, current_chars = [], 0
+        current.append(file)
+        current_chars += chars
+    if current:
+        packs.append(current)
+    return packs
+
+
+def format_packed_documents(documents: List[Tuple[str, str]]) -> str:
+    """Join (filename, text) pairs into one prompt section, each under a DOCUMENT header."""
+    return "\n\n".join(f"=== DOCUMENT: {filename} ===\n{text}" for filename, text in documents)
@@ -0,0 +1,274 @@
+import hashlib
+import json
+import random
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Set
+from src.dead_letter import is_failed_output, should_retry
+from src.config_loader import config
+
+duplicates_config = config.get("near_duplicates", {})
+threshold = duplicates_config.get("threshold", 0.8)
+shingle_size = duplicates_config.get("shingle_size", 3)
+num_perm = duplicates_config.get("num_perm", 128)
+bands = duplicates_config.get("bands", 16)
+index_path = Path(duplicates_config.get("index_path", "data/cache/resume_fingerprints.json"))
+arrivals_path = Path(duplicates_config.get("arrivals_path", "data/cache/resume_arrivals.json"))
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_random = random.Random(1)
+_PERMUTATIONS = [(_random.randrange(1, _MERSENNE_PRIME), _random.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)]
+
+
+def duplicates_enabled() -> bool:
+    return duplicates_config.get("enabled", True)
+
+
+def shingles(text: str, size: int = shingle_size) -> Set[int]:
+    """Hashes of the overlapping word n-grams of a text, ignoring case, punctuation and markdown."""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return {int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "big") for gram in grams}
+
+
+def minhash(text: str) -> List[int]:
+    """
+    MinHash signature of a text's word shingles.
+
+    The share of equal positions in two signatures estimates the Jaccard similarity of the shingle sets.
+
+    Args:
+        text (str): Document text.
+
+    Returns:
+        List[int]: near_duplicates.num_perm minimum hash values.
+    """
+    hashes = shingles(text)
+    if not hashes:
+        return [_MERSENNE_PRIME] * num_perm
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def similarity(signature: List[int], other: List[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(x == y for x, y in zip(signature, other)) / len(signature)
+
+
+class FingerprintIndex:
+    """
+    MinHash signatures of documents with locality-sensitive hashing buckets.
+
+    Signatures are split into near_duplicates.bands bands; documents that share a band are
+    candidate duplicates, so a lookup only compares a document with the few documents in its
+    buckets instead of the whole corpus.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, Dict] = {}
+        self.buckets: Dict[tuple, Set[str]] = defaultdict(set)
+
+    def _band_keys(self, signature: List[int]) -> List[tuple]:
+        rows = max(1, len(signature) // bands)
+        return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(bands)]
+
+    def add(self, name: str, signature: List[int], mtime: float) -> None:
+        self.remove(name)
+        self.documents[name] = {"signature": signature, "mtime": mtime}
+        for key in self._band_keys(signature):
+            self.buckets[key].add(name)
+
+    def remove(self, name: str) -> None:
+        entry = self.documents.pop(name, None)
+        if entry is None:
+            return
+        for key in self._band_keys(entry["signature"]):
+            self.buckets[key].discard(name)
+            if not self.buckets[key]:
+                del self.buckets[key]
+
+    def near_duplicates(self, name: str) -> List[str]:
+        """Documents whose estimated similarity to the given document reaches near_duplicates.threshold."""
+        signature = self.documents[name]["signature"]
+        candidates = set().union(*(self.buckets.get(key, set()) for key in self._band_keys(signature))) - {name}
+        return [other for other in candidates if similarity(signature, self.documents[other]["signature"]) >= threshold]
+
+    def version_groups(self, arrivals: Dict[str, float]) -> List[List[str]]:
+        """
+        Group near-duplicate versions of one CV, each group ordered oldest first.
+
+        Documents are visited in order of arrival; the first version of a CV represents its group,
+        and a later document joins the group of the most similar representative it is a near-duplicate
+        of. Membership is not transitive, so a chain of similar resumes does not merge different CVs.
+
+        Args:
+            arrivals (Dict[str, float]): Arrival time of each document.
+
+        Returns:
+            List[List[str]]: Groups of at least two documents.
+        """
+        groups: Dict[str, List[str]] = {}
+        for name in sorted(self.documents, key=lambda name: (arrivals.get(name, 0.0), name)):
+            signature = self.documents[name]["signature"]
+            representatives = [other for other in self.near_duplicates(name) if other in groups]
+            if representatives:
+                best = max(representatives, key=lambda other: (similarity(signature, self.documents[other]["signature"]), other))
+                groups[best].append(name)
+            else:
+                groups[name] = [name]
+        return [group for group in groups.values() if len(group) > 1]
+
+    @classmethod
+    def load(cls, path: Path = index_path) -> "FingerprintIndex":
+        index = cls()
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for name, entry in data.get("documents", {}).items():
+                    index.add(name, entry["signature"], entry["mtime"])
+            except Exception as e:
+                print(f"Error loading fingerprint index, rebuilding it. Reason: {str(e)}")
+                index = cls()
+        return index
+
+    def save(self, groups: List[List[str]], path: Path = index_path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"documents": self.documents, "groups": groups}, f)
+
+
+def _load_arrivals() -> Dict[str, float]:
+    if not arrivals_path.exists():
+        return {}
+    try:
+        with open(arrivals_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading resume arrival times: {str(e)}")
+        return {}
+
+
+def record_arrival(raw_file: Path) -> None:
+    """
+    Record when an uploaded resume arrived, which orders near-duplicate versions of a CV.
+
+    Each call gets a later time than any recorded before, so files of one upload keep their order.
+
+    Args:
+        raw_file (Path): Raw resume file just saved.
+
+    Returns:
+        None
+    """
+    arrivals = _load_arrivals()
+    arrivals[raw_file.stem] = max(time.time(), max(arrivals.values(), default=0.0) + 0.001)
+    arrivals_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(arrivals_path, "w", encoding="utf-8") as f:
+        json.dump(arrivals, f)
+
+
+def _arrival_times(md_files: Dict[str, Path]) -> Dict[str, float]:
+    """Arrival time of each resume: its recorded upload time, else the raw file's modification time, else the markdown's."""
+    recorded = _load_arrivals()
+    raw_dir = Path(config["data"]["directories"]["resumes"]["raw"])
+    raw_times = {}
+    if raw_dir.exists():
+        raw_times = {raw.stem: raw.stat().st_mtime for raw in raw_dir.iterdir() if raw.is_file() and not raw.name.startswith(".")}
+    return {
+        name: recorded.get(name) or raw_times.get(name) or md_file.stat().st_mtime
+        for name, md_file in md_files.items()
+    }
+
+
+def _has_output(name: str, output_dir: Path) -> bool:
+    """Check whether a resume has usable extraction JSON (not missing or a failure placeholder)."""
+    output_file = output_dir / f"{name}.json"
+    return output_file.exists() and not is_failed_output(output_file, "resumes")
+
+
+def _collapse(groups: List[List[str]], keep: Callable[[str], bool]) -> Dict[str, str]:
+    """Map every member of each group to its latest version that passes `keep` (groups are ordered oldest first)."""
+    duplicate_of = {}
+    for group in groups:
+        kept = [name for name in group if keep(name)]
+        if not kept:
+            continue
+        canonical = kept[-1]
+        for name in group:
+            if name != canonical:
+                duplicate_of[name] = canonical
+    return duplicate_of
+
+
+def update_duplicate_index(md_files: Iterable[Path], output_dir: str) -> Dict[str, str]:
+    """
+    Fingerprint new or changed resume markdown files and group near-duplicate versions of one CV.
+
+    Versions are ordered by arrival: the time the resume was uploaded (see record_arrival), or for
+    files that were not uploaded through the UI, such as archive members, the raw file's modification
+    time. Markdown modification times are not used, since restored artifacts keep their original times.
+    The latest version is extracted unless it has no extraction output and ran out of dead-letter
+    retries; then the latest version that has output or can still be retried is extracted instead.
+
+    Args:
+        md_files (Iterable[Path]): Converted resume markdown files (the whole corpus).
+        output_dir (str): Directory of the resume extraction JSON files.
+
+    Returns:
+        Dict[str, str]: File stem of each version not to extract -> file stem of the version extracted.
+    """
+    if not duplicates_enabled():
+        return {}
+
+    index = FingerprintIndex.load()
+    current = {}
+    for md_file in md_files:
+        current[md_file.stem] = md_file
+        mtime = md_file.stat().st_mtime
+        entry = index.documents.get(md_file.stem)
+        if entry is None or entry["mtime"] != mtime:
+            with open(md_file, "r", encoding="utf-8") as f:
+                index.add(md_file.stem, minhash(f.read()), mtime)
+    for name in list(index.documents):
+        if name not in current:
+            index.remove(name)
+
+    groups = index.version_groups(_arrival_times(current))
+    index.save(groups)
+    output_path = Path(output_dir)
+    duplicate_of = _collapse(groups, lambda name: _has_output(name, output_path) or should_retry("resumes", current[name]))
+    if duplicate_of:
+        print(f"Found {len(duplicate_of)} near-duplicate resume versions; only the latest version of each is extracted and ranked.")
+    return duplicate_of
+
+
+def load_duplicate_map() -> Dict[str, str]:
+    """
+    Map older resume versions to the version shown in rankings: the latest version with extraction output.
+
+    Versions without output are not hidden behind one that failed, so a candidate stays ranked
+    while the extraction of their newest CV is retried or dead-lettered.
+
+    Returns:
+        Dict[str, str]: File stem -> file stem of the version ranked.
+    """
+    if not duplicates_enabled() or not index_path.exists():
+        return {}
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            groups = json.load(f).get("groups", [])
+    except Exception as e:
+        print(f"Error loading near-duplicate index: {str(e)}")
+        return {}
+    output_path = Path(config["data"]["directories"]["resumes"]["json"])
+    return _collapse(groups, lambda name: _has_output(name, output_path))
+
+
+def is_older_version(file_name: str, duplicate_of: Dict[str, str]) -> bool:
+    """Check whether a resume file (any extension) is an older version of another resume."""
+    return Path(file_name or "").stem in duplicate_of
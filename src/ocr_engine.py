@@ -0,0 +1,139 @@
+import queue
+import statistics
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List
+import pymupdf
+import pytesseract
+from PIL import Image
+from src.config_loader import config
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+ocr_config = config["ocr"]
+
+_backend = ocr_config.get("backend", "tesserocr")
+if _backend == "tesserocr" and tesserocr is None:
+    print("tesserocr is not installed, falling back to pytesseract for OCR.")
+    _backend = "pytesseract"
+
+# Initialised tesseract engines are handed out to one thread at a time and reused across pages and files
+_engines: "queue.Queue" = queue.Queue()
+_engines_created = 0
+_engines_lock = threading.Lock()
+
+_latencies: Dict[str, List[float]] = defaultdict(list)
+_latencies_lock = threading.Lock()
+
+
+class EngineUnavailable(RuntimeError):
+    """A tesseract engine could not be initialised."""
+
+
+@contextmanager
+def _engine():
+    """Borrow an initialised tesseract engine, creating one while the pool is below its size."""
+    global _engines_created
+    try:
+        api = _engines.get_nowait()
+    except queue.Empty:
+        with _engines_lock:
+            create = _engines_created < ocr_config.get("engine_pool_size", 4)
+            if create:
+                _engines_created += 1
+        if create:
+            kwargs = {"lang": ocr_config.get("language", "eng")}
+            if ocr_config.get("tessdata_path"):
+                kwargs["path"] = ocr_config["tessdata_path"]
+            try:
+                api = tesserocr.PyTessBaseAPI(**kwargs)
+            except Exception as e:
+                with _engines_lock:
+                    _engines_created -= 1
+                raise EngineUnavailable(str(e)) from e
+        else:
+            api = _engines.get()
+    try:
+        yield api
+    finally:
+        _engines.put(api)
+
+
+def _disable_engine_pool(error: Exception) -> None:
+    global _backend
+    print(f"tesseract engine pool unavailable ({str(error)}), falling back to pytesseract.")
+    _backend = "pytesseract"
+
+
+def _record_latency(backend: str, seconds: float) -> None:
+    with _latencies_lock:
+        _latencies[backend].append(seconds)
+
+
+def _recognize_bytes(data: bytes, width: int, height: int, bytes_per_pixel: int, bytes_per_line: int) -> str:
+    with _engine() as api:
+        api.SetImageBytes(data, width, height, bytes_per_pixel, bytes_per_line)
+        return api.GetUTF8Text()
+
+
+def image_to_text(image: Image.Image) -> str:
+    """
+    Run OCR on a PIL image with the configured backend.
+
+    Args:
+        image (Image.Image): Image to recognise.
+
+    Returns:
+        str: Recognised text.
+    """
+    start = time.perf_counter()
+    backend = _backend
+    if backend == "tesserocr":
+        try:
+            if image.mode not in ("L", "RGB", "RGBA"):
+                image = image.convert("RGB")
+            bytes_per_pixel = len(image.mode)
+            text = _recognize_bytes(image.tobytes(), image.width, image.height, bytes_per_pixel, image.width * bytes_per_pixel)
+        except EngineUnavailable as e:
+            _disable_engine_pool(e)
+            return image_to_text(image)
+        except Exception as e:
+            # A single unreadable image: use pytesseract for it and keep the engine pool
+            print(f"tesseract engine failed on an image ({str(e)}), using pytesseract for it.")
+            backend = "pytesseract"
+            text = pytesseract.image_to_string(image, lang=ocr_config.get("language", "eng"))
+    else:
+        text = pytesseract.image_to_string(image, lang=ocr_config.get("language", "eng"))
+    _record_latency(backend, time.perf_counter() - start)
+    return text
+
+
+def pixmap_to_image(pix: pymupdf.Pixmap) -> Image.Image:
+    """
+    Copy a pixmap's raw samples into a PIL image without encoding and decoding a PNG.
+
+    The image does not share memory with MuPDF, so it can be handed to another thread while the
+    rendering thread keeps using the document (PyMuPDF is not thread-safe).
+    """
+    mode = "RGBA" if pix.alpha else ("RGB" if pix.n >= 3 else "L")
+    return Image.frombytes(mode, (pix.width, pix.height), pix.samples, "raw", mode, pix.stride, 1)
+
+
+def report_ocr_stats(reset: bool = True) -> None:
+    """Print per-backend OCR call counts and latency (mean / p95) collected in this process."""
+    with _latencies_lock:
+        snapshot = {backend: list(values) for backend, values in _latencies.items()}
+        if reset:
+            _latencies.clear()
+
+    for backend, values in sorted(snapshot.items()):
+        if not values:
+            continue
+        ordered = sorted(values)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        print(f"  OCR latency ({backend}): {len(values)} images, mean {statistics.mean(values):.3f}s, p95 {p95:.3f}s")
@@ -0,0 +1,131 @@
+import math
+from PIL import Image, ImageOps, ImageStat
+import pymupdf
+from src.config_loader import config
+
+preprocess_config = config["ocr"]["preprocessing"]
+
+POINTS_PER_INCH = 72
+
+
+def select_page_dpi(page: pymupdf.Page) -> int:
+    """
+    Pick the render resolution for OCR of a PDF page.
+
+    Scanned pages are rendered at the resolution of their embedded image (rendering above it adds
+    nothing), raised to min_dpi for low-resolution scans and capped at target_dpi. The result is
+    lowered further if the rendered page would exceed max_pixels.
+
+    Args:
+        page (pymupdf.Page): Page to render.
+
+    Returns:
+        int: Render resolution in dots per inch.
+    """
+    target_dpi = preprocess_config["target_dpi"]
+    min_dpi = preprocess_config["min_dpi"]
+
+    native_dpi = 0.0
+    for info in page.get_image_info():
+        bbox = pymupdf.Rect(info["bbox"])
+        if bbox.width > 0 and info.get("width"):
+            native_dpi = max(native_dpi, info["width"] / (bbox.width / POINTS_PER_INCH))
+    dpi = min(max(native_dpi, min_dpi), target_dpi) if native_dpi else target_dpi
+
+    page_inches = (page.rect.width / POINTS_PER_INCH) * (page.rect.height / POINTS_PER_INCH)
+    if page_inches > 0:
+        dpi = min(dpi, math.sqrt(preprocess_config["max_pixels"] / page_inches))
+    return max(1, int(dpi))
+
+
+def render_page_for_ocr(page: pymupdf.Page) -> pymupdf.Pixmap:
+    """Render a PDF page for OCR, at an adaptive resolution and in grayscale when preprocessing is on."""
+    if not preprocess_config.get("enabled", True):
+        return page.get_pixmap()
+    return page.get_pixmap(dpi=select_page_dpi(page), colorspace=pymupdf.csGRAY)
+
+
+def _otsu_threshold(image: Image.Image) -> int:
+    """Compute Otsu's threshold from a grayscale image histogram."""
+    histogram = image.histogram()
+    total = sum(histogram)
+    sum_all = sum(i * count for i, count in enumerate(histogram))
+    sum_background = 0.0
+    weight_background = 0
+    best_threshold, best_variance = 127, 0.0
+    for threshold, count in enumerate(histogram):
+        weight_background += count
+        if weight_background == 0:
+            continue
+        weight_foreground = total - weight_background
+        if weight_foreground == 0:
+            break
+        sum_background += threshold * count
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_all - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_threshold, best_variance = threshold, variance
+    return best_threshold
+
+
+def estimate_skew(image: Image.Image) -> float:
+    """
+    Estimate the skew angle of a binarized page by maximising the variance of its row profile.
+
+    Args:
+        image (Image.Image): Binarized grayscale image.
+
+    Returns:
+        float: Angle in degrees that straightens the text lines.
+    """
+    max_angle = preprocess_config.get("max_skew_angle", 5)
+    step = preprocess_config.get("skew_step", 0.5)
+    # A small copy is enough to find the angle and keeps each trial rotation cheap
+    scale = min(1.0, 800 / max(image.size))
+    small = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))), Image.BILINEAR)
+    small = ImageOps.invert(small)
+
+    best_angle, best_score = 0.0, -1.0
+    steps = int(max_angle / step)
+    for i in range(-steps, steps + 1):
+        angle = i * step
+        rotated = small.rotate(angle, resample=Image.BILINEAR, fillcolor=0)
+        # Mean ink per row; aligned text lines give sharp peaks and a high variance
+        rows = rotated.resize((1, rotated.height), Image.BOX)
+        score = ImageStat.Stat(rows).var[0]
+        if score > best_score:
+            best_angle, best_score = angle, score
+    return best_angle
+
+
+def preprocess_image(image: Image.Image) -> Image.Image:
+    """
+    Prepare an image for OCR: downsample oversized images, convert to grayscale, binarize and deskew.
+
+    Args:
+        image (Image.Image): Image to prepare.
+
+    Returns:
+        Image.Image: Preprocessed image, or the input unchanged when preprocessing is disabled.
+    """
+    if not preprocess_config.get("enabled", True):
+        return image
+
+    image = ImageOps.exif_transpose(image)
+    max_pixels = preprocess_config["max_pixels"]
+    if image.width * image.height > max_pixels:
+        scale = math.sqrt(max_pixels / (image.width * image.height))
+        image = image.resize((int(image.width * scale), int(image.height * scale)), Image.LANCZOS)
+
+    image = image.convert("L")
+
+    if preprocess_config.get("binarize", True):
+        threshold = _otsu_threshold(image)
+        image = image.point(lambda value: 255 if value > threshold else 0)
+
+    if preprocess_config.get("deskew", True):
+        angle = estimate_skew(image)
+        if abs(angle) >= preprocess_config.get("skew_step", 0.5):
+            image = image.rotate(angle, resample=Image.BILINEAR, expand=True, fillcolor=255)
+    return image
@@ -0,0 +1,70 @@
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+from src.text_normalizer import estimate_tokens
+from src.config_loader import config
+
+prompt_cache_config = config.get("prompt_cache", {})
+min_prefix_tokens = prompt_cache_config.get("min_prefix_tokens", 1024)
+
+_lock = threading.Lock()
+_stats = {"calls": 0, "input_tokens": 0, "cached_tokens": 0}
+
+
+def cached_input_tokens(usage_metadata: Optional[Dict[str, Any]]) -> int:
+    """Input tokens a response reports as read from the provider's prompt cache."""
+    details = (usage_metadata or {}).get("input_token_details") or {}
+    return details.get("cache_read", 0) or 0
+
+
+def record_usage(usage_metadata: Optional[Dict[str, Any]]) -> None:
+    """Add the input token usage of an LLM response to the prefix cache statistics."""
+    if not usage_metadata:
+        return
+    with _lock:
+        _stats["calls"] += 1
+        _stats["input_tokens"] += usage_metadata.get("input_tokens", 0) or 0
+        _stats["cached_tokens"] += cached_input_tokens(usage_metadata)
+
+
+def report_prefix_cache_stats(reset: bool = True) -> None:
+    """
+    Print the share of input tokens served from the provider's prompt prefix cache since the last report.
+
+    Args:
+        reset (bool): Clear the counters after printing.
+
+    Returns:
+        None
+    """
+    if _stats["calls"] and _stats["input_tokens"]:
+        share = _stats["cached_tokens"] / _stats["input_tokens"]
+        print(f"Prompt prefix cache: {_stats['cached_tokens']} of {_stats['input_tokens']} input tokens "
+              f"over {_stats['calls']} LLM calls served from cache ({share:.0%})")
+    if reset:
+        for key in _stats:
+            _stats[key] = 0
+
+
+class PrefixCacheSimulator:
+    """
+    Local stand-in for provider-side implicit prompt caching.
+
+    A prompt is served from cache up to the longest prefix it shares with a recent prompt,
+    when that prefix is at least prompt_cache.min_prefix_tokens long, which is how Gemini
+    caches repeated prompt prefixes.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, min_tokens: Optional[int] = None):
+        self.recent = deque(maxlen=max_entries or prompt_cache_config.get("simulated_entries", 256))
+        self.min_tokens = min_prefix_tokens if min_tokens is None else min_tokens
+        self._lock = threading.Lock()
+
+    def cached_tokens(self, prompt: str) -> int:
+        """Return the tokens of a prompt that a prefix cache would serve, then remember the prompt."""
+        with self._lock:
+            shared = max((len(os.path.commonprefix([prompt, previous])) for previous in self.recent), default=0)
+            self.recent.append(prompt)
+        tokens = estimate_tokens(prompt[:shared])
+        return tokens if tokens >= self.min_tokens else 0
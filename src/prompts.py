@@ -1,11 +1,7 @@
-
-RESUME_EXTRACTION_PROMPT = """
-You are an expert HR professional and CV parser with extensive experience in talent acquisition. Your task is to extract comprehensive, accurate, and standardized information from CV/Resume documents.
-
-Today's date is: {current_date}.
-Use this date as a reference to calculate durations for roles marked as "Present" or ongoing.
-
-
+# Fixed instructions come first and per-call inputs last, so requests share their prompt prefix.
+# Only the scoring prompt's prefix (instructions plus job description) reaches the 1024 tokens Gemini's
+# implicit cache needs; the extraction instructions are shorter and are not served from the cache.
+RESUME_EXTRACTION_GUIDELINES = """
 ## EXTRACTION GUIDELINES:
 
 ### 1. NAME EXTRACTION:
@@ -82,6 +78,14 @@ Use this date as a reference to calculate durations for roles marked as "Present
 - Be thorough but avoid redundancy
 - in calculating total experience, do not double count overlapping periods
 
+"""
+
+RESUME_EXTRACTION_PROMPT = """
+You are an expert HR professional and CV parser with extensive experience in talent acquisition. Your task is to extract comprehensive, accurate, and standardized information from CV/Resume documents.
+
+""" + RESUME_EXTRACTION_GUIDELINES + """Today's date is: {current_date}.
+Use this date as a reference to calculate durations for roles marked as "Present" or ongoing.
+
 CV/RESUME DOCUMENT:
 {resume_text}
 
@@ -89,9 +93,92 @@ Extract all available information following the above guidelines and return stru
 """
 
 
-JOB_DESCRIPTION_EXTRACTION_PROMPT = """
-You are an expert HR  specializing in extracting key requirements from job descriptions. Your goal is to parse the provided text and structure the output according to a predefined schema.
+PACKED_RESUME_EXTRACTION_PROMPT = """
+You are an expert HR professional and CV parser with extensive experience in talent acquisition. Your task is to extract comprehensive, accurate, and standardized information from several CV/Resume documents at once.
+
+""" + RESUME_EXTRACTION_GUIDELINES + """
+## PACKED DOCUMENTS:
+- Each document below starts with a line "=== DOCUMENT: <filename> ===".
+- Return exactly one entry per document, in the same order, with its filename copied exactly.
+- Treat every document independently; never mix information between documents.
 
+Today's date is: {current_date}.
+Use this date as a reference to calculate durations for roles marked as "Present" or ongoing.
+
+CV/RESUME DOCUMENTS:
+{resume_documents}
+
+Extract all available information for every document following the above guidelines and return structured data.
+"""
+
+
+RANKING_RESUME_EXTRACTION_GUIDELINES = """
+## EXTRACTION GUIDELINES:
+Extract only the information needed to match the candidate against job descriptions. Keep every field short.
+
+### 1. NAME AND CONTACT:
+- Extract the full name as it appears on the document, with normalized capitalization
+- Extract all available contact methods; convert social media profiles to full URLs
+
+### 2. SUMMARY:
+- Extract the professional summary, or write one of 1-2 sentences from the experience if none exists
+
+### 3. EXPERIENCE:
+- List ALL work positions, including internships and part-time roles
+- Describe each role in one or two sentences covering its main responsibilities
+- List the technologies and tools used in each role
+- Use the format "X.Y years" for durations
+
+### 4. EDUCATION:
+- Use standard degree names (Bachelor of Science, Master of Arts, etc.) and the field of study
+- Include the graduation year if available
+
+### 5. SKILLS, CERTIFICATIONS AND LANGUAGES:
+- List technical skills, certification names and spoken languages without duplicates
+
+### 6. SOFT SKILLS AND DOMAIN KNOWLEDGE:
+- Extract soft skills explicitly mentioned or implied through achievements
+- Identify industry experience and business domain expertise
+
+### 7. DATA QUALITY:
+- Use empty lists/null for unavailable information, don't invent data
+- In calculating total experience, do not double count overlapping periods
+- Do not extract projects, awards, publications or books
+
+"""
+
+RANKING_RESUME_EXTRACTION_PROMPT = """
+You are an expert HR professional and CV parser with extensive experience in talent acquisition. Your task is to extract the information needed for candidate ranking from CV/Resume documents.
+
+""" + RANKING_RESUME_EXTRACTION_GUIDELINES + """Today's date is: {current_date}.
+Use this date as a reference to calculate durations for roles marked as "Present" or ongoing.
+
+CV/RESUME DOCUMENT:
+{resume_text}
+
+Extract the information following the above guidelines and return structured data.
+"""
+
+
+PACKED_RANKING_RESUME_EXTRACTION_PROMPT = """
+You are an expert HR professional and CV parser with extensive experience in talent acquisition. Your task is to extract the information needed for candidate ranking from several CV/Resume documents at once.
+
+""" + RANKING_RESUME_EXTRACTION_GUIDELINES + """## PACKED DOCUMENTS:
+- Each document below starts with a line "=== DOCUMENT: <filename> ===".
+- Return exactly one entry per document, in the same order, with its filename copied exactly.
+- Treat every document independently; never mix information between documents.
+
+Today's date is: {current_date}.
+Use this date as a reference to calculate durations for roles marked as "Present" or ongoing.
+
+CV/RESUME DOCUMENTS:
+{resume_documents}
+
+Extract the information for every document following the above guidelines and return structured data.
+"""
+
+
+JOB_DESCRIPTION_EXTRACTION_RULES = """
 ## EXTRACTION RULES:
 
 1.  **Job Title**: The official and complete job title (e.g., "Senior Software Engineer").
@@ -114,14 +201,36 @@ You are an expert HR  specializing in extracting key requirements from job descr
 -   Maintain a clear distinction between "Required" and "Preferred" items.
 -   Be thorough but concise, avoiding duplicate or redundant entries.
 
-## JOB DESCRIPTION TEXT:
+"""
+
+JOB_DESCRIPTION_EXTRACTION_PROMPT = """
+You are an expert HR  specializing in extracting key requirements from job descriptions. Your goal is to parse the provided text and structure the output according to a predefined schema.
+""" + JOB_DESCRIPTION_EXTRACTION_RULES + """## JOB DESCRIPTION TEXT:
 {job_description_text}
 
 Extract the information following the rules above and return the structured data.
 """
 
 
+
+PACKED_JOB_DESCRIPTION_EXTRACTION_PROMPT = """
+You are an expert HR  specializing in extracting key requirements from job descriptions. Your goal is to parse several job descriptions provided together and structure the output according to a predefined schema.
+
+""" + JOB_DESCRIPTION_EXTRACTION_RULES + """
+## PACKED DOCUMENTS:
+- Each job description below starts with a line "=== DOCUMENT: <filename> ===".
+- Return exactly one entry per document, in the same order, with its filename copied exactly.
+- Treat every document independently; never mix requirements between documents.
+
+## JOB DESCRIPTION TEXTS:
+{job_description_documents}
+
+Extract the information for every document following the rules above and return the structured data.
+"""
+
+
 # Scoring Prompt
+# The job description precedes the resumes, so all batches for one job share the cached prefix
 RESUME_JOB_SCORING_PROMPT = """
 You are an expert HR professional and talent acquisition specialist. Your task is to evaluate how well a candidate's resume/s match a specific job description and provide detailed scoring across multiple dimensions.
 
@@ -210,15 +319,6 @@ You are an expert HR professional and talent acquisition specialist. Your task i
 - Consider preferred domain knowledge and additional industry experience
 - Evaluate extra qualifications that enhance candidacy
 
-### 12. OVERALL SCORE CALCULATIONS:
-- The overall score should reflect how closely the candidate matches the job requirements as a single number (0-100).
-- Calculate it as a **weighted average** of the individual category scores using the specified weights:
-  {weights}
-- if the category has no data or requirements in job description, it should be excluded from the overall score calculation and normalized accordingly.
-- Apply the following calculation principles:
-  1. Ensure the final score is a **numeric value rounded to 2 decimal places**.
-  2. it can not exceed 100 or be less than 0.
-
 ## important instructions:
 -if the a category has no data or requirements in job description its score should be -1
 -if the candidate has no data in a category that is required in the job description its score should be 50
@@ -233,6 +333,12 @@ You are an expert HR professional and talent acquisition specialist. Your task i
 6. **For required categories**: Score based on how well candidate meets mandatory requirements
 7. **For preferred categories**: Score based on nice-to-have qualifications that add value
 
+## DATA FORMAT:
+The job description and resumes are compact JSON; keys without data are left out.
+- Job description keys: title (job title), resp (responsibilities), req_skills, req_edu, req_yrs (required experience), req_certs, req_dom (required domain knowledge), soft (soft skills), pref_skills, pref_edu, pref_dom (preferred domain knowledge)
+- Resume keys: id (candidate id), title (current job title), sum (summary), yrs (total experience), exp (experience: t title, co company, dur duration, d description, tech technologies), edu (education: deg degree, f field of study, y graduation year), skills, soft (soft skills), certs (certifications), langs (languages), dom (industries and business domains)
+- Return each candidate's id exactly as given with its 11 category scores; do not repeat names or contact details, and do not compute an overall score.
+
 ## JOB DESCRIPTION:
 {job_description}
 
@@ -0,0 +1,122 @@
+import json
+from typing import Any, Dict, List
+from src.utils import CandidateMatch, ContactInfo, IndividualScore, ScoredCandidate
+from src.embed_ranker.embed_utils import calculate_normalized_score
+from src.config_loader import config
+
+# Short response keys -> IndividualScore fields
+SCORE_FIELDS = {
+    "title": "job_title_relevance",
+    "years": "experience_years_match",
+    "edu": "education_match",
+    "exp": "experience_relevance",
+    "skills": "skills_match",
+    "soft": "soft_skills_relevance",
+    "certs": "certifications_match",
+    "domain": "domain_knowledge_match",
+    "langs": "languages_match",
+    "pref_edu": "preferred_education_relevance",
+    "pref_qual": "preferred_qualifications_relevance",
+}
+
+
+def prune(value: Any) -> Any:
+    """Drop None values, empty strings, lists and dicts, recursively."""
+    if isinstance(value, dict):
+        pruned = {key: prune(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [item for item in (prune(item) for item in value) if item not in (None, "", [], {})]
+    return value
+
+
+def dense_json(value: Any) -> str:
+    """JSON without whitespace between tokens."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact_resume(resume: Dict) -> Dict:
+    """
+    Project extracted resume data onto the fields the scoring rubric uses, under short keys.
+
+    Contact details, projects, awards, publications and books are left out; the candidate is
+    identified by its file name under "id".
+
+    Args:
+        resume (Dict): Resume data as saved by the extractors.
+
+    Returns:
+        Dict: Compact resume without empty values.
+    """
+    domain = resume.get("domain_knowledge") or {}
+    return prune({
+        "id": resume.get("filename"),
+        "title": resume.get("job_title"),
+        "sum": resume.get("summary"),
+        "yrs": resume.get("experience_duration"),
+        "exp": [{
+            "t": exp.get("job_title"),
+            "co": exp.get("company"),
+            "dur": exp.get("duration"),
+            "d": exp.get("description"),
+            "tech": exp.get("technologies_used"),
+        } for exp in resume.get("experience") or []],
+        "edu": [{
+            "deg": edu.get("degree"),
+            "f": edu.get("field_of_study"),
+            "y": edu.get("graduation_year"),
+        } for edu in resume.get("education") or []],
+        "skills": resume.get("skills"),
+        "soft": resume.get("soft_skills"),
+        "certs": [cert.get("name") for cert in resume.get("certifications") or []],
+        "langs": resume.get("languages"),
+        "dom": (domain.get("industries") or []) + (domain.get("business_domains") or []),
+    })
+
+
+def compact_job_description(jd: Dict) -> Dict:
+    """Project extracted job requirements onto short keys, without empty values."""
+    return prune({
+        "title": jd.get("job_title"),
+        "resp": jd.get("responsibilities"),
+        "req_skills": jd.get("required_skills"),
+        "req_edu": jd.get("required_education"),
+        "req_yrs": jd.get("required_experience_duration"),
+        "req_certs": jd.get("required_certifications"),
+        "req_dom": jd.get("required_domain_knowledge"),
+        "soft": jd.get("soft_skills"),
+        "pref_skills": jd.get("preferred_skills"),
+        "pref_edu": jd.get("preferred_education"),
+        "pref_dom": jd.get("preferred_domain_knowledge"),
+    })
+
+
+def expand_candidate(scored: ScoredCandidate, resume: Dict) -> Dict:
+    """
+    Build the stored candidate entry from the LLM's scores and the candidate's extracted resume.
+
+    The overall score is the weighted average of the category scores under scoring.weights.
+
+    Args:
+        scored (ScoredCandidate): Scores returned by the LLM.
+        resume (Dict): Resume data the candidate id refers to.
+
+    Returns:
+        Dict: CandidateMatch as a dict, with name, job title and contact details from the resume.
+    """
+    contact = resume.get("contact") or {}
+    scores = IndividualScore(**{field: getattr(scored.scores, key) for key, field in SCORE_FIELDS.items()})
+    return CandidateMatch(
+        name=resume.get("name") or "Unknown",
+        file_name=resume.get("filename") or scored.id,
+        job_title=resume.get("job_title"),
+        contact=ContactInfo(phone=contact.get("phone"), linkedin=contact.get("linkedin"), email=contact.get("email")),
+        scores=scores,
+        overall_score=round(calculate_normalized_score(scores, config["scoring"]["weights"]), 2),
+        ranking_method="llm",
+    ).dict()
+
+
+def resumes_by_id(resumes: List[Dict]) -> Dict[str, Dict]:
+    """Index resume data by the id used in compact payloads."""
+    return {resume.get("filename"): resume for resume in resumes}
@@ -1,17 +1,36 @@
 import json
 from pathlib import Path
-from typing import Dict
-from langchain_core.prompts import PromptTemplate
+from typing import Dict, List
 from langchain_core.language_models import BaseLanguageModel
-from .utils import ResumeData,default_resume
-from .prompts import RESUME_EXTRACTION_PROMPT
+from .utils import ResumeData,PackedResumes,RankingResumeData,PackedRankingResumes
+from .prompts import (RESUME_EXTRACTION_PROMPT, PACKED_RESUME_EXTRACTION_PROMPT,
+                      RANKING_RESUME_EXTRACTION_PROMPT, PACKED_RANKING_RESUME_EXTRACTION_PROMPT)
+from .llm_client import ainvoke_structured, format_packed_documents, gather_bounded, pack_files, run_async
+from .llm_cache import report_cache_stats
+from .prompt_cache import report_prefix_cache_stats
+from .text_normalizer import prepare_for_extraction, report_token_savings
+from .config_loader import config
+from .dead_letter import clear_failure, is_failed_output, record_failure, should_retry
+from .heuristic_extractor import is_heuristic_output
+from .near_duplicates import update_duplicate_index
 from datetime import datetime
 current_date = datetime.now().strftime("%B %Y")
+resume_token_budget = config.get("normalization", {}).get("resume_token_budget", 0)
 
+# Schema and prompt per extraction mode: (schema, prompt, packed schema, packed prompt).
+# "ranking" only asks for the fields the rankers score on; "full" also extracts projects, awards, publications and books.
+EXTRACTION_SCHEMAS = {
+    "full": (ResumeData, RESUME_EXTRACTION_PROMPT, PackedResumes, PACKED_RESUME_EXTRACTION_PROMPT),
+    "ranking": (RankingResumeData, RANKING_RESUME_EXTRACTION_PROMPT, PackedRankingResumes, PACKED_RANKING_RESUME_EXTRACTION_PROMPT),
+}
+extraction_schema = config["processing"].get("extraction_schema", "ranking")
+if extraction_schema not in EXTRACTION_SCHEMAS:
+    raise ValueError(f"Unknown extraction_schema '{extraction_schema}', expected one of {list(EXTRACTION_SCHEMAS)}")
 
 
 
-def process_resume_file(resume_file: Path, llm: BaseLanguageModel) -> Dict:
+
+async def aprocess_resume_file(resume_file: Path, llm: BaseLanguageModel) -> Dict:
     """
     Process a resume markdown file and extract structured data using Gemini API.
     
@@ -21,6 +40,9 @@ def process_resume_file(resume_file: Path, llm: BaseLanguageModel) -> Dict:
 
     Returns:
         Dict: Extracted resume data as dictionary
+
+    Raises:
+        Exception: If the resume cannot be read or the LLM call fails after retries
     """
     try:
         # Read the file content
@@ -28,14 +50,11 @@ def process_resume_file(resume_file: Path, llm: BaseLanguageModel) -> Dict:
             resume_text = f.read()
         
         print(f"Processing resume from: {resume_file.name}")
+        resume_text = prepare_for_extraction(resume_text, resume_file.name, resume_token_budget)
         
-        prompt = PromptTemplate(template=RESUME_EXTRACTION_PROMPT,input_variables=["current_date","resume_text"])
-
-        # Initialize the LLM
-        structured_llm = llm.with_structured_output(ResumeData)
-        chain = prompt | structured_llm
-
-        resume_data = chain.invoke({"current_date": current_date,"resume_text": resume_text})
+        schema, prompt, _, _ = EXTRACTION_SCHEMAS[extraction_schema]
+        resume_data = await ainvoke_structured(llm, prompt, schema,
+                                               {"current_date": current_date,"resume_text": resume_text})
 
         result = resume_data.dict()
         result['filename'] = resume_file.name
@@ -44,15 +63,90 @@ def process_resume_file(resume_file: Path, llm: BaseLanguageModel) -> Dict:
         
     except Exception as e:
         print(f"Error processing resume from {resume_file.name}: {str(e)}")
-        # Return a default ResumeData object
-        result=default_resume.dict()
-        result['filename'] = resume_file.name
-        return result
+        raise
+
+
+def process_resume_file(resume_file: Path, llm: BaseLanguageModel) -> Dict:
+    """
+    Synchronous wrapper around aprocess_resume_file.
+
+    Args:
+        resume_file (Path): Path to the resume markdown file
+        llm (BaseLanguageModel): Language model instance for processing
+
+    Returns:
+        Dict: Extracted resume data as dictionary
+    """
+    return run_async(aprocess_resume_file(resume_file, llm))
+
+
+async def aprocess_resume_pack(resume_files: List[Path], llm: BaseLanguageModel) -> Dict[str, Dict]:
+    """
+    Extract several resumes with a single LLM request.
+
+    Args:
+        resume_files (List[Path]): Resume markdown files to send together
+        llm (BaseLanguageModel): Language model instance for processing
+
+    Returns:
+        Dict[str, Dict]: Extracted resume data keyed by file name; documents missing from the response are left out
+    """
+    documents = []
+    for resume_file in resume_files:
+        with open(resume_file, 'r', encoding='utf-8') as f:
+            documents.append((resume_file.name, prepare_for_extraction(f.read(), resume_file.name, resume_token_budget)))
+
+    print(f"Processing {len(documents)} packed resumes: {', '.join(name for name, _ in documents)}")
+
+    _, _, packed_schema, packed_prompt = EXTRACTION_SCHEMAS[extraction_schema]
+    response = await ainvoke_structured(llm, packed_prompt, packed_schema,
+                                        {"current_date": current_date,"resume_documents": format_packed_documents(documents)})
+
+    expected = {resume_file.name for resume_file in resume_files}
+    results = {}
+    for resume in response.resumes:
+        if resume.filename in expected and resume.filename not in results:
+            results[resume.filename] = resume.dict()
+    return results
+
+
+async def _extract_resumes_to_files(md_files: List[Path], output_path: Path, llm: BaseLanguageModel) -> int:
+    """Extract a pack of resumes and save each as JSON; failed resumes go to the dead-letter area. Returns the number of failures."""
+    results = {}
+    if len(md_files) > 1:
+        try:
+            results = await aprocess_resume_pack(md_files, llm)
+        except Exception as e:
+            print(f"Error processing packed resumes, falling back to one request per resume: {str(e)}")
+        missing = len(md_files) - len(results)
+        if results and missing:
+            print(f"{missing} of {len(md_files)} packed resumes were not returned, retrying them one by one")
+
+    failed = 0
+    for md_file in md_files:
+        resume_data = results.get(md_file.name)
+        if resume_data is None:
+            try:
+                resume_data = await aprocess_resume_file(md_file, llm)
+            except Exception as e:
+                # No JSON is written, so the next run retries this resume
+                record_failure("resumes", md_file, e)
+                failed += 1
+                continue
+
+        # Save each resume as a separate JSON file
+        with open(output_path / f"{md_file.stem}.json", 'w', encoding='utf-8') as f:
+            json.dump(resume_data, f, indent=2, ensure_ascii=False)
+        clear_failure("resumes", md_file)
+    return failed
 
 
 def process_resumes_directory( resumes_dir: str, output_dir: str, llm: BaseLanguageModel) -> None:
     """
     Process all resume markdown files in a directory and save each as a separate JSON file.
+    Files are extracted concurrently, with at most processing.llm_max_concurrency requests in flight,
+    and packed processing.extraction_pack_size at a time into a single request. Resumes that fail
+    are recorded in the dead-letter area instead of being saved, and are retried on the next run.
     
     Args:
         resumes_dir (str): Directory containing resume markdown files
@@ -84,27 +178,44 @@ def process_resumes_directory( resumes_dir: str, output_dir: str, llm: BaseLangu
     print(f"Found {total_files} resume files to process")
     print(f"Output will be saved to: {output_dir}")
     
-    processed=0
+    duplicate_of = update_duplicate_index(md_files, output_dir)
     skipped=0
+    pending=[]
     for md_file in md_files:
+        if md_file.stem in duplicate_of:
+            print(f"Skipping {md_file.name}: near-duplicate of {duplicate_of[md_file.stem]}.md")
+            skipped+=1
+            continue
         output_file = output_path / f"{md_file.stem}.json"
         if output_file.exists():
-            print(f"Skipping already extracted file: {md_file.name}")
+            if not is_failed_output(output_file, "resumes") and not is_heuristic_output(output_file):
+                print(f"Skipping already extracted file: {md_file.name}")
+                skipped+=1
+                continue
+            # Placeholder record left by a failed extraction in an older version, or a heuristic extraction
+            output_file.unlink()
+        if not should_retry("resumes", md_file):
+            print(f"Skipping {md_file.name}: extraction failed too many times, see the dead-letter area")
             skipped+=1
             continue
-        try:
-            # Process the resume file
-            resume_data = process_resume_file(md_file,llm)
-            
-            # Save each resume as a separate JSON file
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(resume_data, f, indent=2, ensure_ascii=False)            
-            processed+=1
-        except Exception as e:
-            print(f"Critical error processing {md_file.name}: {str(e)}")
+        pending.append(md_file)
+
+    packs = pack_files(pending)
+    results = run_async(gather_bounded(_extract_resumes_to_files(pack, output_path, llm) for pack in packs))
+
+    processed=0
+    failed=0
+    for pack, outcome in zip(packs, results):
+        if isinstance(outcome, Exception):
+            print(f"Critical error processing {', '.join(md_file.name for md_file in pack)}: {str(outcome)}")
             continue
+        processed+=len(pack)-outcome
+        failed+=outcome
 
-    print(f"Processing completed! {processed} files extracted successfully, {skipped} skipped.")
+    print(f"Processing completed! {processed} files extracted successfully, {failed} failed, {skipped} skipped.")
+    report_token_savings()
+    report_cache_stats()
+    report_prefix_cache_stats()
     return
 
 
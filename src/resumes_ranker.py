@@ -1,30 +1,72 @@
+import asyncio
 import json
 from pathlib import Path
-from langchain_core.prompts import PromptTemplate
+from typing import Any, Dict, List, Optional
 from langchain_core.language_models import BaseLanguageModel
-from src.utils import  Candidates, JobMatchingResult
+from src.utils import  CandidateMatch, Candidates, JobMatchingResult, ScoredCandidates
 from src.prompts import RESUME_JOB_SCORING_PROMPT
+from src.llm_client import ainvoke_structured, gather_bounded, is_output_error, max_concurrency, run_async
+from src.text_normalizer import estimate_tokens
+from src.ranking_payload import compact_job_description, compact_resume, dense_json, expand_candidate, resumes_by_id
+from src.llm_cache import report_cache_stats
+from src.prompt_cache import report_prefix_cache_stats
+from src.near_duplicates import is_older_version, load_duplicate_map
+from src.shortlist import embedding_score, select_shortlist, shortlist_enabled
+from src.reweight import reweight_candidates
 from src.config_loader import config
-weights = config["scoring"]["weights"]
+batch_input_tokens = config["processing"].get("ranking_batch_input_tokens", 32000)
+batch_output_tokens = config["processing"].get("ranking_batch_output_tokens", 8000)
+output_tokens_per_resume = config["processing"].get("ranking_output_tokens_per_resume", 300)
 
 
-def rank_resumes(resumes_dir: str, jd_file: str, llm: BaseLanguageModel, output_dir: str, batch_size: int = 10) -> None:
+def plan_batches(resumes: List[Dict], overhead_tokens: int, max_resumes: int) -> List[List[Dict]]:
     """
-    Rank resumes against a single job description by sending batches of resumes in a single LLM request,
-    expecting a list of CandidateMatch objects, and save results as a JSON file. Uses the 'filename' field
-    from resume data instead of tracking file names separately.
+    Group resumes into ranking batches that fit the token budgets.
+
+    A batch holds at most `max_resumes` resumes, as many as fit into processing.ranking_batch_input_tokens
+    (after the prompt and job description) and as many candidates as fit into
+    processing.ranking_batch_output_tokens. A resume larger than the budget gets a batch of its own.
+
+    Args:
+        resumes (List[Dict]): Resume data.
+        overhead_tokens (int): Estimated tokens of the prompt without resumes.
+        max_resumes (int): Maximum resumes per batch.
+
+    Returns:
+        List[List[Dict]]: Batches in input order.
+    """
+    input_budget = batch_input_tokens - overhead_tokens
+    limit = max(1, min(max_resumes, batch_output_tokens // max(1, output_tokens_per_resume)))
+    batches: List[List[Dict]] = []
+    current: List[Dict] = []
+    used = 0
+    for resume in resumes:
+        tokens = estimate_tokens(dense_json(compact_resume(resume)))
+        if current and (len(current) >= limit or used + tokens > input_budget):
+            batches.append(current)
+            current, used = [], 0
+        current.append(resume)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _prepare_ranking(resumes_dir: str, jd_file: str, output_dir: str, batch_size: int, shortlist: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Load a job description, its existing ranking and the resumes still to rank, split into batches.
 
     Args:
         resumes_dir (str): Directory containing resume JSON files.
         jd_file (str): Path to the job description JSON file.
-        llm (BaseLanguageModel): Language model instance for processing.
         output_dir (str): Directory to save the output JSON file.
-        batch_size (int): Number of resumes to process in each batch (default: 10).
+        batch_size (int): Maximum number of resumes per LLM request.
+        shortlist (bool): Rank only the embedding-ranked candidates selected for the shortlist.
 
     Returns:
-        None
+        Optional[Dict[str, Any]]: Ranking job (job description, output file, existing candidates and
+        batches of resume data), or None when there is nothing to rank.
     """
-
     resumes_path = Path(resumes_dir)
     jd_path = Path(jd_file)
     output_path = Path(output_dir)
@@ -42,13 +84,14 @@ def rank_resumes(resumes_dir: str, jd_file: str, llm: BaseLanguageModel, output_
             jd_data = json.load(f)
     except Exception as e:
         print(f"Error loading job description {jd_path.name}: {str(e)}")
-        return
+        return None
 
-    # Get all resume JSON files
-    resume_files = list(resumes_path.glob("*.json"))
+    # Get all resume JSON files, leaving out older versions of near-duplicate resumes
+    duplicate_of = load_duplicate_map()
+    resume_files = [rf for rf in resumes_path.glob("*.json") if rf.stem not in duplicate_of]
     if not resume_files:
         print("No resume files found in the directory.")
-        return
+        return None
 
     print(f"Found {len(resume_files)} resume files to process for {jd_path.name}")
 
@@ -57,84 +100,136 @@ def rank_resumes(resumes_dir: str, jd_file: str, llm: BaseLanguageModel, output_
 
     # Load existing results if any
     existing_candidates = []
-    existing_file_names = set()
     if output_file.exists():
         try:
             with open(output_file, "r", encoding="utf-8") as f:
                 existing_result = json.load(f)
-            existing_candidates = existing_result.get("candidates", {}).get("candidates", [])
-            existing_file_names = {Path(c.get("file_name")).stem for c in existing_candidates}
+            existing_candidates = [c for c in existing_result.get("candidates", {}).get("candidates", [])
+                                   if not is_older_version(c.get("file_name"), duplicate_of)]
             print(f"Found {len(existing_candidates)} already ranked candidates, skipping them.")
         except Exception as e:
             print(f"Error loading existing results, will overwrite. Reason: {str(e)}")
 
-    # Filter resumes: only process new ones
-    resume_files_to_process = [rf for rf in resume_files if rf.stem not in existing_file_names]
-    if not resume_files_to_process:
-        print("All candidates already ranked, nothing new to process.")
-        return
+    if shortlist:
+        # Only the shortlisted candidates of the embedding stage are scored by the LLM
+        shortlisted = select_shortlist(existing_candidates)
+        resume_files_to_process = [rf for rf in resume_files if rf.stem in shortlisted]
+        if not resume_files_to_process:
+            print("No new shortlisted candidates, nothing to rank with AI.")
+            return None
+        print(f"Shortlisted {len(resume_files_to_process)} of {len(resume_files)} candidates by embedding score.")
+    else:
+        # Filter resumes: only process new ones and those not yet scored by the LLM (embedding-only or unknown ranker)
+        llm_ranked = {Path(c.get("file_name")).stem for c in existing_candidates if c.get("ranking_method") == "llm"}
+        resume_files_to_process = [rf for rf in resume_files if rf.stem not in llm_ranked]
+        if not resume_files_to_process:
+            print("All candidates already ranked, nothing new to process.")
+            return None
 
     print(f"Processing {len(resume_files_to_process)} new resumes...")
 
-    prompt = PromptTemplate(template=RESUME_JOB_SCORING_PROMPT,input_variables=["job_description", "resume_data", "weights"])
-    structured_llm = llm.with_structured_output(Candidates)
-    chain = prompt | structured_llm
+    resume_data = []
+    for resume_file in resume_files_to_process:
+        try:
+            with open(resume_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            data.setdefault("filename", resume_file.name)
+            resume_data.append(data)
+        except Exception as e:
+            print(f"Error loading resume {resume_file.name}: {str(e)}")
+            continue
 
-    new_candidates = []
-    total_new = len(resume_files_to_process)
-    # Process in batches
-    for i in range(0, total_new, batch_size):
-        batch = resume_files_to_process[i:i + batch_size]
-        batch_num = (i // batch_size) + 1
-        print(f"Processing batch {batch_num} of {total_new // batch_size + 1}")
-
-        batch_resume_data = []
-        for resume_file in batch:
-            try:
-                with open(resume_file, 'r', encoding='utf-8') as f:
-                    resume_data = json.load(f)
-                batch_resume_data.append(resume_data)
-            except Exception as e:
-                print(f"Error loading resume {resume_file.name}: {str(e)}")
-                continue
+    overhead_tokens = estimate_tokens(RESUME_JOB_SCORING_PROMPT + dense_json(compact_job_description(jd_data)))
+    batches = plan_batches(resume_data, overhead_tokens, batch_size)
+    if batches:
+        print(f"Planned {len(batches)} batches of up to {max(len(batch) for batch in batches)} resumes")
 
-        if not batch_resume_data:
-            continue
+    return {
+        "jd_path": jd_path,
+        "jd_data": jd_data,
+        "output_file": output_file,
+        "existing_candidates": existing_candidates,
+        "batches": batches,
+    }
 
-        try:
-            batch_candidates_response = chain.invoke({
-                "job_description": json.dumps(jd_data),
-                "resume_data": json.dumps(batch_resume_data),
-                "weights": json.dumps(weights)
-            })
-
-            if not isinstance(batch_candidates_response, Candidates):
-                print("LLM did not return a valid Candidates object")
-                continue
 
-            for candidate in batch_candidates_response.candidates:
-                try:
-                    new_candidates.append(candidate.dict())
-                    print(f"Processed candidate: {candidate.name} from {candidate.file_name}")
-                except Exception as e:
-                    print(f"Error processing candidate: {str(e)}")
-                    continue
+async def _score_batch(llm: BaseLanguageModel, jd_data: Dict, batch_resume_data: List[Dict]) -> List[Dict]:
+    """
+    Score one batch of resumes against a job description in a single LLM request.
 
+    The request carries compact projections of the job description and resumes, and the LLM returns
+    only ids and category scores; names and contact details are filled in from the extracted resumes
+    and the overall score is computed locally.
+    """
+    batch_scores_response = await ainvoke_structured(llm, RESUME_JOB_SCORING_PROMPT, ScoredCandidates, {
+        "job_description": dense_json(compact_job_description(jd_data)),
+        "resume_data": dense_json([compact_resume(resume) for resume in batch_resume_data]),
+    })
+
+    resumes = resumes_by_id(batch_resume_data)
+    new_candidates = []
+    for scored in batch_scores_response.candidates:
+        try:
+            resume = resumes.get(scored.id)
+            if resume is None:
+                print(f"Skipping scores for unknown candidate id: {scored.id}")
+                continue
+            candidate = expand_candidate(scored, resume)
+            new_candidates.append(candidate)
+            print(f"Processed candidate: {candidate['name']} from {candidate['file_name']}")
         except Exception as e:
-            print(f"Error processing batch {i // batch_size + 1}: {str(e)}")
+            print(f"Error processing candidate: {str(e)}")
             continue
+    return new_candidates
+
+
+async def _score_batch_adaptive(llm: BaseLanguageModel, jd_data: Dict, batch_resume_data: List[Dict]) -> List[Dict]:
+    """
+    Score a batch, splitting it in halves and scoring those in turn when the response is unusable.
+
+    Batches whose response comes back truncated or fails to parse are thereby retried at the largest
+    size that works. Resumes that fail on their own are reported and skipped. Other errors (transient
+    errors left after the retries, authentication, quota or request errors) are raised right away,
+    since smaller batches would fail the same way.
+    """
+    try:
+        return await _score_batch(llm, jd_data, batch_resume_data)
+    except Exception as e:
+        if not is_output_error(e):
+            raise
+        if len(batch_resume_data) == 1:
+            print(f"Error scoring {batch_resume_data[0].get('filename', 'resume')}: {str(e)}")
+            return []
+        middle = len(batch_resume_data) // 2
+        print(f"Batch of {len(batch_resume_data)} resumes failed ({type(e).__name__}), "
+              f"retrying as batches of {middle} and {len(batch_resume_data) - middle}")
+        first = await _score_batch_adaptive(llm, jd_data, batch_resume_data[:middle])
+        return first + await _score_batch_adaptive(llm, jd_data, batch_resume_data[middle:])
+
+
+def _save_ranking(job: Dict[str, Any], new_candidates: List[Dict]) -> None:
+    """Merge newly scored candidates into a job description's ranking and write its ranking file."""
+    jd_path, output_file = job["jd_path"], job["output_file"]
 
     # Merge existing + new, ensuring no duplicates
-    candidate_dict = {c.get("file_name"): c for c in existing_candidates}  # Existing candidates by file_name
+    candidate_dict = {c.get("file_name"): c for c in job["existing_candidates"]}  # Existing candidates by file_name
     for candidate in new_candidates:
+        previous = candidate_dict.get(candidate.get("file_name"))
+        if previous is not None:
+            candidate["embedding_score"] = embedding_score(previous)  # Keep the shortlist score of re-scored candidates
         candidate_dict[candidate.get("file_name")] = candidate  # Overwrite or add new candidates
 
-    merged_candidates = list(candidate_dict.values())  # Convert back to list
-    merged_candidates = sorted(merged_candidates, key=lambda x: x.get("overall_score", 0), reverse=True)
+    # Overall scores of all candidates follow the current weights
+    merged_candidates = []
+    for candidate in reweight_candidates(list(candidate_dict.values()), config["scoring"]["weights"]):
+        try:
+            merged_candidates.append(CandidateMatch.parse_obj(candidate))
+        except Exception as e:
+            print(f"Dropping invalid ranking entry {candidate.get('file_name', 'unknown')}: {str(e).splitlines()[0]}")
 
     # Save results
     result = JobMatchingResult(
-        job_title=jd_data.get("job_title", "Unknown"),
+        job_title=job["jd_data"].get("job_title", "Unknown"),
         job_file_name=jd_path.name,
         candidates=Candidates(candidates=merged_candidates)
     ).dict()
@@ -149,16 +244,75 @@ def rank_resumes(resumes_dir: str, jd_file: str, llm: BaseLanguageModel, output_
     print(f"Ranking completed for {jd_path.name}!")
 
 
-def rank_job_descriptions(resumes_dir: str, jds_dir: str, llm: BaseLanguageModel, output_dir: str,batch_size:int=10) -> None:
+async def _rank_jobs(jobs: List[Dict[str, Any]], llm: BaseLanguageModel) -> None:
+    """
+    Score the batches of all ranking jobs concurrently and save each job's ranking once its batches are done.
+
+    All batches share one limit of processing.llm_max_concurrency requests in flight (and the shared
+    rate limiter), so wall-clock time depends on that limit rather than on the number of job descriptions.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def rank_job(job: Dict[str, Any]) -> None:
+        name, batches = job["jd_path"].name, job["batches"]
+        results = await gather_bounded((_score_batch_adaptive(llm, job["jd_data"], batch) for batch in batches), semaphore=semaphore)
+        new_candidates = []
+        for batch_num, outcome in enumerate(results, start=1):
+            if isinstance(outcome, Exception):
+                print(f"Error processing batch {batch_num} of {len(batches)} for {name}: {str(outcome)}")
+                continue
+            print(f"Scored batch {batch_num} of {len(batches)} for {name}")
+            new_candidates.extend(outcome)
+        _save_ranking(job, new_candidates)
+
+    outcomes = await asyncio.gather(*(rank_job(job) for job in jobs), return_exceptions=True)
+    for job, outcome in zip(jobs, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"Error processing job description {job['jd_path'].name}: {str(outcome)}")
+
+
+def rank_resumes(resumes_dir: str, jd_file: str, llm: BaseLanguageModel, output_dir: str, batch_size: int = 10,
+                 shortlist: bool = False) -> None:
+    """
+    Rank resumes against a single job description by sending batches of resumes in a single LLM request,
+    expecting category scores per candidate, and save results as a JSON file. Uses the 'filename' field
+    from resume data instead of tracking file names separately. Batches are sized to the token budgets,
+    scored concurrently, and split in halves when a request fails. Overall scores are computed locally
+    from scoring.weights.
+
+    Args:
+        resumes_dir (str): Directory containing resume JSON files.
+        jd_file (str): Path to the job description JSON file.
+        llm (BaseLanguageModel): Language model instance for processing.
+        output_dir (str): Directory to save the output JSON file.
+        batch_size (int): Maximum number of resumes in each batch (default: 10).
+        shortlist (bool): Rank only the shortlist of an existing embedding ranking (default: False).
+
+    Returns:
+        None
+    """
+    job = _prepare_ranking(resumes_dir, jd_file, output_dir, batch_size, shortlist)
+    if job is not None:
+        run_async(_rank_jobs([job], llm))
+
+
+def rank_job_descriptions(resumes_dir: str, jds_dir: str, llm: BaseLanguageModel, output_dir: str,batch_size:int=10,
+                          shortlist: Optional[bool] = None) -> None:
     """
     Rank resumes against all job descriptions in a directory, saving each result in a separate JSON file.
+    Batches of all job descriptions are scored concurrently under processing.llm_max_concurrency.
+
+    With the shortlist cascade, all resumes are first ranked with embeddings, and only the top
+    shortlist.top_k candidates of each job description are scored by the LLM; the rest keep
+    their embedding scores and are listed after the shortlist.
 
     Args:
         resumes_dir (str): Directory containing resume JSON files.
         jds_dir (str): Directory containing job description JSON files.
         llm (BaseLanguageModel): Language model instance for processing.
         output_dir (str): Directory to save the output JSON files.
-        batch_size (int): Number of resumes to process in each batch (default: 5).
+        batch_size (int): Maximum number of resumes in each batch (default: 10).
+        shortlist (Optional[bool]): Use the embedding shortlist cascade (default: shortlist.enabled).
     Returns:
         None
     """
@@ -174,13 +328,29 @@ def rank_job_descriptions(resumes_dir: str, jds_dir: str, llm: BaseLanguageModel
 
     print(f"Found {len(jd_files)} job description files to process.")
 
+    if shortlist is None:
+        shortlist = shortlist_enabled()
+    if shortlist:
+        from src.embed_ranker.embed_ranker import rank_job_descriptions_with_embeddings
+        print("Ranking all candidates with embeddings to build the shortlists...")
+        rank_job_descriptions_with_embeddings(resumes_dir, jds_dir, output_dir)
+
+    jobs = []
     for jd_file in jd_files:
         try:
-            print(f"Processing job description: {jd_file.name}")
-            rank_resumes(resumes_dir, str(jd_file), llm, output_dir, batch_size=batch_size)
-            print("----------------------------------------")
+            print(f"Preparing job description: {jd_file.name}")
+            job = _prepare_ranking(resumes_dir, str(jd_file), output_dir, batch_size, shortlist)
+            if job is not None:
+                jobs.append(job)
         except Exception as e:
             print(f"Error processing job description {jd_file.name}: {str(e)}")
             continue
 
-    print("All job descriptions processed!")
\ No newline at end of file
+    if jobs:
+        total_batches = sum(len(job["batches"]) for job in jobs)
+        print(f"Scoring {total_batches} batches for {len(jobs)} job descriptions...")
+        run_async(_rank_jobs(jobs, llm))
+
+    print("All job descriptions processed!")
+    report_cache_stats()
+    report_prefix_cache_stats()
@@ -0,0 +1,74 @@
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.utils import IndividualScore
+from src.embed_ranker.embed_utils import calculate_normalized_score
+from src.shortlist import ranking_order
+from src.config_loader import config
+
+
+def overall_score(scores: Dict, weights: Dict[str, float]) -> float:
+    """Weighted overall score (0-100) of a candidate's category scores, leaving out categories scored -1."""
+    return round(calculate_normalized_score(IndividualScore.parse_obj(scores), weights), 2)
+
+
+def reweight_candidates(candidates: List[Dict], weights: Dict[str, float]) -> List[Dict]:
+    """
+    Recompute the overall scores of ranked candidates from their stored category scores and re-sort them.
+
+    Candidates whose category scores are missing or invalid keep their stored overall score.
+
+    Args:
+        candidates (List[Dict]): Candidates of a ranking file.
+        weights (Dict[str, float]): Category weights.
+
+    Returns:
+        List[Dict]: The candidates with updated overall scores, in ranking order.
+    """
+    for candidate in candidates:
+        try:
+            candidate["overall_score"] = overall_score(candidate.get("scores") or {}, weights)
+        except Exception as e:
+            # Entries with missing or malformed scores (e.g. from old ranking files) keep their stored score
+            print(f"Keeping the stored overall score of {candidate.get('file_name', 'unknown candidate')}: invalid category scores ({str(e).splitlines()[0]})")
+    return sorted(candidates, key=ranking_order, reverse=True)
+
+
+def reweight_rankings(rankings_dir: str, weights: Optional[Dict[str, float]] = None) -> int:
+    """
+    Re-score every ranking file in a directory with new category weights, without any model call.
+
+    Args:
+        rankings_dir (str): Directory containing ranking JSON files.
+        weights (Optional[Dict[str, float]]): Category weights; defaults to scoring.weights.
+
+    Returns:
+        int: Number of ranking files updated.
+    """
+    weights = weights or config["scoring"]["weights"]
+    updated = 0
+    for ranking_file in Path(rankings_dir).glob("*.json"):
+        try:
+            with open(ranking_file, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            candidates = result.get("candidates", {}).get("candidates", [])
+            result["candidates"]["candidates"] = reweight_candidates(candidates, weights)
+            with open(ranking_file, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+            updated += 1
+        except Exception as e:
+            print(f"Error re-weighting ranking file {ranking_file.name}: {str(e)}")
+            continue
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute overall scores of existing rankings with the configured scoring weights.")
+    parser.add_argument("--rankings-dir", default=config["data"]["directories"]["rankings"], help="Directory of ranking JSON files")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = reweight_rankings(args.rankings_dir)
+    print(f"Re-weighted {count} ranking files in {(time.perf_counter() - start) * 1000:.0f} ms")
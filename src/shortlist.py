@@ -0,0 +1,53 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from src.config_loader import config
+
+shortlist_config = config.get("shortlist", {})
+top_k = shortlist_config.get("top_k", 20)
+min_embedding_score = shortlist_config.get("min_embedding_score")
+# Sort rank of each ranker; candidates of ranking files written before ranking_method existed rank lowest
+ranking_method_ranks = {"llm": 2, "embedding": 1}
+
+
+def shortlist_enabled() -> bool:
+    return shortlist_config.get("enabled", True)
+
+
+def embedding_score(candidate: Dict) -> Optional[float]:
+    """Embedding-stage overall score of a ranked candidate, kept when the candidate is re-scored by the LLM."""
+    if candidate.get("ranking_method") == "embedding":
+        return candidate.get("overall_score")
+    return candidate.get("embedding_score")
+
+
+def select_shortlist(candidates: List[Dict]) -> Set[str]:
+    """
+    Pick the embedding-ranked candidates of a job description that go on to AI ranking.
+
+    Candidates are ordered by their embedding score, including those already scored by the LLM,
+    so a shortlist filled in earlier runs is only extended by new resumes that rank among the top
+    shortlist.top_k. With shortlist.min_embedding_score set, candidates below it are left out as well.
+
+    Args:
+        candidates (List[Dict]): Candidates of a ranking file.
+
+    Returns:
+        Set[str]: Resume file stems still to be scored by the LLM.
+    """
+    scored = [c for c in candidates if embedding_score(c) is not None]
+    scored.sort(key=embedding_score, reverse=True)
+    if top_k:
+        scored = scored[:top_k]
+    if min_embedding_score is not None:
+        scored = [c for c in scored if embedding_score(c) >= min_embedding_score]
+    return {Path(c.get("file_name", "")).stem for c in scored if c.get("ranking_method") == "embedding"}
+
+
+def ranking_method_rank(candidate: Dict) -> int:
+    """Rank of the ranker that scored a candidate: 2 for the LLM, 1 for embeddings, 0 when unknown."""
+    return ranking_method_ranks.get(candidate.get("ranking_method"), 0)
+
+
+def ranking_order(candidate: Dict) -> tuple:
+    """Sort key of ranked candidates: LLM-scored candidates, then the embedding-only rest, then unknown, each by score."""
+    return ranking_method_rank(candidate), candidate.get("overall_score") or 0
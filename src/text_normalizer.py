@@ -0,0 +1,239 @@
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import List, Tuple
+from src.config_loader import config
+
+normalization_config = config.get("normalization", {})
+
+CHARS_PER_TOKEN = 4
+
+# Written by the converters between the pages of a document
+PAGE_BREAK = "\f"
+
+_ARTIFACTS = {
+    "\u00ad": "",  # soft hyphen
+    "\u200b": "",  # zero-width characters
+    "\u200c": "",
+    "\u200d": "",
+    "\ufeff": "",
+    "\u00a0": " ",  # non-breaking space
+    "\ufb01": "fi",  # ligatures
+    "\ufb02": "fl",
+    "\u2022": "-",  # bullets
+    "\u25cf": "-",
+    "\u25aa": "-",
+    "\uf0b7": "-",  # symbol-font bullet from Word exports
+}
+_TABLE_SEPARATOR = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$")
+_PAGE_NUMBER = re.compile(r"^(page\s*)?[-–]?\s*\d{1,3}\s*((of|/)\s*\d{1,3})?\s*[-–]?$", re.IGNORECASE)
+_HEADING = re.compile(r"^(#{1,6}\s+\S.*|[A-Z][A-Z &/]{2,40}:?)$")
+
+_lock = threading.Lock()
+_stats = {"documents": 0, "tokens_before": 0, "tokens_after": 0}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text (about four characters per token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _is_noise_line(line: str) -> bool:
+    """Lines left behind by OCR or layout conversion that carry no content."""
+    if not line or _TABLE_SEPARATOR.match(line):
+        return False
+    if line == "<!-- image -->" or _PAGE_NUMBER.match(line):
+        return True
+    # Runs of symbols such as '| | |', '____' or '. . . .'
+    return not any(ch.isalnum() for ch in line)
+
+
+def _header_key(line: str) -> str:
+    return re.sub(r"\d+", "#", line.lower())
+
+
+def remove_repeated_lines(pages: List[List[str]]) -> List[List[str]]:
+    """
+    Drop page headers and footers: short lines repeated at the top or bottom of most pages.
+
+    Only the first occurrence is kept. Documents with fewer than normalization.min_header_repeats pages are unchanged.
+
+    Args:
+        pages (List[List[str]]): Lines of each page.
+
+    Returns:
+        List[List[str]]: Pages without the repeated lines.
+    """
+    min_repeats = normalization_config.get("min_header_repeats", 3)
+    if len(pages) < min_repeats:
+        return pages
+
+    edge_lines = 3
+    counts = Counter()
+    for page in pages:
+        content = [line for line in page if line]
+        edges = content[:edge_lines] + content[-edge_lines:]
+        counts.update({_header_key(line) for line in edges if len(line) <= 100})
+    repeated = {key for key, count in counts.items() if count >= min_repeats}
+    if not repeated:
+        return pages
+
+    seen = set()
+    cleaned = []
+    for page in pages:
+        kept = []
+        for line in page:
+            key = _header_key(line)
+            if key in repeated:
+                if key in seen:
+                    continue
+                seen.add(key)
+            kept.append(line)
+        cleaned.append(kept)
+    return cleaned
+
+
+def normalize_text(text: str) -> str:
+    """
+    Clean converted markdown before it is sent to the LLM.
+
+    Replaces typographic and OCR artifacts, re-joins words hyphenated across lines, collapses
+    whitespace, drops symbol-only lines, page numbers and image placeholders, and removes repeated
+    page headers and footers (the converters separate pages with PAGE_BREAK).
+
+    Args:
+        text (str): Converted document text.
+
+    Returns:
+        str: Normalized text.
+    """
+    text = unicodedata.normalize("NFC", text)
+    for artifact, replacement in _ARTIFACTS.items():
+        text = text.replace(artifact, replacement)
+    text = re.sub(r"([a-z])-\n([a-z])", r"\1\2", text)
+
+    pages = []
+    for page in text.split(PAGE_BREAK):
+        lines = [re.sub(r"[ \t]+", " ", line).strip() for line in page.splitlines()]
+        pages.append([line for line in lines if not _is_noise_line(line)])
+    pages = remove_repeated_lines(pages)
+
+    text = "\n".join("\n".join(page) for page in pages)
+    return re.sub(r"\n{3,}", "\n\n", text).strip() + "\n"
+
+
+def split_sections(text: str) -> List[Tuple[str, List[str]]]:
+    """Split text into (heading, lines) sections on markdown headings and short all-caps lines."""
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    for line in text.splitlines():
+        if _HEADING.match(line):
+            sections.append((line, []))
+        else:
+            sections[-1][1].append(line)
+    return sections
+
+
+def truncate_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Shorten a document to a token budget, cutting the least useful sections first.
+
+    Sections whose heading names a low-priority topic (normalization.low_priority_sections, such
+    as publications or references) are cut to a few lines first. If the text is still too long,
+    every section is shortened proportionally, keeping its heading and first lines.
+
+    Args:
+        text (str): Normalized document text.
+        max_tokens (int): Token budget.
+
+    Returns:
+        str: Text within the budget.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    low_priority = [word.lower() for word in normalization_config.get("low_priority_sections", [])]
+    max_lines = normalization_config.get("low_priority_max_lines", 5)
+    sections = split_sections(text)
+
+    def render(parts: List[Tuple[str, List[str]]]) -> str:
+        return "\n".join("\n".join(([heading] if heading else []) + lines) for heading, lines in parts).strip() + "\n"
+
+    trimmed = []
+    for heading, lines in sections:
+        content = [line for line in lines if line]
+        if heading and any(word in heading.lower() for word in low_priority) and len(content) > max_lines:
+            lines = content[:max_lines] + [f"[... {len(content) - max_lines} more lines omitted]"]
+        trimmed.append((heading, lines))
+    text = render(trimmed)
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    ratio = max_tokens / estimate_tokens(text)
+    shortened = []
+    for heading, lines in trimmed:
+        budget = int(sum(len(line) + 1 for line in lines) * ratio)
+        kept, used = [], 0
+        for line in lines:
+            if not line:
+                continue
+            if used + len(line) + 1 > budget:
+                kept.append("[... truncated]")
+                break
+            kept.append(line)
+            used += len(line) + 1
+        shortened.append((heading, kept))
+    text = render(shortened)
+    # Headings and markers can still push the result over; hard cut on a line boundary
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) > max_chars:
+        text = text[:text.rfind("\n", 0, max_chars) + 1] or text[:max_chars]
+    return text
+
+
+def prepare_for_extraction(text: str, name: str, max_tokens: int) -> str:
+    """
+    Normalize a document and fit it into a token budget, logging its token count before and after.
+
+    Args:
+        text (str): Converted document text.
+        name (str): Document name for the log line.
+        max_tokens (int): Token budget (0 or less disables truncation).
+
+    Returns:
+        str: Text to send to the LLM, or the input unchanged when normalization is disabled.
+    """
+    if not normalization_config.get("enabled", True):
+        return text
+
+    before = estimate_tokens(text)
+    prepared = normalize_text(text)
+    if max_tokens > 0:
+        prepared = truncate_to_budget(prepared, max_tokens)
+    after = estimate_tokens(prepared)
+
+    with _lock:
+        _stats["documents"] += 1
+        _stats["tokens_before"] += before
+        _stats["tokens_after"] += after
+    print(f"  {name}: ~{before} -> ~{after} input tokens")
+    return prepared
+
+
+def report_token_savings(reset: bool = True) -> None:
+    """
+    Print the total estimated input tokens saved by normalization since the last report.
+
+    Args:
+        reset (bool): Clear the counters after printing.
+
+    Returns:
+        None
+    """
+    if _stats["documents"]:
+        before, after = _stats["tokens_before"], _stats["tokens_after"]
+        saved = 1 - after / before if before else 0
+        print(f"Input tokens for {_stats['documents']} documents: ~{before} -> ~{after} ({saved:.0%} saved)")
+    if reset:
+        for key in _stats:
+            _stats[key] = 0
@@ -0,0 +1,109 @@
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import List
+
+# Formats converted without Docling or OCR
+NATIVE_EXTS = [".txt", ".md", ".docx"]
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+HEADING_STYLE = re.compile(r"^heading\s*(\d)$", re.IGNORECASE)
+
+
+def read_text_file(file: Path) -> str:
+    """Read a plain text or markdown file as-is."""
+    return file.read_text(encoding="utf-8-sig", errors="replace")
+
+
+def _paragraph_text(paragraph: ET.Element) -> str:
+    """Concatenate the runs of a w:p element, keeping tabs and line breaks."""
+    parts = []
+    for node in paragraph.iter():
+        if node.tag == f"{W_NS}t" and node.text:
+            parts.append(node.text)
+        elif node.tag == f"{W_NS}tab":
+            parts.append("\t")
+        elif node.tag in (f"{W_NS}br", f"{W_NS}cr"):
+            parts.append("\n")
+    return "".join(parts).strip()
+
+
+def _paragraph_to_markdown(paragraph: ET.Element) -> str:
+    """Render a paragraph as markdown, mapping heading styles to '#' and numbered/bulleted items to '-'."""
+    text = _paragraph_text(paragraph)
+    if not text:
+        return ""
+    props = paragraph.find(f"{W_NS}pPr")
+    if props is not None:
+        style = props.find(f"{W_NS}pStyle")
+        style_id = style.get(f"{W_NS}val", "") if style is not None else ""
+        heading = HEADING_STYLE.match(style_id)
+        if style_id.lower() == "title":
+            return f"# {text}"
+        if heading:
+            return f"{'#' * min(int(heading.group(1)) + 1, 6)} {text}"
+        if props.find(f"{W_NS}numPr") is not None or style_id.lower().startswith("list"):
+            return f"- {text}"
+    return text
+
+
+def _table_to_markdown(table: ET.Element) -> str:
+    """Render a w:tbl element as a markdown table."""
+    rows = []
+    for row in table.findall(f"{W_NS}tr"):
+        cells = [
+            " ".join(_paragraph_text(p) for p in cell.iter(f"{W_NS}p")).replace("|", "\\|").replace("\n", " ")
+            for cell in row.findall(f"{W_NS}tc")
+        ]
+        rows.append(f"| {' | '.join(cells)} |")
+    if len(rows) > 1:
+        columns = rows[0].count(" | ") + 1
+        rows.insert(1, "|" + " --- |" * columns)
+    return "\n".join(rows)
+
+
+def read_docx(file: Path) -> str:
+    """
+    Extract markdown from a .docx file by reading its document XML directly.
+
+    Args:
+        file (Path): Path to the .docx file.
+
+    Returns:
+        str: Paragraphs and tables of the document body as markdown.
+    """
+    with zipfile.ZipFile(file) as archive:
+        root = ET.fromstring(archive.read("word/document.xml"))
+
+    body = root.find(f"{W_NS}body")
+    blocks: List[str] = []
+    for element in body if body is not None else []:
+        if element.tag == f"{W_NS}p":
+            block = _paragraph_to_markdown(element)
+        elif element.tag == f"{W_NS}tbl":
+            block = _table_to_markdown(element)
+        else:
+            continue
+        if block:
+            blocks.append(block)
+    return "\n\n".join(blocks) + "\n"
+
+
+def convert_native_file(file: Path, md_file: Path) -> None:
+    """
+    Convert a .txt, .md or .docx file to markdown without Docling or OCR.
+
+    Args:
+        file (Path): File to convert.
+        md_file (Path): Markdown file to write.
+
+    Returns:
+        None
+    """
+    if file.suffix.lower() == ".docx":
+        md_content = read_docx(file)
+    else:
+        md_content = read_text_file(file)
+    with open(md_file, "w", encoding="utf-8") as f:
+        f.write(md_content)
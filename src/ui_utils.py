@@ -2,22 +2,31 @@ import json
 import shutil
 import uuid
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 import pandas as pd
 
 from src.data_parser_ocr import convert_files_to_markdown_with_ocr
 from src.resume_extractor import process_resumes_directory
 from src.description_extractor import process_job_descriptions_directory
+from src.heuristic_extractor import extract_resumes_directory_locally, extract_job_descriptions_directory_locally
 from src.resumes_ranker import rank_job_descriptions
 from src.embed_ranker.embed_ranker import rank_job_descriptions_with_embeddings
+from src.artifact_cache import file_digest, find_cached_upload, register_upload, restore_artifacts, cache_artifacts
+from src.dead_letter import list_failures
+from src.near_duplicates import is_older_version, load_duplicate_map, record_arrival
+from src.shortlist import ranking_order
 from src.config_loader import config
 
+scored_by_labels = {"llm": "AI", "embedding": "Embeddings"}
+
 resumes_config=config["data"]["directories"]["resumes"]
 job_config=config["data"]["directories"]["job_descriptions"]
 
 def save_uploaded_files(files: List[Any], file_type: str) -> List[str]:
     """
-    Save uploaded files with unique identifiers.
+    Save uploaded files with unique identifiers. Files whose content was already uploaded
+    reuse the existing raw file, and cached markdown/JSON is restored for known content.
+    Archives (.zip, .tar, .tar.gz, .tgz, .gz) are saved as-is and expanded by the converters.
     
     Args:
         files: List of uploaded files from Gradio
@@ -35,17 +44,29 @@ def save_uploaded_files(files: List[Any], file_type: str) -> List[str]:
     raw_dir.mkdir(parents=True, exist_ok=True)
 
     for file in files:
+        original_name = Path(file.name).name
+        digest = file_digest(file.name)
+
+        # Identical content was uploaded before and is still on disk
+        existing_file = find_cached_upload(digest, file_type)
+        if existing_file is not None:
+            print(f"Duplicate upload {original_name}, reusing {existing_file.name}")
+            if str(existing_file) not in saved_files:
+                saved_files.append(str(existing_file))
+            continue
+
         # Generate unique identifier
         unique_id = str(uuid.uuid4())[:8]
         
-        original_name = Path(file.name).name
-        file_ext = Path(file.name).suffix
-        
         new_filename = f"{unique_id}_{original_name}"
         save_path = Path(raw_dir) / new_filename
         
         # Copy file to destination
         shutil.copy2(file.name, save_path)
+        register_upload(digest, file_type, save_path)
+        if file_type == "resumes":
+            record_arrival(save_path)
+        restore_artifacts(digest, file_type, save_path.stem)
         saved_files.append(str(save_path))
         
     return saved_files
@@ -89,6 +110,7 @@ def generate_results_dataframes_by_job() -> Dict[str, pd.DataFrame]:
     """
     rankings_dir = Path(config["data"]["directories"]["rankings"])
     job_results = {}
+    duplicate_of = load_duplicate_map()
     
     # Load all ranking result files
     for ranking_file in rankings_dir.glob("*.json"):
@@ -99,8 +121,11 @@ def generate_results_dataframes_by_job() -> Dict[str, pd.DataFrame]:
             job_title = data.get('job_title', 'Unknown')
             candidates_data = []
             
-            # Process each candidate
-            for candidate in data.get('candidates', {}).get('candidates', []):
+            # Process each candidate, AI-scored shortlist first, then by overall score
+            for candidate in sorted(data.get('candidates', {}).get('candidates', []), key=ranking_order, reverse=True):
+                # Older versions of a resume are collapsed into the latest one
+                if is_older_version(candidate.get('file_name', ''), duplicate_of):
+                    continue
                 raw_file_path = find_original_raw_file(candidate.get('file_name', ''))
                 
                 candidate_name = candidate.get('name', 'Unknown') 
@@ -112,14 +137,14 @@ def generate_results_dataframes_by_job() -> Dict[str, pd.DataFrame]:
                     'Email': candidate.get('contact', {}).get('email', ''),
                     'LinkedIn': candidate.get('contact', {}).get('linkedin', ''),
                     'Overall Score': round(candidate.get('overall_score', 0), 2),
+                    'Scored By': scored_by_labels.get(candidate.get('ranking_method'), 'Unknown'),
                     'Resume File': raw_file_path or candidate.get('file_name', 'Unknown')
                 }
                 candidates_data.append(candidate_row)
                             
-            # Create DataFrame for this job and sort by overall score
+            # Create DataFrame for this job in ranking order
             if candidates_data:
                 df = pd.DataFrame(candidates_data)
-                df = df.sort_values('Overall Score', ascending=False)
                 # Add rank column based on sorted order
                 df['Rank'] = range(1, len(df) + 1)
 
@@ -135,6 +160,73 @@ def generate_results_dataframes_by_job() -> Dict[str, pd.DataFrame]:
     return job_results
 
 
+def convert_raw_files(enhance_conversion: bool, resume_files: Optional[List[Path]] = None, jd_files: Optional[List[Path]] = None) -> None:
+    """
+    Convert raw resumes and job descriptions to markdown.
+
+    Args:
+        enhance_conversion: Whether Docling may be used. With the per-page router enabled it is only
+            used for pages that need it; otherwise it converts every file.
+        resume_files: Only convert these raw resumes instead of scanning the raw directory.
+        jd_files: Only convert these raw job descriptions instead of scanning the raw directory.
+
+    Returns:
+        None
+    """
+    if config["conversion"]["router"]["enabled"]:
+        from src.conversion_router import convert_files_with_router
+
+        print("Converting files to markdown with per-page routing...")
+        convert_files_with_router(resumes_config["raw"], resumes_config["sub"], "markdown", allow_docling=enhance_conversion, files=resume_files)
+        convert_files_with_router(job_config["raw"], job_config["sub"], "markdown", allow_docling=enhance_conversion, files=jd_files)
+    elif enhance_conversion:
+        from src.data_parser import convert_files_to_markdown
+
+        print("Converting files to markdown with AI (Docling)...")
+        convert_files_to_markdown(resumes_config["raw"],  resumes_config["sub"], "markdown", files=resume_files)
+        convert_files_to_markdown(job_config["raw"], job_config["sub"], "markdown", files=jd_files)
+    else:
+        print("Converting files to markdown with OCR...")
+        convert_files_to_markdown_with_ocr(resumes_config["raw"],  resumes_config["sub"], "markdown", files=resume_files)
+        convert_files_to_markdown_with_ocr(job_config["raw"], job_config["sub"], "markdown", files=jd_files)
+
+
+def extract_for_embedding_ranking(llm) -> None:
+    """
+    Extract resumes and job descriptions for embedding-based ranking.
+
+    Uses the local heuristic extractor unless heuristic_extraction.embedding_mode_extractor is "llm",
+    so embedding mode runs without any LLM calls by default.
+
+    Args:
+        llm: Language model instance (only used with the "llm" extractor)
+
+    Returns:
+        None
+    """
+    use_llm = config.get("heuristic_extraction", {}).get("embedding_mode_extractor", "heuristic") == "llm"
+    if Path(resumes_config["markdown"]).exists():
+        print("\nExtracting resume data...")
+        if use_llm:
+            process_resumes_directory(resumes_config["markdown"], resumes_config["json"], llm)
+        else:
+            extract_resumes_directory_locally(resumes_config["markdown"], resumes_config["json"])
+    if Path(job_config["markdown"]).exists():
+        print("\nExtracting job description data...")
+        if use_llm:
+            process_job_descriptions_directory(job_config["markdown"], job_config["json"], llm)
+        else:
+            extract_job_descriptions_directory_locally(job_config["markdown"], job_config["json"])
+
+
+def failed_extraction_note() -> str:
+    """Describe the files currently in the dead-letter area, for the status message."""
+    failed = [entry["filename"] for file_type in ("resumes", "job_descriptions") for entry in list_failures(file_type)]
+    if not failed:
+        return ""
+    return f" {len(failed)} file(s) failed extraction and are kept in the dead-letter area for retry: {', '.join(failed)}"
+
+
 def process_files_pipeline_ai_enhanced(resume_files: List[Any], jd_files: List[Any], llm, enhance_conversion: bool = True) -> Tuple[str, Dict[str, pd.DataFrame]]:
     """
     AI-enhanced pipeline using docling and AI extraction/ranking.
@@ -158,17 +250,7 @@ def process_files_pipeline_ai_enhanced(resume_files: List[Any], jd_files: List[A
         
         print(f"Saved {len(saved_resumes)} resumes and {len(saved_jds)} job descriptions\n")
         
-        # Replace the conversion section in both functions with:
-        if enhance_conversion:
-            from src.data_parser import convert_files_to_markdown
-
-            print("Converting files to markdown with AI (Docling)...")
-            convert_files_to_markdown(resumes_config["raw"],  resumes_config["sub"], "markdown")
-            convert_files_to_markdown(job_config["raw"], job_config["sub"], "markdown")
-        else:
-            print("Converting files to markdown with OCR...")
-            convert_files_to_markdown_with_ocr(resumes_config["raw"],  resumes_config["sub"], "markdown")
-            convert_files_to_markdown_with_ocr(job_config["raw"], job_config["sub"], "markdown")
+        convert_raw_files(enhance_conversion)
         # Extract structured data from resumes using AI
         print("\nExtracting resume data with AI...")
         process_resumes_directory(resumes_config["markdown"],resumes_config["json"], llm)
@@ -176,6 +258,8 @@ def process_files_pipeline_ai_enhanced(resume_files: List[Any], jd_files: List[A
         # Extract structured data from job descriptions using AI
         print("\nExtracting job description data with AI...")
         process_job_descriptions_directory(job_config["markdown"],job_config["json"], llm)
+        cache_artifacts(saved_resumes, "resumes")
+        cache_artifacts(saved_jds, "job_descriptions")
         
         # Rank resumes against job descriptions using AI
         print("\nRanking candidates with AI...")
@@ -186,7 +270,7 @@ def process_files_pipeline_ai_enhanced(resume_files: List[Any], jd_files: List[A
         # Generate results dataframes grouped by job description
         results_dfs = generate_results_dataframes_by_job()
         
-        return "Processing completed successfully with AI enhancement!", results_dfs
+        return "Processing completed successfully with AI enhancement!" + failed_extraction_note(), results_dfs
         
     except Exception as e:
         return f"Error during AI-enhanced processing: {str(e)}", {}
@@ -199,7 +283,7 @@ def process_files_pipeline_ocr_embedding(resume_files: List[Any], jd_files: List
     Args:
         resume_files: List of uploaded resume files
         jd_files: List of uploaded job description files
-        llm: Language model instance (used minimally)
+        llm: Language model instance (only used when embedding_mode_extractor is "llm")
     
     Returns:
         Tuple of (status_message, dict of {job_title: dataframe})
@@ -215,23 +299,11 @@ def process_files_pipeline_ocr_embedding(resume_files: List[Any], jd_files: List
         
         print(f"Saved {len(saved_resumes)} resumes and {len(saved_jds)} job descriptions\n")
         
-        # Replace the conversion section in both functions with:
-        if enhance_conversion:
-            from src.data_parser import convert_files_to_markdown
-            print("Converting files to markdown with AI (Docling)...")
-            convert_files_to_markdown(resumes_config["raw"],  resumes_config["sub"], "markdown")
-            convert_files_to_markdown(job_config["raw"], job_config["sub"], "markdown")
-        else:
-            print("Converting files to markdown with OCR...")
-            convert_files_to_markdown_with_ocr(resumes_config["raw"],  resumes_config["sub"], "markdown")
-            convert_files_to_markdown_with_ocr(job_config["raw"], job_config["sub"], "markdown")
-        # Extract structured data from resumes using AI (still needed for structured extraction)
-        print("\nExtracting resume data...")
-        process_resumes_directory(config["data"]["directories"]["resumes"]["markdown"],resumes_config["json"], llm)
-        
-        # Extract structured data from job descriptions using AI (still needed for structured extraction)
-        print("\nExtracting job description data...")
-        process_job_descriptions_directory(job_config["markdown"],job_config["json"], llm)
+        convert_raw_files(enhance_conversion)
+        # Extract structured data locally (or with the LLM if configured)
+        extract_for_embedding_ranking(llm)
+        cache_artifacts(saved_resumes, "resumes")
+        cache_artifacts(saved_jds, "job_descriptions")
         
         # Rank resumes using embedding-based approach
         print("\nRanking candidates with embeddings...")
@@ -242,7 +314,7 @@ def process_files_pipeline_ocr_embedding(resume_files: List[Any], jd_files: List
         # Generate results dataframes grouped by job description
         results_dfs = generate_results_dataframes_by_job()
         
-        return "Processing completed successfully with OCR + embedding-based ranking!", results_dfs
+        return "Processing completed successfully with OCR + embedding-based ranking!" + failed_extraction_note(), results_dfs
         
     except Exception as e:
         return f"Error during OCR + embedding processing: {str(e)}", {}
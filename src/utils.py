@@ -118,6 +118,64 @@ default_resume = ResumeData(
             books=[]
         )
 
+class RankingEducation(BaseModel):
+    """Education fields used for ranking."""
+    degree: str = Field(description="Degree name (e.g., Bachelor of Science)")
+    field_of_study: Optional[str] = Field(None, description="Major or field of study")
+    institution: Optional[str] = Field(None, description="University or college name")
+    graduation_year: Optional[str] = Field(None, description="Graduation year")
+
+
+class RankingCertification(BaseModel):
+    """Certification fields used for ranking."""
+    name: str = Field(description="Certification name")
+
+
+class RankingExperience(BaseModel):
+    """Work experience fields used for ranking."""
+    job_title: str = Field(description="Job title or position")
+    company: str = Field(description="Company name")
+    duration: Optional[str] = Field(None, description="Duration of employment")
+    description: str = Field(description="Main responsibilities and achievements in one or two sentences")
+    technologies_used: List[str] = Field(default_factory=list, description="Technologies and tools used")
+
+
+class RankingResumeData(BaseModel):
+    """Resume data limited to the fields the rankers score on."""
+    name: str = Field(description="Full name of the person")
+    job_title: Optional[str] = Field(None, description="Current job title or desired position")
+    summary: str = Field(description="Professional summary or objective")
+    contact: Contact = Field(description="Contact information")
+    languages: List[str] = Field(default_factory=list, description="Spoken languages")
+    skills: List[str] = Field(default_factory=list, description="Technical and professional skills")
+    education: List[RankingEducation] = Field(default_factory=list, description="Educational background")
+    certifications: List[RankingCertification] = Field(default_factory=list, description="Professional certifications")
+    experience: List[RankingExperience] = Field(default_factory=list, description="Work experience")
+    experience_duration: str = Field(description="Total years and months of experience without counting the overlapping between them (e.g., '2 years 3 months', '1.5 years')")
+    soft_skills: List[str] = Field(description="List of leadership skills and soft skills (e.g., organizing events, leading teams, teamwork).")
+    domain_knowledge: DomainKnowledge = Field(description="Domain-specific knowledge and expertise")
+
+
+class PackedResume(ResumeData):
+    """Resume data tagged with the document it was extracted from, for packed extraction."""
+    filename: str = Field(description="File name of the resume document, copied exactly from its DOCUMENT header")
+
+
+class PackedResumes(BaseModel):
+    """Resume data for every document in a packed extraction request."""
+    resumes: List[PackedResume] = Field(default_factory=list, description="One entry per resume document, in order")
+
+
+class PackedRankingResume(RankingResumeData):
+    """Ranking resume data tagged with the document it was extracted from, for packed extraction."""
+    filename: str = Field(description="File name of the resume document, copied exactly from its DOCUMENT header")
+
+
+class PackedRankingResumes(BaseModel):
+    """Ranking resume data for every document in a packed extraction request."""
+    resumes: List[PackedRankingResume] = Field(default_factory=list, description="One entry per resume document, in order")
+
+
 # Job Requirements Models
 #######################################
 class JobRequirementsData(BaseModel):
@@ -137,6 +195,16 @@ class JobRequirementsData(BaseModel):
     preferred_domain_knowledge: List[str] = Field(default_factory=list, description="A list of preferred industry or business domain knowledge.")
 
 
+class PackedJobRequirements(JobRequirementsData):
+    """Job requirements tagged with the document they were extracted from, for packed extraction."""
+    filename: str = Field(description="File name of the job description document, copied exactly from its DOCUMENT header")
+
+
+class PackedJobDescriptions(BaseModel):
+    """Job requirements for every document in a packed extraction request."""
+    job_descriptions: List[PackedJobRequirements] = Field(default_factory=list, description="One entry per job description document, in order")
+
+
 default_job_requirements = JobRequirementsData(
     job_title="Unknown",
     responsibilities=[],
@@ -182,10 +250,37 @@ class CandidateMatch(BaseModel):
     contact: ContactInfo = Field(description="Contact information")
     scores: IndividualScore = Field(description="Individual scores for different aspects")
     overall_score: float = Field(description="Overall score (0-100)")
+    ranking_method: Optional[str] = Field(None, description="Ranker that produced the scores: \"llm\" or \"embedding\"")
+    embedding_score: Optional[float] = Field(None, description="Embedding-stage overall score of a shortlisted candidate")
 
 class Candidates(BaseModel):
     candidates: List[CandidateMatch] = Field(default_factory=list, description="List of matched candidates")
 
+# Score of a category the job description has no requirements for; left out of the overall score
+NOT_APPLICABLE_SCORE = -1
+
+class CompactScores(BaseModel):
+    """Category scores under short keys, returned by the ranking LLM to keep responses small."""
+    title: float = Field(description="Job title relevance (0-100, or -1 if not applicable)")
+    years: float = Field(description="Experience years match (0-100, or -1 if not applicable)")
+    edu: float = Field(description="Required education match (0-100, or -1 if not applicable)")
+    exp: float = Field(description="Experience relevance (0-100, or -1 if not applicable)")
+    skills: float = Field(description="Required skills match (0-100, or -1 if not applicable)")
+    soft: float = Field(description="Soft skills relevance (0-100, or -1 if not applicable)")
+    certs: float = Field(description="Certifications match (0-100, or -1 if not applicable)")
+    domain: float = Field(description="Domain knowledge match (0-100, or -1 if not applicable)")
+    langs: float = Field(description="Languages match (0-100, or -1 if not applicable)")
+    pref_edu: float = Field(description="Preferred education relevance (0-100, or -1 if not applicable)")
+    pref_qual: float = Field(description="Preferred skills and domain knowledge relevance (0-100, or -1 if not applicable)")
+
+class ScoredCandidate(BaseModel):
+    """Scores of one candidate; name, contact details and the overall score are added locally."""
+    id: str = Field(description="Candidate id, copied exactly from the resume data")
+    scores: CompactScores = Field(description="Category scores")
+
+class ScoredCandidates(BaseModel):
+    candidates: List[ScoredCandidate] = Field(default_factory=list, description="One entry per candidate")
+
 class JobMatchingResult(BaseModel):
     """Complete job matching result."""
     job_title: str = Field(description="Job title")
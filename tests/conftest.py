@@ -0,0 +1,13 @@
+import pytest
+
+from src import llm_client
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """Run in an empty working directory (data/ paths resolve under it) without rate limiting."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(llm_client.rate_limiter, "requests_per_second", 10000)
+    monkeypatch.setattr(llm_client.rate_limiter, "max_bucket_size", 10000)
+    monkeypatch.setattr(llm_client.rate_limiter, "available_tokens", 10000)
+    return tmp_path
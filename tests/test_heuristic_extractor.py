@@ -0,0 +1,14 @@
+from src.heuristic_extractor import extract_education
+
+
+def test_education_institution_leaves_out_years_date_ranges_and_gpa():
+    entries = extract_education([
+        "BSc in Computer Science, Stanford University 2018",
+        "MSc in Data Science",
+        "University of Cairo (Sep 2019 - Jun 2021), GPA: 3.8/4.0",
+    ])
+
+    assert [(e.field_of_study, e.institution, e.graduation_year, e.gpa) for e in entries] == [
+        ("Computer Science", "Stanford University", "2018", None),
+        ("Data Science", "University of Cairo", "2021", 3.8),
+    ]
@@ -0,0 +1,57 @@
+import pytest
+from pydantic import BaseModel
+
+from src.llm_backends import FakeLLM, OfflineLLM, RecordingLLM, ReplayLLM
+from src.llm_cache import cache_key, store_response
+from src.llm_client import invoke_structured
+
+
+TEMPLATE = "Summarize the profile.\nToday's date is: {current_date}.\n{text}"
+
+
+class Summary(BaseModel):
+    headline: str
+    years: int
+
+
+class CountingFakeLLM(FakeLLM):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def respond(self, schema, prompt):
+        self.calls += 1
+        return super().respond(schema, prompt)
+
+
+def test_offline_llm_is_abstract():
+    with pytest.raises(TypeError):
+        OfflineLLM("offline")
+
+
+def test_fake_responses_are_deterministic_and_bypass_the_response_cache(offline):
+    llm = CountingFakeLLM()
+    inputs = {"current_date": "May 2026", "text": "Data engineer, 6 years"}
+
+    first = invoke_structured(llm, TEMPLATE, Summary, inputs)
+    second = invoke_structured(llm, TEMPLATE, Summary, inputs)
+
+    assert first == second
+    assert llm.calls == 2
+
+
+def test_recorded_prompts_replay_across_dates_even_when_cached(offline):
+    live = FakeLLM()
+    recorder = RecordingLLM(live, "recordings")
+    inputs = {"current_date": "May 2026", "text": "Data engineer, 6 years"}
+    # A response cached for the live model must not keep the prompt from being recorded
+    store_response(cache_key(recorder, TEMPLATE, Summary, inputs), Summary(headline="cached", years=1))
+
+    recorded = invoke_structured(recorder, TEMPLATE, Summary, inputs)
+    assert recorded.headline != "cached"
+    assert len(list((offline / "recordings").glob("*.json"))) == 1
+
+    replay = ReplayLLM("recordings")
+    assert invoke_structured(replay, TEMPLATE, Summary, dict(inputs, current_date="June 2026")) == recorded
+    with pytest.raises(LookupError):
+        invoke_structured(replay, TEMPLATE, Summary, dict(inputs, text="Product manager, 2 years"))
@@ -0,0 +1,33 @@
+from src.near_duplicates import FingerprintIndex, num_perm, record_arrival, update_duplicate_index
+
+CV = " ".join(f"Built data pipeline number {i} with Python Spark and Airflow for analytics team {i}." for i in range(40))
+
+
+def _edited(signature, start, stop):
+    return signature[:start] + [value + 1 for value in signature[start:stop]] + signature[stop:]
+
+
+def test_groups_require_similarity_to_the_first_version_not_a_chain():
+    first = list(range(num_perm))
+    second = _edited(first, 0, num_perm // 6)
+    third = _edited(second, num_perm // 6, num_perm // 3)
+    index = FingerprintIndex()
+    for name, signature in (("first", first), ("second", second), ("third", third)):
+        index.add(name, signature, 0.0)
+
+    assert index.version_groups({"first": 1.0, "second": 2.0, "third": 3.0}) == [["first", "second"]]
+
+
+def test_latest_upload_is_extracted_regardless_of_file_name(offline):
+    markdown, raw = offline / "markdown", offline / "data" / "resumes" / "raw"
+    markdown.mkdir()
+    raw.mkdir(parents=True)
+    # The uuid prefixes sort the newer upload first by name
+    for stem, text in (("f3a9c1d2_jane_doe", CV), ("0b7e4a11_jane_doe", CV + " Led the migration to BigQuery.")):
+        (raw / f"{stem}.pdf").write_bytes(b"%PDF")
+        record_arrival(raw / f"{stem}.pdf")
+        (markdown / f"{stem}.md").write_text(text, encoding="utf-8")
+
+    duplicate_of = update_duplicate_index(sorted(markdown.glob("*.md")), "json")
+
+    assert duplicate_of == {"f3a9c1d2_jane_doe": "0b7e4a11_jane_doe"}
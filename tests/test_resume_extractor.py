@@ -0,0 +1,60 @@
+import json
+
+from src import llm_client
+from src.llm_backends import FakeLLM
+from src.resume_extractor import EXTRACTION_SCHEMAS, extraction_schema, process_resumes_directory
+
+
+RESUMES = {
+    "alice": "Alice Martin\nSenior Data Engineer at Contoso, 2018-2024\nPython, Spark, Airflow",
+    "bob": "Bob Chen\nFrontend Developer at Fabrikam, 2020-2023\nTypeScript, React, CSS",
+    "carol": "Carol Diaz\nRegistered Nurse at City Hospital, 2015-2022\nPatient care, triage",
+}
+
+
+class RecordingCallsLLM(FakeLLM):
+    """Fake model that remembers the schema of every call and can drop documents from packed responses."""
+
+    def __init__(self, drop=None):
+        super().__init__()
+        self.drop = drop
+        self.schemas = []
+
+    def respond(self, schema, prompt):
+        self.schemas.append(schema)
+        response, latency, usage = super().respond(schema, prompt)
+        if self.drop and hasattr(response, "resumes"):
+            response.resumes = [resume for resume in response.resumes if resume.filename != self.drop]
+        return response, latency, usage
+
+
+def _write_resumes(directory):
+    directory.mkdir()
+    for stem, text in RESUMES.items():
+        (directory / f"{stem}.md").write_text(text, encoding="utf-8")
+
+
+def test_resumes_are_extracted_in_one_packed_request(offline, monkeypatch):
+    monkeypatch.setattr(llm_client, "pack_size", 3)
+    _write_resumes(offline / "markdown")
+    llm = RecordingCallsLLM()
+
+    process_resumes_directory("markdown", "json", llm)
+
+    packed_schema = EXTRACTION_SCHEMAS[extraction_schema][2]
+    assert llm.schemas == [packed_schema]
+    for stem in RESUMES:
+        data = json.loads((offline / "json" / f"{stem}.json").read_text(encoding="utf-8"))
+        assert data["filename"] == f"{stem}.md"
+
+
+def test_resumes_missing_from_a_packed_response_fall_back_to_single_requests(offline, monkeypatch):
+    monkeypatch.setattr(llm_client, "pack_size", 3)
+    _write_resumes(offline / "markdown")
+    llm = RecordingCallsLLM(drop="bob.md")
+
+    process_resumes_directory("markdown", "json", llm)
+
+    schema, _, packed_schema, _ = EXTRACTION_SCHEMAS[extraction_schema]
+    assert llm.schemas == [packed_schema, schema]
+    assert sorted(path.stem for path in (offline / "json").glob("*.json")) == sorted(RESUMES)
@@ -0,0 +1,91 @@
+import json
+import re
+
+from src.llm_backends import FakeLLM
+from src.llm_client import run_async
+from src.resumes_ranker import _save_ranking, _score_batch_adaptive
+
+JD = {"job_title": "Data Engineer", "required_skills": ["Python", "SQL"]}
+SCORES = {
+    "job_title_relevance": 60, "experience_years_match": 60, "education_match": 60,
+    "experience_relevance": 60, "skills_match": 60, "soft_skills_relevance": 60,
+    "certifications_match": -1, "domain_knowledge_match": 60, "languages_match": -1,
+    "preferred_education_relevance": 60, "preferred_qualifications_relevance": 60,
+}
+
+
+class TruncatingFakeLLM(FakeLLM):
+    """Fake model whose response is unusable for batches of more than max_batch resumes."""
+
+    def __init__(self, max_batch):
+        super().__init__()
+        self.max_batch = max_batch
+        self.batch_sizes = []
+
+    def respond(self, schema, prompt):
+        size = len(re.findall(r'"id":"', prompt))
+        self.batch_sizes.append(size)
+        if size > self.max_batch:
+            raise ValueError("LLM response was truncated")
+        return super().respond(schema, prompt)
+
+
+def _candidate(file_name, method, overall_score, **extra):
+    return dict({
+        "name": file_name.split(".")[0].title(), "file_name": file_name, "job_title": None,
+        "contact": {}, "scores": SCORES, "overall_score": overall_score, "ranking_method": method,
+    }, **extra)
+
+
+def test_unusable_batches_are_split_in_half_until_they_score(offline):
+    resumes = [{"filename": f"r{i}.md", "name": f"Candidate {i}", "skills": ["Python"]} for i in range(5)]
+    llm = TruncatingFakeLLM(max_batch=2)
+
+    candidates = run_async(_score_batch_adaptive(llm, JD, resumes))
+
+    assert llm.batch_sizes == [5, 2, 3, 1, 2]
+    assert sorted(c["file_name"] for c in candidates) == [r["filename"] for r in resumes]
+    assert all(c["ranking_method"] == "llm" for c in candidates)
+
+
+def test_save_ranking_merges_candidates_and_keeps_embedding_scores(offline):
+    output_file = offline / "jd_ranked_resumes.json"
+    job = {
+        "jd_path": offline / "jd.json",
+        "jd_data": JD,
+        "output_file": output_file,
+        "existing_candidates": [
+            _candidate("alice.md", "embedding", 72.5),
+            _candidate("bob.md", "embedding", 40.0),
+            _candidate("carol.md", "llm", 55.0, embedding_score=65.0),
+        ],
+    }
+    rescored = _candidate("alice.md", "llm", 0, scores=dict(SCORES, skills_match=90))
+
+    _save_ranking(job, [rescored])
+
+    candidates = json.loads(output_file.read_text(encoding="utf-8"))["candidates"]["candidates"]
+    by_name = {c["file_name"]: c for c in candidates}
+    assert [c["file_name"] for c in candidates] == ["alice.md", "carol.md", "bob.md"]
+    assert by_name["alice.md"]["ranking_method"] == "llm"
+    assert by_name["alice.md"]["embedding_score"] == 72.5
+    assert by_name["carol.md"]["embedding_score"] == 65.0
+    assert by_name["bob.md"]["ranking_method"] == "embedding"
+
+
+def test_invalid_ranking_entries_do_not_abort_saving(offline):
+    output_file = offline / "jd_ranked_resumes.json"
+    job = {
+        "jd_path": offline / "jd.json",
+        "jd_data": JD,
+        "output_file": output_file,
+        "existing_candidates": [
+            _candidate("old.md", None, 50.0, scores={}),
+            _candidate("partial.md", "llm", 45.0, scores={"skills_match": 80}),
+        ],
+    }
+
+    _save_ranking(job, [_candidate("new.md", "llm", 0)])
+
+    candidates = json.loads(output_file.read_text(encoding="utf-8"))["candidates"]["candidates"]
+    assert [c["file_name"] for c in candidates] == ["new.md"]
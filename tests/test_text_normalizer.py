@@ -0,0 +1,39 @@
+import pytest
+
+pymupdf = pytest.importorskip("pymupdf")
+
+from src.data_parser_ocr import _convert_file
+from src.text_normalizer import PAGE_BREAK, normalize_text
+
+
+BODIES = [
+    "Built batch data pipelines in Python and Spark.",
+    "Led the migration of the warehouse to BigQuery.",
+    "Mentored four junior engineers on data modelling.",
+]
+
+
+def _write_resume_pdf(path):
+    doc = pymupdf.open()
+    for number, body in enumerate(BODIES, start=1):
+        page = doc.new_page()
+        page.insert_text((72, 40), "Jane Doe - Senior Data Engineer")
+        page.insert_text((72, 100), body)
+        page.insert_text((72, 800), f"Page {number} of {len(BODIES)}")
+    doc.save(str(path))
+    doc.close()
+
+
+def test_converter_output_has_page_breaks_and_repeated_headers_are_removed(tmp_path):
+    pdf_file, md_file = tmp_path / "resume.pdf", tmp_path / "resume.md"
+    _write_resume_pdf(pdf_file)
+
+    _convert_file(pdf_file, md_file)
+    converted = md_file.read_text(encoding="utf-8")
+    assert converted.count(PAGE_BREAK) == 2
+
+    normalized = normalize_text(converted)
+    assert normalized.count("Jane Doe - Senior Data Engineer") == 1
+    assert "Page 2 of 3" not in normalized
+    for body in BODIES:
+        assert body in normalized